@@ -0,0 +1,14 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 16:30
+""" Benchmarks for the volume pipeline (run: python -m benchmarks.run) """
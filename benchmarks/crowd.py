@@ -0,0 +1,102 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 16:32
+""" Synthetic audiences """
+
+import random
+
+from paps.person import Person
+
+
+def population(size, sitting=True):
+    """
+    Create audience
+
+    :param size: Number of people
+    :type size: int
+    :param sitting: Initial state of everybody (default: True)
+    :type sitting: bool
+    :return: People
+    :rtype: list[paps.person.Person]
+    """
+    return [Person("seat_{}".format(i), sitting) for i in range(size)]
+
+
+def groups_layout(people, groups, layout="blocks", channels=8, seed=None):
+    """
+    Create group settings for audience
+
+    :param people: Audience
+    :type people: list[paps.person.Person]
+    :param groups: Number of groups (not counting 'Not yet placed')
+    :type groups: int
+    :param layout: How seats are assigned (default: blocks)
+        blocks: consecutive seats per group
+        stripes: seat i goes to group i % groups
+        random: random group per seat
+    :type layout: unicode
+    :param channels: Number of channels groups are mapped to (default: 8)
+    :type channels: int
+    :param seed: Seed for random layout (default: None)
+    :type seed: None | int
+    :return: Settings for on_config (groups)
+    :rtype: list[dict]
+    :raises ValueError: Unknown layout
+    """
+    members = [[] for _ in range(groups)]
+    rnd = random.Random(seed)
+    for i, person in enumerate(people):
+        if layout == "blocks":
+            index = i * groups // len(people)
+        elif layout == "stripes":
+            index = i % groups
+        elif layout == "random":
+            index = rnd.randrange(groups)
+        else:
+            raise ValueError(u"Unknown layout '{}'".format(layout))
+        members[index].append({'id': person.id})
+    return [
+        {
+            'id': i + 1,
+            'name': "Group {}".format(i + 1),
+            'people': members[i],
+            'active_definition': "standing",
+            'action': "percent" if i % 2 == 0 else "percent_total",
+            'channel_id': i % channels
+        }
+        for i in range(groups)
+    ]
+
+
+def waves(people, batch=10, count=2):
+    """
+    Stand up/sit down waves running through the audience
+
+    Each wave lets everybody stand up seat by seat, then sit down again.
+
+    :param people: Audience
+    :type people: list[paps.person.Person]
+    :param batch: Number of people changing per event (default: 10)
+    :type batch: int
+    :param count: Number of waves (default: 2)
+    :type count: int
+    :return: Person updates (one list per event)
+    :rtype: collections.Iterable[list[paps.person.Person]]
+    """
+    for _ in range(count):
+        for sitting in [False, True]:
+            for i in range(0, len(people), batch):
+                yield [
+                    Person(person.id, sitting)
+                    for person in people[i:i + batch]
+                ]
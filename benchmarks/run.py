@@ -0,0 +1,428 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 16:45
+"""
+Drive the plugins with synthetic audiences (headless through NullMixer)
+
+Measures person event throughput, event -> set_volume latency, lock wait
+times and memory per person. Results are written as json.
+"""
+
+import argparse
+import bisect
+import datetime
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from timeit import default_timer
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2
+    tracemalloc = None
+
+import paps_soundmix
+from paps_soundmix.mixer import NullMixer
+
+from .crowd import population, groups_layout, waves
+
+
+PLUGINS = {
+    'SoundMixPlugin': paps_soundmix.SoundMixPlugin,
+    'SoundMixLeftRightPlugin': paps_soundmix.SoundMixLeftRightPlugin,
+    'SoundMixMatrixPlugin': paps_soundmix.SoundMixMatrixPlugin,
+    'Angel': paps_soundmix.Angel
+}
+""" Plugins that can be benchmarked """
+SOUND_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "data", "Groundloop.wav"
+)
+
+
+def percentiles(values, scale=1000.0):
+    """
+    Summarize values
+
+    :param values: Values to summarize (seconds)
+    :type values: list[float]
+    :param scale: Multiply values (default: 1000.0 -> milliseconds)
+    :type scale: float
+    :return: count, mean, p50, p90, p99, max
+    :rtype: dict[unicode, int | None | float]
+    """
+    if not values:
+        return {
+            'count': 0, 'mean': None,
+            'p50': None, 'p90': None, 'p99': None, 'max': None
+        }
+    values = sorted(values)
+
+    def p(q):
+        return values[min(len(values) - 1, int(q * len(values)))] * scale
+    return {
+        'count': len(values),
+        'mean': sum(values) / len(values) * scale,
+        'p50': p(0.50),
+        'p90': p(0.90),
+        'p99': p(0.99),
+        'max': values[-1] * scale
+    }
+
+
+class LockProbe(threading.Thread):
+    """ Periodically measure how long acquiring locks takes """
+
+    def __init__(self, locks, interval=0.001):
+        """
+        Initialize object
+
+        :param locks: Locks to probe by name
+        :type locks: dict[unicode, threading.RLock]
+        :param interval: Seconds between probes (default: 0.001)
+        :type interval: float
+        :rtype: None
+        """
+        super(LockProbe, self).__init__()
+        self.daemon = True
+        self._locks = locks
+        self._interval = interval
+        self._running = False
+        self.waits = {name: [] for name in locks}
+        """ Measured wait times per lock
+            :type waits: dict[unicode, list[float]] """
+
+    def run(self):
+        self._running = True
+        while self._running:
+            for name, lock in self._locks.items():
+                start = default_timer()
+                with lock:
+                    self.waits[name].append(default_timer() - start)
+            time.sleep(self._interval)
+
+    def stop(self):
+        self._running = False
+        self.join()
+
+
+class Worker(threading.Thread):
+    """ Repeatedly call function and measure duration """
+
+    def __init__(self, func, interval=0.0):
+        """
+        Initialize object
+
+        :param func: Function to call (with number of call)
+        :type func: (int) -> object
+        :param interval: Seconds between calls (default: 0.0)
+        :type interval: float
+        :rtype: None
+        """
+        super(Worker, self).__init__()
+        self.daemon = True
+        self._func = func
+        self._interval = interval
+        self._running = False
+        self.durations = []
+        """ Measured durations
+            :type durations: list[float] """
+
+    def run(self):
+        self._running = True
+        i = 0
+        while self._running:
+            start = default_timer()
+            self._func(i)
+            self.durations.append(default_timer() - start)
+            i += 1
+            time.sleep(self._interval)
+
+    def stop(self):
+        self._running = False
+        self.join()
+
+
+def editor(plugin, layout, seed):
+    """
+    Create function editing the group config
+
+    Each call moves a person out of (or back into) a group
+
+    :param plugin: Plugin under test
+    :type plugin: paps_soundmix.SoundMixPlugin
+    :param layout: Groups settings
+    :type layout: list[dict]
+    :param seed: Offset for the group to start with
+    :type seed: int
+    :rtype: (int) -> None
+    """
+    def edit(i):
+        group = dict(layout[(seed + i) % len(layout)])
+        if (i // len(layout)) % 2 == 0:
+            group['people'] = group['people'][1:]
+        plugin.on_config({'groups': [group]})
+    return edit
+
+
+def settle(plugin, mixer, quiet=0.1, timeout=30.0):
+    """
+    Wait until all events are applied and no more volumes are set
+
+    :param plugin: Plugin under test
+    :type plugin: paps_soundmix.SoundMixPlugin
+    :param mixer: Mixer of plugin
+    :type mixer: paps_soundmix.mixer.NullMixer
+    :param quiet: Seconds without new calls (default: 0.1)
+    :type quiet: float
+    :param timeout: Maximum seconds to wait (default: 30.0)
+    :type timeout: float
+    :return: Time the queued events were drained
+    :rtype: float
+    """
+    end = default_timer() + timeout
+    while plugin._people_queue and default_timer() < end:
+        time.sleep(0.001)
+    drained = default_timer()
+    calls = len(mixer.calls)
+    while default_timer() < end:
+        time.sleep(quiet)
+        if len(mixer.calls) == calls:
+            break
+        calls = len(mixer.calls)
+    return drained
+
+
+def bench(plugin_name, size, groups, args):
+    """
+    Run one benchmark
+
+    :param plugin_name: Name of plugin class (see PLUGINS)
+    :type plugin_name: unicode
+    :param size: Number of people
+    :type size: int
+    :param groups: Number of groups
+    :type groups: int
+    :param args: Command line arguments
+    :type args: argparse.Namespace
+    :return: Results
+    :rtype: dict
+    """
+    if plugin_name == "SoundMixLeftRightPlugin":
+        # Works with left and right group only
+        groups = 2
+    mixer = NullMixer({'history': 10 ** 7})
+    plugin = PLUGINS[plugin_name]({
+        'files': [SOUND_FILE],
+        'mixer': mixer,
+        'channels_number': max(1, min(groups, args.channels)),
+        'updater_timeout': args.updater_timeout,
+        'crowd_engine': args.engine,
+        'metrics': args.metrics,
+        'volume_attack': args.attack,
+        'volume_release': args.release
+    })
+    people = population(size)
+    layout = groups_layout(
+        people, groups, args.layout, max(1, min(groups, args.channels)),
+        seed=args.seed
+    )
+
+    memory = None
+    if tracemalloc is not None:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+    plugin.on_person_new(people)
+    plugin.on_config({'groups': layout})
+    if plugin_name == "SoundMixMatrixPlugin":
+        # Spread groups from left to right
+        plugin.on_config({'matrix': [
+            {
+                'group_id': g['id'],
+                'channel': g['channel_id'],
+                'left': 1.0 - i / max(1, len(layout) - 1),
+                'right': i / max(1, len(layout) - 1)
+            }
+            for i, g in enumerate(layout)
+        ]})
+    if tracemalloc is not None:
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        diff = sum(s.size_diff for s in after.compare_to(before, "filename"))
+        memory = diff / size
+
+    plugin.start()
+    try:
+        settle(plugin, mixer)
+        mixer.calls.clear()
+        probe = LockProbe({
+            'groups': plugin._groups_lock,
+            'people': plugin._people_lock,
+            'channels': plugin._channels_lock
+        })
+        probe.start()
+        workers = [
+            Worker(lambda i: plugin.get_data(), args.contention_interval)
+            for _ in range(args.readers)
+        ]
+        editors = [
+            Worker(editor(plugin, layout, i), args.contention_interval)
+            for i in range(args.editors)
+        ]
+        for w in workers + editors:
+            w.start()
+        events = list(waves(people, args.batch, args.waves))
+        stamps = []
+        start = default_timer()
+        for event in events:
+            stamps.append(default_timer())
+            plugin.on_person_update(event)
+            if args.interval:
+                time.sleep(args.interval)
+        for w in workers + editors:
+            w.stop()
+        drained = settle(plugin, mixer)
+        probe.stop()
+    finally:
+        plugin.stop()
+
+    volume_calls = [c[0] for c in mixer.calls if c[2] == "set_volume"]
+    # Until all events are applied and the last volume is set
+    end = max([drained] + volume_calls)
+    latencies = []
+    for stamp, after in zip(stamps, stamps[1:] + [end]):
+        # First volume change after event (and before the next one)
+        i = bisect.bisect_left(volume_calls, stamp)
+        if i < len(volume_calls) and volume_calls[i] <= after:
+            latencies.append(volume_calls[i] - stamp)
+    updates = sum(len(event) for event in events)
+    data = plugin.get_data()
+    return {
+        'plugin': plugin_name,
+        'people': size,
+        'groups': groups,
+        'layout': args.layout,
+        'engine': args.engine,
+        'events': len(events),
+        'person_updates': updates,
+        'duration_s': end - start,
+        'throughput_updates_per_s': updates / (end - start),
+        'set_volume_calls': len(volume_calls),
+        'events_applied': len(latencies),
+        'latency_ms': percentiles(latencies),
+        'lock_wait_ms': {
+            name: percentiles(waits)
+            for name, waits in probe.waits.items()
+        },
+        'get_data_ms': percentiles(
+            [d for w in workers for d in w.durations]
+        ),
+        'on_config_ms': percentiles(
+            [d for w in editors for d in w.durations]
+        ),
+        'memory_per_person_bytes': memory,
+        'volume_stats': data['volume_stats'],
+        'metrics': data['metrics']
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the volume pipeline with synthetic audiences"
+    )
+    parser.add_argument(
+        "--plugins", nargs="+", default=sorted(PLUGINS.keys()),
+        choices=sorted(PLUGINS.keys())
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[10, 100, 1000, 10000, 100000]
+    )
+    parser.add_argument("--groups", nargs="+", type=int, default=[8])
+    parser.add_argument(
+        "--layout", default="blocks", choices=["blocks", "stripes", "random"]
+    )
+    parser.add_argument(
+        "--engine", default="python", choices=["python", "numpy"]
+    )
+    parser.add_argument("--channels", type=int, default=8)
+    parser.add_argument(
+        "--batch", type=int, default=10, help="People per event"
+    )
+    parser.add_argument("--waves", type=int, default=2)
+    parser.add_argument(
+        "--interval", type=float, default=0.01,
+        help="Seconds between events (0 -> as fast as possible - events "
+             "are coalesced)"
+    )
+    parser.add_argument("--updater-timeout", type=float, default=1.0)
+    parser.add_argument(
+        "--attack", type=float, default=0.0,
+        help="Volume ramp time constant (rising) in seconds (0 -> off)"
+    )
+    parser.add_argument(
+        "--release", type=float, default=None,
+        help="Volume ramp time constant (falling) (default: attack)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--readers", type=int, default=0,
+        help="Threads polling get_data() while events are fed"
+    )
+    parser.add_argument(
+        "--editors", type=int, default=0,
+        help="Threads changing groups while events are fed"
+    )
+    parser.add_argument(
+        "--contention-interval", type=float, default=0.001,
+        help="Seconds between calls of readers/editors"
+    )
+    parser.add_argument(
+        "--metrics", action="store_true",
+        help="Enable timing histograms of plugin"
+    )
+    parser.add_argument("--output", help="Write results to file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for plugin_name in args.plugins:
+        for size in args.sizes:
+            for groups in args.groups:
+                res = bench(plugin_name, size, groups, args)
+                print(
+                    "{plugin} {people} people {groups} groups: "
+                    "{throughput_updates_per_s:.0f} updates/s".format(**res),
+                    file=sys.stderr
+                )
+                results.append(res)
+    report = {
+        'meta': {
+            'version': paps_soundmix.__version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'date': datetime.datetime.utcnow().isoformat(),
+            'arguments': vars(args)
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(report, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 23:55
+""" Coordinator and two playback nodes on localhost (no sound device) """
+
+import time
+from pprint import pprint
+
+from paps.person import Person
+
+from paps_soundmix import SoundMixPlugin
+from paps_soundmix.remote import PlaybackNode
+
+
+if __name__ == "__main__":
+    import logging
+    logging.basicConfig(level=logging.INFO)
+
+    # Port 0 -> any free port
+    nodes = [
+        PlaybackNode({'host': "127.0.0.1", 'port': 0, 'mixer': "null"})
+        for _ in range(2)
+    ]
+    for node in nodes:
+        node.start(blocking=False)
+    coordinator = SoundMixPlugin({
+        'files': ["data/Groundloop.wav", "data/Bell Accent.wav"],
+        'resource_path': "paps_soundmix/resources/",
+        'mixer': "remote",
+        'mixer_settings': {
+            'nodes': ["127.0.0.1:{}".format(node.port) for node in nodes],
+            'ping_interval': 0.2
+        }
+    })
+    try:
+        coordinator.start(blocking=False)
+        # Connect and estimate clock offsets
+        time.sleep(1.0)
+        coordinator.on_person_new([
+            Person("a", True), Person("b", True), Person("c", True)
+        ])
+        coordinator.on_config({
+            'groups': [{
+                'id': 1, 'name': "a+b", 'people': [{'id': "a"}, {'id': "b"}],
+                'active_definition': "standing", 'action': "percent",
+                'channel_id': 0
+            }, {
+                'id': 2, 'name': "c", 'people': [{'id': "c"}],
+                'active_definition': "standing", 'action': "percent",
+                'channel_id': 1
+            }],
+            'channels': {
+                0: {'id': 0, 'files': [0]},
+                1: {'id': 1, 'files': [1]}
+            },
+            'sync_play': [0, 1]
+        })
+        time.sleep(0.5)
+        coordinator.on_person_update([Person("b", False)])
+        time.sleep(0.5)
+        pprint(coordinator.get_data()['mixer'])
+        for node in nodes:
+            pprint(node.stats())
+    finally:
+        coordinator.stop()
+        for node in nodes:
+            node.stop()
@@ -15,8 +15,9 @@ __date__ = "2016-04-02"
 import logging
 
 from .plugin import SoundMixPlugin
+from .matrix import SoundMixMatrixPlugin
 from .leftright import SoundMixLeftRightPlugin
 from .angel import Angel
 
-__all__ = ["plugin", "leftright", "angel"]
+__all__ = ["plugin", "matrix", "leftright", "angel"]
 logger = logging.getLogger(__name__)
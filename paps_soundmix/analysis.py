@@ -0,0 +1,502 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-19 02:10
+""" Analysis of sound files (loudness, envelopes) cached by content hash """
+
+import hashlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import struct
+import threading
+from timeit import default_timer
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from flotils.logable import Logable
+from paps.crowd import PluginException
+
+from .journal import file_replace
+from .softmix import pcm_to_float
+from .tempo import tempo_detect
+from .wavfile import WaveFile
+
+
+ANALYSIS_VERSION = 1
+""" Bump when results change (older cache files are analysed again) """
+MAGIC = b"PSMA"
+HEADER = struct.Struct("!4sHI")
+""" File header - magic, version, length of json metadata """
+ARRAYS = ("envelope_rms", "envelope_peak", "waveform_min", "waveform_max")
+""" Arrays of result (stored as little endian float32) """
+WINDOW = 0.05
+""" Seconds per envelope value """
+SEGMENT = 0.1
+""" Seconds per loudness measurement (gating block is 4 segments) """
+WAVEFORM_POINTS = 1000
+""" Most min/max pairs of waveform preview """
+
+
+def file_hash(path):
+    """
+    Hash content of file
+
+    :param path: Path to file
+    :type path: unicode
+    :return: Hex digest (sha1)
+    :rtype: unicode
+    :raises IOError: Failed to read file
+    """
+    h = hashlib.sha1()
+    with io.open(path, "rb") as f:
+        while True:
+            chunk = f.read(1 << 20)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _biquad_power(b, a, w):
+    """
+    Power response of a biquad filter
+
+    :param b: Numerator coefficients
+    :type b: (float, float, float)
+    :param a: Denominator coefficients
+    :type a: (float, float, float)
+    :param w: Angular frequencies (radians per sample)
+    :type w: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+    z = np.exp(-1j * w)
+    num = b[0] + b[1] * z + b[2] * z * z
+    den = a[0] + a[1] * z + a[2] * z * z
+    return np.abs(num) ** 2 / np.abs(den) ** 2
+
+
+def k_weighting(frequency, size):
+    """
+    Power response of the ITU-R BS.1770 K-weighting filter
+
+    :param frequency: Sample rate
+    :type frequency: int
+    :param size: Number of samples (rfft length)
+    :type size: int
+    :return: Weight per rfft bin
+    :rtype: numpy.ndarray
+    """
+    w = 2.0 * math.pi * np.fft.rfftfreq(size)
+    # Stage 1 - high shelf (head), bilinear transform as in the reference
+    gain, q, fc = 3.99984385397, 0.7071752369554193, 1681.974450955533
+    k = math.tan(math.pi * fc / frequency)
+    vh = 10.0 ** (gain / 20.0)
+    vb = vh ** 0.4996667741545416
+    shelf = _biquad_power(
+        (vh + vb * k / q + k * k, 2.0 * (k * k - vh), vh - vb * k / q + k * k),
+        (1.0 + k / q + k * k, 2.0 * (k * k - 1.0), 1.0 - k / q + k * k),
+        w
+    )
+    # Stage 2 - high pass (RLB)
+    q, fc = 0.5003270373238773, 38.13547087602444
+    k = math.tan(math.pi * fc / frequency)
+    a0 = 1.0 + k / q + k * k
+    # Numerator is not normalized by a0 in the reference either
+    high_pass = _biquad_power(
+        (1.0, -2.0, 1.0),
+        (1.0, 2.0 * (k * k - 1.0) / a0, (1.0 - k / q + k * k) / a0),
+        w
+    )
+    return shelf * high_pass
+
+
+def loudness_integrate(powers):
+    """
+    Gated integrated loudness (ITU-R BS.1770)
+
+    :param powers: K-weighted mean square per segment and channel
+        (segments x channels) - a gating block is 4 segments
+    :type powers: numpy.ndarray
+    :return: Loudness in LUFS (None -> silence)
+    :rtype: None | float
+    """
+    if len(powers) < 4:
+        return None
+    # Overlapping (75%) 400ms blocks, channel weights 1.0
+    blocks = (
+        powers[:-3] + powers[1:-2] + powers[2:-1] + powers[3:]
+    ).sum(axis=1) / 4.0
+    with np.errstate(divide="ignore"):
+        levels = -0.691 + 10.0 * np.log10(blocks)
+    blocks = blocks[levels > -70.0]
+    if not len(blocks):
+        return None
+    relative = -0.691 + 10.0 * math.log10(blocks.mean()) - 10.0
+    with np.errstate(divide="ignore"):
+        blocks = blocks[-0.691 + 10.0 * np.log10(blocks) > relative]
+    return float(-0.691 + 10.0 * math.log10(blocks.mean()))
+
+
+def analyse(path, chunk=10.0):
+    """
+    Analyse wav file (reads it once in chunks)
+
+    :param path: Path to PCM wav file
+    :type path: unicode
+    :param chunk: Seconds converted at once (default: 10.0)
+    :type chunk: float
+    :return: Duration, format, peak, rms, loudness (LUFS), tempo,
+        envelopes (rms/peak per WINDOW) and waveform preview (min/max)
+    :rtype: dict
+    :raises PluginException: numpy not installed
+    :raises IOError: Failed to read file
+    :raises ValueError: Not a PCM wav file
+    """
+    if np is None:
+        raise PluginException("Package numpy not installed")
+    wav = WaveFile(path)
+    try:
+        window = max(1, int(round(WINDOW * wav.frequency)))
+        segment = max(1, int(round(SEGMENT * wav.frequency)))
+        weights = k_weighting(wav.frequency, segment)
+        # Parseval for rfft (bins except DC/nyquist appear twice)
+        weights[1:(segment + 1) // 2] *= 2.0
+        step = max(1, int(chunk / SEGMENT)) * segment
+        rms, peaks, mins, maxs, powers = [], [], [], [], []
+        total = 0.0
+        for frame in range(0, wav.frames, step):
+            data = pcm_to_float(
+                wav.view(frame, step), wav.sample_width, wav.channels
+            )
+            total += float(np.square(data, dtype="f8").sum())
+            n = len(data) // window
+            if n:
+                w = data[:n * window].reshape(n, window, wav.channels)
+                rms.append(np.sqrt(np.square(w).mean(axis=(1, 2))))
+                peaks.append(np.abs(w).max(axis=(1, 2)))
+                mono = w.mean(axis=2)
+                mins.append(mono.min(axis=1))
+                maxs.append(mono.max(axis=1))
+            n = len(data) // segment
+            if n:
+                s = data[:n * segment].reshape(n, segment, wav.channels)
+                spectrum = np.abs(np.fft.rfft(s, axis=1)) ** 2
+                powers.append(
+                    (spectrum * weights[None, :, None]).sum(axis=1) /
+                    (segment * segment)
+                )
+
+        def joined(parts, columns=None):
+            if not parts:
+                shape = (0,) if columns is None else (0, columns)
+                return np.zeros(shape, dtype="f4")
+            return np.concatenate(parts)
+        rms, peaks = joined(rms), joined(peaks)
+        mins, maxs = joined(mins), joined(maxs)
+        if len(mins) > WAVEFORM_POINTS:
+            # Min/max of buckets of windows
+            edges = np.linspace(0, len(mins), WAVEFORM_POINTS + 1)
+            edges = edges.astype(int)[:-1]
+            mins = np.minimum.reduceat(mins, edges)
+            maxs = np.maximum.reduceat(maxs, edges)
+        try:
+            tempo = tempo_detect(wav)
+        except ValueError:
+            tempo = None
+        samples = wav.frames * wav.channels
+        return {
+            'duration': wav.length,
+            'frequency': wav.frequency,
+            'channels': wav.channels,
+            'frames': wav.frames,
+            'peak': float(peaks.max()) if len(peaks) else 0.0,
+            'rms': math.sqrt(total / samples) if samples else 0.0,
+            'loudness': loudness_integrate(joined(powers, wav.channels)),
+            'tempo': tempo,
+            'window': WINDOW,
+            'envelope_rms': rms.astype("f4"),
+            'envelope_peak': peaks.astype("f4"),
+            'waveform_min': mins.astype("f4"),
+            'waveform_max': maxs.astype("f4")
+        }
+    finally:
+        wav.close()
+
+
+def analysis_pack(result):
+    """
+    Serialize analysis (header, json metadata, float32 arrays)
+
+    :param result: Analysis (see analyse)
+    :type result: dict
+    :rtype: bytes
+    """
+    meta = {
+        key: value for key, value in result.items() if key not in ARRAYS
+    }
+    meta['arrays'] = [[key, len(result[key])] for key in ARRAYS]
+    meta = json.dumps(meta).encode("utf-8")
+    return HEADER.pack(MAGIC, ANALYSIS_VERSION, len(meta)) + meta + b"".join(
+        np.asarray(result[key], dtype="<f4").tobytes() for key in ARRAYS
+    )
+
+
+def analysis_unpack(data):
+    """
+    Deserialize analysis
+
+    :param data: Serialized analysis (see analysis_pack)
+    :type data: bytes
+    :return: Analysis (see analyse)
+    :rtype: dict
+    :raises ValueError: Invalid data or other version
+    """
+    try:
+        magic, version, size = HEADER.unpack_from(data)
+    except struct.error:
+        raise ValueError("Data too short")
+    if magic != MAGIC or version != ANALYSIS_VERSION:
+        raise ValueError("Unknown format")
+    offset = HEADER.size + size
+    result = json.loads(data[HEADER.size:offset].decode("utf-8"))
+    for key, length in result.pop('arrays'):
+        if offset + length * 4 > len(data):
+            raise ValueError("Data too short")
+        result[key] = np.frombuffer(
+            data, dtype="<f4", count=length, offset=offset
+        )
+        offset += length * 4
+    return result
+
+
+def _analyse_job(path):
+    """
+    Run analysis in worker process
+
+    :param path: Path to wav file
+    :type path: unicode
+    :return: Path, analysis (None -> failed), error
+    :rtype: (unicode, None | dict, None | unicode)
+    """
+    try:
+        return path, analyse(path), None
+    except Exception as e:
+        return path, None, u"{}".format(e)
+
+
+def _pool_context():
+    """
+    Get multiprocessing context for worker processes
+
+    Analysis runs while other threads hold locks (e.g. logging) - forked
+    children could deadlock on them, spawned ones start fresh.
+    Python 2 only forks.
+
+    :rtype: multiprocessing.context.BaseContext | module
+    """
+    try:
+        return multiprocessing.get_context("spawn")
+    except AttributeError:
+        return multiprocessing
+
+
+class AnalysisCache(Logable):
+    """
+    Analysis of files stored on disk by content hash
+
+    Content hashes are remembered per path (size and modification time),
+    so unchanged files are neither analysed nor read again
+    """
+
+    def __init__(self, settings=None):
+        """
+        Initialize object
+
+        :param settings: Settings for cache (default: None)
+            path: Directory for cache files
+            workers: Processes analysing files (default: number of cpus)
+        :type settings: dict | None
+        :rtype: None
+        :raises PluginException: numpy not installed
+        """
+        if settings is None:
+            settings = {}
+        super(AnalysisCache, self).__init__(settings)
+        if np is None:
+            raise PluginException("Package numpy not installed")
+        self.path = settings['path']
+        """ Directory for cache files
+            :type path: unicode """
+        self._workers = settings.get('workers') or multiprocessing.cpu_count()
+        self._index_path = os.path.join(self.path, "index.json")
+        self._index = {}
+        """ Content hash per path ([size, mtime, hash])
+            :type _index: dict[unicode, list] """
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'failed': 0,
+            'seconds': 0.0
+        }
+
+    def _index_load(self):
+        """
+        Read hashes of last run
+
+        :rtype: None
+        """
+        try:
+            with io.open(self._index_path, "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+        except (IOError, OSError, ValueError):
+            self._index = {}
+
+    def _index_save(self):
+        """
+        Write hashes (atomically)
+
+        :rtype: None
+        :raises IOError: Failed to write
+        """
+        data = json.dumps(self._index, indent=0, sort_keys=True)
+        file_replace(
+            self._index_path, lambda f: f.write(data.encode("utf-8")), "wb"
+        )
+
+    def key(self, path):
+        """
+        Get content hash of file (hashed only after changes)
+
+        :param path: Path to file
+        :type path: unicode
+        :rtype: unicode
+        :raises IOError: Failed to read file
+        """
+        full_path = os.path.abspath(path)
+        stat = os.stat(full_path)
+        entry = self._index.get(full_path)
+        if entry is not None and entry[0] == stat.st_size \
+                and entry[1] == stat.st_mtime:
+            return entry[2]
+        digest = file_hash(full_path)
+        self._index[full_path] = [stat.st_size, stat.st_mtime, digest]
+        return digest
+
+    def _file(self, key):
+        return os.path.join(self.path, key + ".psma")
+
+    def load(self, key):
+        """
+        Read cached analysis
+
+        :param key: Content hash
+        :type key: unicode
+        :return: Analysis (None -> not cached)
+        :rtype: None | dict
+        """
+        try:
+            with io.open(self._file(key), "rb") as f:
+                return analysis_unpack(f.read())
+        except (IOError, OSError):
+            return None
+        except ValueError:
+            self.warning(u"Ignoring invalid cache file {}".format(key))
+            return None
+
+    def store(self, key, result):
+        """
+        Write analysis to cache
+
+        :param key: Content hash
+        :type key: unicode
+        :param result: Analysis
+        :type result: dict
+        :rtype: None
+        :raises IOError: Failed to write
+        """
+        data = analysis_pack(result)
+        file_replace(self._file(key), lambda f: f.write(data), "wb")
+
+    def analyse(self, paths):
+        """
+        Get analysis of files (missing ones are analysed in parallel)
+
+        :param paths: Paths to wav files
+        :type paths: list[unicode]
+        :return: Analysis per path (None -> failed)
+        :rtype: dict[unicode, None | dict]
+        """
+        start = default_timer()
+        with self._lock:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path)
+            self._index_load()
+            res = {}
+            keys = {}
+            for path in paths:
+                try:
+                    keys[path] = self.key(path)
+                except (IOError, OSError) as e:
+                    self.error(u"Failed to read {} ({})".format(path, e))
+                    res[path] = None
+                    continue
+                res[path] = self.load(keys[path])
+            missing = [
+                path for path in keys
+                if res[path] is None
+            ]
+            self._stats['hits'] += len(keys) - len(missing)
+            self._stats['misses'] += len(missing)
+            if len(missing) > 1 and self._workers > 1:
+                pool = _pool_context().Pool(
+                    min(self._workers, len(missing))
+                )
+                try:
+                    results = list(pool.imap_unordered(_analyse_job, missing))
+                finally:
+                    pool.close()
+                    pool.join()
+            else:
+                results = [_analyse_job(path) for path in missing]
+            for path, result, error in results:
+                if result is None:
+                    self.error(u"Failed to analyse {} ({})".format(
+                        path, error
+                    ))
+                    self._stats['failed'] += 1
+                    continue
+                res[path] = result
+                try:
+                    self.store(keys[path], result)
+                except (IOError, OSError):
+                    self.exception(u"Failed to cache {}".format(path))
+            try:
+                self._index_save()
+            except (IOError, OSError):
+                self.exception("Failed to save index")
+            self._stats['seconds'] += default_timer() - start
+        return res
+
+    def stats(self):
+        """
+        Get cache hits/misses
+
+        :rtype: dict
+        """
+        return dict(self._stats)
@@ -8,10 +8,12 @@ __author__ = "d01"
 __email__ = "jungflor@gmail.com"
 __copyright__ = "Copyright (C) 2016, Florian JUNG"
 __license__ = "MIT"
-__version__ = "0.1.1"
-__date__ = "2016-04-02"
+__version__ = "0.1.2"
+__date__ = "2026-10-18"
 # Created: 2016-03-03 09:17
 
+import logging
+
 from .plugin import SoundMixPlugin
 
 
@@ -23,7 +25,7 @@ class Angel(SoundMixPlugin):
             settings = {}
         super(Angel, self).__init__(settings)
         # Overwrite active definition
-        # -> all people standing are in self._people_active
+        # -> all people standing are in self._crowd.people_active
         self._active_definition = "standing"
 
     def _channels_play(self, channel_index, file_index=None, options=None):
@@ -34,6 +36,16 @@ class Angel(SoundMixPlugin):
             options['loops'] = -1
         super(Angel, self)._channels_play(channel_index, file_index, options)
 
+    def _channels_play_sync(self, channel_indices, options=None):
+        if options is None:
+            options = {}
+        if options.get('loops') is None:
+            # If None -> loop indefinitely
+            options['loops'] = -1
+        return super(Angel, self)._channels_play_sync(
+            channel_indices, options
+        )
+
     def get_info(self):
         info = super(Angel, self).get_info()
         info['description'] = "Play an orchestra with groups"
@@ -59,23 +71,39 @@ class Angel(SoundMixPlugin):
         :rtype: None
         """
         self.debug("()")
+        # Work on latest states
+        self._people_ingest()
         with self._groups_lock:
             gs = self._groups
 
             with self._people_lock:
+                crowd = self._crowd
+                changed = {}
+                moved = set()
                 for i in gs:
                     if i == 0:
                         # Skip not yet placed
                         continue
                     gp = gs[i]['people']
-                    """ :type : set """
+                    """ :type : frozenset """
                     # Empty seats
-                    rm_seats = self._people_active.intersection(gp)
+                    rm_seats = crowd.people_active.intersection(gp)
                     # Unregistered seats
-                    rm_seats.update(gp - self._people)
-                    # Remove from group
-                    gp.difference_update(rm_seats)
-                    gs[0]['people'].update(rm_seats)
+                    rm_seats.update(gp - crowd.people)
+                    if not rm_seats:
+                        continue
+                    # Remove from group (groups are replaced, not modified)
+                    g = dict(gs[i])
+                    g['people'] = gp.difference(rm_seats)
+                    changed[i] = g
+                    crowd.group_discard(i, rm_seats)
+                    moved.update(rm_seats)
+                if changed:
+                    g = dict(gs[0])
+                    g['people'] = g['people'].union(moved)
+                    changed[0] = g
+                    crowd.group_add(0, moved)
+                    self._groups_replace(changed)
 
     def do_data_save(self):
         """
@@ -96,19 +124,22 @@ class Angel(SoundMixPlugin):
             if cmd == "data_save":
                 self.do_data_save()
 
-    def get_data(self):
-        return super(Angel, self).get_data()
+    def get_data(self, since=None):
+        return super(Angel, self).get_data(since)
 
     def on_person_new(self, people):
-        self.debug("People: {}".format([str(p) for p in people]))
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self.debug("People: {}".format([str(p) for p in people]))
         super(Angel, self).on_person_new(people)
 
     def on_person_leave(self, people):
-        self.debug("People: {}".format([str(p) for p in people]))
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self.debug("People: {}".format([str(p) for p in people]))
         super(Angel, self).on_person_leave(people)
 
     def on_person_update(self, people):
-        self.debug("People: {}".format([str(p) for p in people]))
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self.debug("People: {}".format([str(p) for p in people]))
         super(Angel, self).on_person_update(people)
 
     def stop(self):
@@ -0,0 +1,201 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 09:12
+
+import os
+import threading
+from collections import OrderedDict
+
+from flotils.logable import Logable
+
+
+class SoundCache(Logable):
+    """ Size limited cache of decoded sounds (least recently used go first) """
+
+    def __init__(self, loader, sizer, busy, max_size=None):
+        """
+        Initialize object
+
+        :param loader: Function decoding a file into a sound
+        :type loader: (unicode) -> object
+        :param sizer: Function returning the size of a sound in bytes
+        :type sizer: (object) -> int
+        :param busy: Function returning whether a sound is currently playing
+            (busy sounds are never evicted)
+        :type busy: (object) -> bool
+        :param max_size: Memory budget in bytes (default: None)
+            None -> no limit
+        :type max_size: None | int
+        :rtype: None
+        """
+        super(SoundCache, self).__init__()
+        self._loader = loader
+        self._sizer = sizer
+        self._busy = busy
+        self._max_size = max_size
+        """ Memory budget in bytes
+            :type _max_size: None | int """
+        self._entries = OrderedDict()
+        """ Cached sounds (oldest first)
+            :type _entries: OrderedDict[unicode, dict] """
+        self._size = 0
+        """ Bytes currently used
+            :type _size: int """
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._loading = {}
+        """ Files currently being decoded
+            :type _loading: dict[unicode, threading.Event] """
+        self._lock = threading.RLock()
+
+    def get(self, path):
+        """
+        Get decoded sound for file (loads it on miss or if file changed)
+
+        :param path: Path to sound file
+        :type path: unicode
+        :return: Decoded sound
+        :rtype: object
+        :raises IOError: Failed to stat file
+        :raises Exception: Loader failed
+        """
+        mtime = os.path.getmtime(path)
+        while True:
+            with self._lock:
+                entry = self._entries.get(path)
+                if entry is not None and entry['mtime'] == mtime:
+                    # Move to most recently used
+                    del self._entries[path]
+                    self._entries[path] = entry
+                    self._hits += 1
+                    return entry['sound']
+                loading = self._loading.get(path)
+                if loading is None:
+                    self._misses += 1
+                    loading = threading.Event()
+                    self._loading[path] = loading
+                    break
+            # Same file already being decoded (e.g. preload) -> wait for it
+            loading.wait()
+        try:
+            # Decode without holding the lock
+            sound = self._loader(path)
+            size = self._sizer(sound)
+        finally:
+            with self._lock:
+                del self._loading[path]
+            loading.set()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                if entry['mtime'] == mtime:
+                    # Loaded by someone else in the meantime
+                    return entry['sound']
+                # Stale (file changed)
+                self._remove(path)
+            self._reserve(size)
+            self._entries[path] = {
+                'sound': sound,
+                'size': size,
+                'mtime': mtime
+            }
+            self._size += size
+        return sound
+
+    def _remove(self, path):
+        """
+        Remove entry
+
+        Note: Assumes :attr:`_lock` already aquired!
+
+        :param path: Path to sound file
+        :type path: unicode
+        :rtype: None
+        """
+        entry = self._entries.pop(path)
+        self._size -= entry['size']
+
+    def _reserve(self, size):
+        """
+        Evict least recently used sounds that are not playing until size fits
+
+        Note: Assumes :attr:`_lock` already aquired!
+
+        :param size: Bytes needed
+        :type size: int
+        :rtype: None
+        """
+        if self._max_size is None:
+            return
+        for path in list(self._entries.keys()):
+            if self._size + size <= self._max_size:
+                return
+            if self._busy(self._entries[path]['sound']):
+                continue
+            self._remove(path)
+            self._evictions += 1
+        if self._size + size > self._max_size:
+            self.warning(u"Cache over budget ({} + {} > {} bytes)".format(
+                self._size, size, self._max_size
+            ))
+
+    def contains(self, path):
+        """
+        Is sound resident in cache (without loading or touching it)
+
+        :param path: Path to sound file
+        :type path: unicode
+        :rtype: bool
+        """
+        with self._lock:
+            return path in self._entries
+
+    def discard(self, path):
+        """
+        Remove sound from cache (if present)
+
+        :param path: Path to sound file
+        :type path: unicode
+        :rtype: None
+        """
+        with self._lock:
+            if path in self._entries:
+                self._remove(path)
+
+    def clear(self):
+        """
+        Remove all sounds from cache
+
+        :rtype: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """
+        Get usage information
+
+        :return: Counters and memory usage
+        :rtype: dict[unicode, None | int]
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'entries': len(self._entries),
+                'size': self._size,
+                'max_size': self._max_size
+            }
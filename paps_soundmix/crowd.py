@@ -0,0 +1,643 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 11:40
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from paps.crowd import PluginException
+
+
+class CrowdState(object):
+    """
+    Registered/active people and per group member/active counters
+
+    Counters are updated incrementally through a person -> groups index,
+    so every change only costs O(changed people).
+    (Not thread safe - guard with a lock)
+    """
+
+    def __init__(self):
+        super(CrowdState, self).__init__()
+        self.people = set()
+        """ Set of all registered person ids
+            :type people: set[unicode] """
+        self.people_active = set()
+        """ Set of active registered person ids
+            :type people_active: set[unicode] """
+        self._person_groups = {}
+        """ Groups a person is placed in (registered or not)
+            :type _person_groups: dict[unicode, set[int]] """
+        self._members = {}
+        """ Number of registered people per group
+            :type _members: dict[int, int] """
+        self._active = {}
+        """ Number of active registered people per group
+            :type _active: dict[int, int] """
+        self._dirty = set()
+        """ Groups whose counters changed since last dirty_pop()
+            :type _dirty: set[int] """
+        self._total_changed = False
+        """ Number of registered people changed since last dirty_pop()
+            :type _total_changed: bool """
+
+    @property
+    def total(self):
+        """
+        Number of registered people
+
+        :rtype: int
+        """
+        return len(self.people)
+
+    def _count(self, person_id, members, active):
+        """
+        Change counters of all groups a person is in
+
+        :param person_id: Id of person
+        :type person_id: unicode
+        :param members: Change of member count
+        :type members: int
+        :param active: Change of active count
+        :type active: int
+        :rtype: None
+        """
+        for group_id in self._person_groups.get(person_id, ()):
+            self._members[group_id] += members
+            self._active[group_id] += active
+            self._dirty.add(group_id)
+
+    def person_add(self, person_id, active):
+        """
+        Register person (already registered -> update active state)
+
+        :param person_id: Id of person
+        :type person_id: unicode
+        :param active: Is person active
+        :type active: bool
+        :rtype: None
+        """
+        if person_id in self.people:
+            self.person_update(person_id, active)
+            return
+        self.people.add(person_id)
+        self._total_changed = True
+        if active:
+            self.people_active.add(person_id)
+        self._count(person_id, 1, int(active))
+
+    def person_remove(self, person_id):
+        """
+        Unregister person (ignores unknown people)
+
+        :param person_id: Id of person
+        :type person_id: unicode
+        :rtype: None
+        """
+        if person_id not in self.people:
+            return
+        active = person_id in self.people_active
+        self.people.discard(person_id)
+        self.people_active.discard(person_id)
+        self._total_changed = True
+        self._count(person_id, -1, -int(active))
+
+    def person_update(self, person_id, active):
+        """
+        Change active state of person (ignores unregistered people)
+
+        :param person_id: Id of person
+        :type person_id: unicode
+        :param active: Is person active
+        :type active: bool
+        :rtype: None
+        """
+        if person_id not in self.people:
+            return
+        if active == (person_id in self.people_active):
+            # No change
+            return
+        if active:
+            self.people_active.add(person_id)
+            self._count(person_id, 0, 1)
+        else:
+            self.people_active.discard(person_id)
+            self._count(person_id, 0, -1)
+
+    def people_add(self, people):
+        """
+        Register people
+
+        :param people: Ids of people and whether they are active
+        :type people: collections.Iterable[(unicode, bool)]
+        :rtype: None
+        """
+        for person_id, active in people:
+            self.person_add(person_id, active)
+
+    def people_remove(self, people):
+        """
+        Unregister people
+
+        :param people: Ids of people
+        :type people: collections.Iterable[unicode]
+        :rtype: None
+        """
+        for person_id in people:
+            self.person_remove(person_id)
+
+    def people_update(self, people):
+        """
+        Change active state of people
+
+        :param people: Ids of people and whether they are active
+        :type people: collections.Iterable[(unicode, bool)]
+        :rtype: None
+        """
+        for person_id, active in people:
+            self.person_update(person_id, active)
+
+    def group_add(self, group_id, people):
+        """
+        Place people in group
+
+        :param group_id: Id of group
+        :type group_id: int
+        :param people: Ids of people
+        :type people: collections.Iterable[unicode]
+        :rtype: None
+        """
+        self._members.setdefault(group_id, 0)
+        self._active.setdefault(group_id, 0)
+        for person_id in people:
+            groups = self._person_groups.setdefault(person_id, set())
+            if group_id in groups:
+                continue
+            groups.add(group_id)
+            if person_id in self.people:
+                self._dirty.add(group_id)
+                self._members[group_id] += 1
+                if person_id in self.people_active:
+                    self._active[group_id] += 1
+
+    def group_discard(self, group_id, people):
+        """
+        Remove people from group (ignores people not in group)
+
+        :param group_id: Id of group
+        :type group_id: int
+        :param people: Ids of people
+        :type people: collections.Iterable[unicode]
+        :rtype: None
+        """
+        for person_id in people:
+            groups = self._person_groups.get(person_id)
+            if not groups or group_id not in groups:
+                continue
+            groups.discard(group_id)
+            if not groups:
+                del self._person_groups[person_id]
+            if person_id in self.people:
+                self._dirty.add(group_id)
+                self._members[group_id] -= 1
+                if person_id in self.people_active:
+                    self._active[group_id] -= 1
+
+    def group_counts(self, group_id):
+        """
+        Get counters for group
+
+        :param group_id: Id of group
+        :type group_id: int
+        :return: Registered people, active registered people
+        :rtype: (int, int)
+        """
+        return self._members.get(group_id, 0), self._active.get(group_id, 0)
+
+    def percentages(self, groups):
+        """
+        Calculate percentage of active people for groups
+
+        :param groups: Id, action (percent/percent_total) and whether
+            inactive people count as active for each group
+        :type groups: list[(int, unicode, bool)]
+        :return: Percentage per group (-1.0 if not calculable)
+        :rtype: list[float]
+        """
+        res = []
+        total = self.total
+        for group_id, action, inverted in groups:
+            members, act = self.group_counts(group_id)
+            if inverted:
+                act = members - act
+            percent = -1.0
+            if action == "percent":
+                if members:
+                    percent = act / members
+            elif action == "percent_total":
+                if total:
+                    percent = act / total
+            res.append(percent)
+        return res
+
+    def dirty_pop(self):
+        """
+        Get and reset the changes since the last call
+
+        :return: Groups whose counters changed,
+            whether the number of registered people changed
+        :rtype: (set[int], bool)
+        """
+        dirty, total_changed = self._dirty, self._total_changed
+        self._dirty = set()
+        self._total_changed = False
+        return dirty, total_changed
+
+
+class NumpyCrowdState(object):
+    """
+    Registered/active people and group membership as numpy arrays
+
+    Person ids are interned to dense slots. Presence, activity and group
+    membership are stored as boolean arrays, so percentages for many groups
+    are calculated in one vectorized pass.
+    (Same interface as CrowdState - not thread safe)
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize object
+
+        :param capacity: Number of person slots to start with (default: 1024)
+        :type capacity: int
+        :rtype: None
+        :raises PluginException: numpy not installed
+        """
+        if np is None:
+            raise PluginException("Package numpy not installed")
+        super(NumpyCrowdState, self).__init__()
+        self._slots = {}
+        """ Person id -> slot
+            :type _slots: dict[unicode, int] """
+        self._ids = []
+        """ Slot -> person id (None if free)
+            :type _ids: list[None | unicode] """
+        self._free = []
+        """ Unused slots
+            :type _free: list[int] """
+        self._present = np.zeros(capacity, dtype=bool)
+        """ Is slot registered
+            :type _present: numpy.ndarray """
+        self._active = np.zeros(capacity, dtype=bool)
+        """ Is slot active
+            :type _active: numpy.ndarray """
+        self._rows = {}
+        """ Group id -> row in membership matrix
+            :type _rows: dict[int, int] """
+        self._membership = np.zeros((4, capacity), dtype=bool)
+        """ Membership matrix (group row x person slot)
+            :type _membership: numpy.ndarray """
+        self._total = 0
+        self._changed = set()
+        """ Slots changed since last dirty_pop()
+            :type _changed: set[int] """
+        self._dirty = set()
+        """ Groups whose membership changed since last dirty_pop()
+            :type _dirty: set[int] """
+        self._total_changed = False
+
+    @property
+    def people(self):
+        """
+        Set of all registered person ids (generated)
+
+        :rtype: set[unicode]
+        """
+        return {self._ids[i] for i in np.flatnonzero(self._present)}
+
+    @property
+    def people_active(self):
+        """
+        Set of active registered person ids (generated)
+
+        :rtype: set[unicode]
+        """
+        return {
+            self._ids[i]
+            for i in np.flatnonzero(self._present & self._active)
+        }
+
+    @property
+    def total(self):
+        """
+        Number of registered people
+
+        :rtype: int
+        """
+        return self._total
+
+    def _slot(self, person_id):
+        """
+        Get slot for person (allocates new one if unknown)
+
+        :param person_id: Id of person
+        :type person_id: unicode
+        :return: Slot
+        :rtype: int
+        """
+        slot = self._slots.get(person_id)
+        if slot is not None:
+            return slot
+        if self._free:
+            slot = self._free.pop()
+            self._ids[slot] = person_id
+        else:
+            slot = len(self._ids)
+            self._ids.append(person_id)
+            if slot >= len(self._present):
+                self._grow_slots(2 * len(self._present))
+        self._slots[person_id] = slot
+        return slot
+
+    def _slot_release(self, slot):
+        """
+        Free slot if person is neither registered nor placed in a group
+
+        :param slot: Slot
+        :type slot: int
+        :rtype: None
+        """
+        if self._present[slot] or self._membership[:, slot].any():
+            return
+        del self._slots[self._ids[slot]]
+        self._ids[slot] = None
+        self._active[slot] = False
+        self._free.append(slot)
+
+    def _grow_slots(self, capacity):
+        """
+        Enlarge person arrays
+
+        :param capacity: New number of slots
+        :type capacity: int
+        :rtype: None
+        """
+        size = len(self._present)
+        present = np.zeros(capacity, dtype=bool)
+        present[:size] = self._present
+        active = np.zeros(capacity, dtype=bool)
+        active[:size] = self._active
+        membership = np.zeros(
+            (self._membership.shape[0], capacity), dtype=bool
+        )
+        membership[:, :size] = self._membership
+        self._present, self._active = present, active
+        self._membership = membership
+
+    def _row(self, group_id):
+        """
+        Get membership row for group (allocates new one if unknown)
+
+        :param group_id: Id of group
+        :type group_id: int
+        :return: Row
+        :rtype: int
+        """
+        row = self._rows.get(group_id)
+        if row is not None:
+            return row
+        row = len(self._rows)
+        if row >= self._membership.shape[0]:
+            membership = np.zeros(
+                (2 * self._membership.shape[0], self._membership.shape[1]),
+                dtype=bool
+            )
+            membership[:row] = self._membership
+            self._membership = membership
+        self._rows[group_id] = row
+        return row
+
+    def person_add(self, person_id, active):
+        """
+        Register person (already registered -> update active state)
+
+        :param person_id: Id of person
+        :type person_id: unicode
+        :param active: Is person active
+        :type active: bool
+        :rtype: None
+        """
+        self.people_add([(person_id, active)])
+
+    def person_remove(self, person_id):
+        """
+        Unregister person (ignores unknown people)
+
+        :param person_id: Id of person
+        :type person_id: unicode
+        :rtype: None
+        """
+        self.people_remove([person_id])
+
+    def person_update(self, person_id, active):
+        """
+        Change active state of person (ignores unregistered people)
+
+        :param person_id: Id of person
+        :type person_id: unicode
+        :param active: Is person active
+        :type active: bool
+        :rtype: None
+        """
+        self.people_update([(person_id, active)])
+
+    def people_add(self, people):
+        """
+        Register people
+
+        :param people: Ids of people and whether they are active
+        :type people: collections.Iterable[(unicode, bool)]
+        :rtype: None
+        """
+        # Latest state wins
+        people = dict(people)
+        if not people:
+            return
+        slots = np.asarray([self._slot(person_id) for person_id in people])
+        states = [bool(active) for active in people.values()]
+        new = np.count_nonzero(~self._present[slots])
+        if new:
+            self._total = self._total + new
+            self._total_changed = True
+        self._present[slots] = True
+        self._active[slots] = states
+        self._changed.update(slots.tolist())
+
+    def people_remove(self, people):
+        """
+        Unregister people (ignores unknown people)
+
+        :param people: Ids of people
+        :type people: collections.Iterable[unicode]
+        :rtype: None
+        """
+        for person_id in people:
+            slot = self._slots.get(person_id)
+            if slot is None or not self._present[slot]:
+                continue
+            self._present[slot] = False
+            self._active[slot] = False
+            self._total -= 1
+            self._total_changed = True
+            self._changed.add(slot)
+            self._slot_release(slot)
+
+    def people_update(self, people):
+        """
+        Change active state of people (ignores unregistered people)
+
+        :param people: Ids of people and whether they are active
+        :type people: collections.Iterable[(unicode, bool)]
+        :rtype: None
+        """
+        slots = []
+        states = []
+        # Latest state wins
+        for person_id, active in dict(people).items():
+            slot = self._slots.get(person_id)
+            if slot is None:
+                continue
+            slots.append(slot)
+            states.append(bool(active))
+        if not slots:
+            return
+        slots = np.asarray(slots)
+        states = np.asarray(states) & self._present[slots]
+        changed = slots[self._active[slots] != states]
+        self._active[slots] = states
+        self._changed.update(changed.tolist())
+
+    def group_add(self, group_id, people):
+        """
+        Place people in group
+
+        :param group_id: Id of group
+        :type group_id: int
+        :param people: Ids of people
+        :type people: collections.Iterable[unicode]
+        :rtype: None
+        """
+        row = self._row(group_id)
+        slots = [self._slot(person_id) for person_id in people]
+        if slots:
+            self._membership[row, slots] = True
+            self._dirty.add(group_id)
+
+    def group_discard(self, group_id, people):
+        """
+        Remove people from group (ignores people not in group)
+
+        :param group_id: Id of group
+        :type group_id: int
+        :param people: Ids of people
+        :type people: collections.Iterable[unicode]
+        :rtype: None
+        """
+        row = self._rows.get(group_id)
+        if row is None:
+            return
+        slots = [
+            self._slots[person_id] for person_id in people
+            if person_id in self._slots
+        ]
+        if not slots:
+            return
+        self._membership[row, slots] = False
+        self._dirty.add(group_id)
+        for slot in slots:
+            self._slot_release(slot)
+
+    def group_counts(self, group_id):
+        """
+        Get counters for group
+
+        :param group_id: Id of group
+        :type group_id: int
+        :return: Registered people, active registered people
+        :rtype: (int, int)
+        """
+        row = self._rows.get(group_id)
+        if row is None:
+            return 0, 0
+        members = self._membership[row] & self._present
+        return (
+            int(np.count_nonzero(members)),
+            int(np.count_nonzero(members & self._active))
+        )
+
+    def percentages(self, groups):
+        """
+        Calculate percentage of active people for groups (vectorized)
+
+        :param groups: Id, action (percent/percent_total) and whether
+            inactive people count as active for each group
+        :type groups: list[(int, unicode, bool)]
+        :return: Percentage per group (-1.0 if not calculable)
+        :rtype: list[float]
+        """
+        if not groups:
+            return []
+        known = [group_id in self._rows for group_id, _, _ in groups]
+        rows = [self._rows.get(group_id, 0) for group_id, _, _ in groups]
+        membership = self._membership[rows] & self._present
+        members = np.count_nonzero(membership, axis=1)
+        act = np.count_nonzero(membership & self._active, axis=1)
+        members[~np.asarray(known)] = 0
+        act[~np.asarray(known)] = 0
+        inverted = np.asarray([inv for _, _, inv in groups], dtype=bool)
+        act = np.where(inverted, members - act, act)
+        actions = [action for _, action, _ in groups]
+        percent = np.asarray(
+            [action == "percent" for action in actions], dtype=bool
+        )
+        percent_total = np.asarray(
+            [action == "percent_total" for action in actions], dtype=bool
+        )
+        divisor = np.where(percent, members, self._total)
+        valid = (percent | percent_total) & (divisor > 0)
+        res = np.full(len(groups), -1.0)
+        res[valid] = act[valid] / divisor[valid]
+        return res.tolist()
+
+    def dirty_pop(self):
+        """
+        Get and reset the changes since the last call
+
+        :return: Groups whose counters changed,
+            whether the number of registered people changed
+        :rtype: (set[int], bool)
+        """
+        dirty, total_changed = self._dirty, self._total_changed
+        if self._changed and self._rows:
+            slots = list(self._changed)
+            touched = self._membership[:, slots].any(axis=1)
+            dirty.update(
+                group_id for group_id, row in self._rows.items()
+                if touched[row]
+            )
+        self._changed = set()
+        self._dirty = set()
+        self._total_changed = False
+        return dirty, total_changed
@@ -0,0 +1,137 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-19 02:50
+""" Perceptual volume curves and loudness normalising track gains """
+
+import math
+
+
+def _curve_linear(percent, range_db):
+    return percent
+
+
+def _curve_db(percent, range_db):
+    if percent <= 0.0:
+        return 0.0
+    return 10.0 ** (range_db * (percent - 1.0) / 20.0)
+
+
+def _curve_log(percent, range_db):
+    return math.log10(1.0 + 9.0 * percent)
+
+
+def _curve_s_curve(percent, range_db):
+    return percent * percent * (3.0 - 2.0 * percent)
+
+
+CURVES = {
+    'linear': _curve_linear,
+    'db': _curve_db,
+    'log': _curve_log,
+    's_curve': _curve_s_curve
+}
+""" Mapping of crowd percentage (0.0 - 1.0) to volume per curve name
+    (db - linear in decibels over range, log - fast rise,
+    s_curve - slow at both ends) """
+
+
+class VolumeCurve(object):
+    """
+    Lookup table mapping crowd percentages to volumes
+
+    The table is calculated once - mapping a percentage interpolates
+    between two entries. The linear curve returns the percentage as is.
+    """
+
+    def __init__(self, curve="linear", range_db=60.0, size=1024):
+        """
+        Initialize object
+
+        :param curve: Name of curve (see CURVES) (default: linear)
+        :type curve: unicode
+        :param range_db: Decibels between lowest and full volume for db
+            curve (default: 60.0)
+        :type range_db: float
+        :param size: Entries of table (default: 1024)
+        :type size: int
+        :rtype: None
+        :raises ValueError: Unknown curve or invalid size
+        """
+        super(VolumeCurve, self).__init__()
+        if curve not in CURVES:
+            raise ValueError(u"Unknown volume curve {}".format(curve))
+        if size < 2:
+            raise ValueError(u"Invalid table size {}".format(size))
+        self.curve = curve
+        """ Name of curve
+            :type curve: unicode """
+        self.range_db = float(range_db)
+        """ Decibel range of db curve
+            :type range_db: float """
+        func = CURVES[curve]
+        self._linear = curve == "linear"
+        self._scale = size - 1
+        self._table = [
+            min(max(func(i / self._scale, self.range_db), 0.0), 1.0)
+            for i in range(size)
+        ]
+        """ Volume per table entry
+            :type _table: list[float] """
+
+    def __call__(self, percent):
+        """
+        Map percentage to volume
+
+        :param percent: Crowd percentage (clipped to 0.0 - 1.0)
+        :type percent: float
+        :rtype: float
+        """
+        if percent <= 0.0:
+            return self._table[0]
+        if percent >= 1.0:
+            return self._table[-1]
+        if self._linear:
+            return percent
+        position = percent * self._scale
+        i = int(position)
+        low = self._table[i]
+        return low + (self._table[i + 1] - low) * (position - i)
+
+
+def track_gains(loudness, target=None):
+    """
+    Calculate gains bringing files to the same loudness
+
+    Mixers can't amplify (volumes above 1.0 are clipped), so files quieter
+    than the target keep gain 1.0
+
+    :param loudness: Integrated loudness (LUFS) per file index
+        (None -> silent/unknown)
+    :type loudness: dict[int, None | float]
+    :param target: Loudness to reach (default: None)
+        None -> quietest file
+    :type target: None | float
+    :return: Gain (0.0 - 1.0) per file index
+    :rtype: dict[int, float]
+    """
+    known = [value for value in loudness.values() if value is not None]
+    if target is None:
+        if not known:
+            return {file_index: 1.0 for file_index in loudness}
+        target = min(known)
+    return {
+        file_index: 1.0 if value is None else min(
+            1.0, 10.0 ** ((target - value) / 20.0)
+        )
+        for file_index, value in loudness.items()
+    }
@@ -0,0 +1,206 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 18:40
+""" Append only change journal and atomic snapshots for the data file """
+
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from flotils.logable import Logable
+
+
+def file_replace(path, write, mode="w"):
+    """
+    Write file atomically (temporary file, fsync, rename)
+
+    A crash leaves either the old or the new file, never a partial one
+
+    :param path: Path to file
+    :type path: unicode
+    :param write: Function writing the content to an open file
+    :type write: (file) -> None
+    :param mode: Mode to open file with (default: w)
+    :type mode: unicode
+    :rtype: None
+    :raises IOError: Failed to write
+    """
+    tmp = path + ".tmp"
+    with open(tmp, mode) as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    # os.replace overwrites on windows as well (python 3)
+    getattr(os, "replace", os.rename)(tmp, path)
+
+
+def settings_merge(settings, entries):
+    """
+    Fold journal entries into settings (latest state wins)
+
+    :param settings: Snapshot (as created by get_data)
+    :type settings: dict
+    :param entries: Journal entries (channels/groups changes)
+    :type entries: list[dict]
+    :return: Settings for on_config
+    :rtype: dict
+    """
+    res = dict(settings)
+    channels = {}
+    for key, c in res.get('channels', {}).items():
+        # json turns channel indices into strings
+        channels["{}".format(key)] = c
+    groups = OrderedDict(
+        (g['id'], g) for g in res.get('groups', [])
+    )
+    for entry in entries:
+        for key, c in entry.get('channels', {}).items():
+            key = "{}".format(key)
+            if key == "count":
+                channels[key] = c
+                continue
+            merged = dict(channels.get(key, {}))
+            merged.update(c)
+            channels[key] = merged
+        for g in entry.get('groups', []):
+            groups[g['id']] = g
+    if channels:
+        res['channels'] = channels
+    if groups:
+        res['groups'] = list(groups.values())
+    return res
+
+
+class Journal(Logable):
+    """ Append only file of json entries (one per line) """
+
+    def __init__(self, path, fsync=True):
+        """
+        Initialize object
+
+        :param path: Path to journal file
+        :type path: unicode
+        :param fsync: Force entries to disk after each append (default: True)
+        :type fsync: bool
+        :rtype: None
+        """
+        super(Journal, self).__init__()
+        self.path = path
+        """ Path to journal file
+            :type path: unicode """
+        self._fsync = fsync
+        self._file = None
+        """ :type _file: None | io.TextIOWrapper """
+        self.entries = 0
+        """ Number of entries in journal
+            :type entries: int """
+        self._lock = threading.Lock()
+
+    def replay(self):
+        """
+        Read all entries
+
+        A torn last line (crash while appending) is ignored and cut off
+
+        :return: Entries
+        :rtype: list[dict]
+        :raises IOError: Failed to read journal
+        """
+        entries = []
+        if not os.path.isfile(self.path):
+            return entries
+        good = 0
+        with io.open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    self.warning(u"Ignoring incomplete entry at {}".format(
+                        good
+                    ))
+                    break
+                try:
+                    entries.append(json.loads(line.decode("utf-8")))
+                except ValueError:
+                    self.warning(u"Ignoring corrupt entry at {}".format(
+                        good
+                    ))
+                    break
+                good += len(line)
+        if good != os.path.getsize(self.path):
+            # Don't append to garbage
+            with io.open(self.path, "r+b") as f:
+                f.truncate(good)
+        with self._lock:
+            self.entries = len(entries)
+        return entries
+
+    def open(self):
+        """
+        Open journal for appending
+
+        :rtype: None
+        :raises IOError: Failed to open
+        """
+        with self._lock:
+            if self._file is None:
+                self._file = io.open(self.path, "a", encoding="utf-8")
+
+    def append(self, entry):
+        """
+        Add entry
+
+        :param entry: Json serializable entry
+        :type entry: dict
+        :rtype: None
+        :raises IOError: Failed to write
+        """
+        line = "{}\n".format(json.dumps(entry, sort_keys=True))
+        with self._lock:
+            if self._file is None:
+                raise IOError("Journal not open")
+            self._file.write(line)
+            self._file.flush()
+            if self._fsync:
+                os.fsync(self._file.fileno())
+            self.entries += 1
+
+    def reset(self):
+        """
+        Remove all entries (after a snapshot was written)
+
+        :rtype: None
+        :raises IOError: Failed to truncate
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.seek(0)
+                self._file.truncate()
+                self._file.flush()
+                if self._fsync:
+                    os.fsync(self._file.fileno())
+            elif os.path.isfile(self.path):
+                with io.open(self.path, "r+b") as f:
+                    f.truncate(0)
+            self.entries = 0
+
+    def close(self):
+        """
+        Close journal
+
+        :rtype: None
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -8,56 +8,70 @@ __author__ = "d01"
 __email__ = "jungflor@gmail.com"
 __copyright__ = "Copyright (C) 2016, Florian JUNG"
 __license__ = "MIT"
-__version__ = "0.1.1"
-__date__ = "2016-03-31"
+__version__ = "0.1.2"
+__date__ = "2026-10-18"
 # Created: 2016-03-02 03:24
 
-from .plugin import SoundMixPlugin, PlayerException
+from .matrix import SoundMixMatrixPlugin
 
 
-class SoundMixLeftRightPlugin(SoundMixPlugin):
+class SoundMixLeftRightPlugin(SoundMixMatrixPlugin):
     """ Plugin for mixing sound files """
 
     def __init__(self, settings=None):
         if settings is None:
             settings = {}
         super(SoundMixLeftRightPlugin, self).__init__(settings)
+        if settings.get('matrix'):
+            self.warning("Matrix is set by the left/right groups - ignored")
+            self._matrix = self._matrix_create([])
+        self._preset = None
+        """ Groups/channels the matrix was created for
+            (left group, left channel, right group, right channel)
+            :type _preset: None | (int, int, int, int) """
 
-    def _volume_update(self):
+    def _matrix_get(self, gs):
         """
-        Calculate percentages for each group and adjust volume
-        groups_lock - people_lock - channel_lock
+        Route first group to left, second to right side of their channels
 
-        :return: None
+        Note: Assumes :attr:`_people_lock` already aquired!
+
+        :param gs: Groups
+        :type gs: dict[int, dict]
+        :return: Routing matrix (None -> don't touch volumes)
+        :rtype: None | paps_soundmix.routing.RoutingMatrix
         """
-        with self._groups_lock:
-            gs = self._groups
-            if len(gs) != 3:
-                self.warning(
-                    "This plugin is configured for 2 (left - right) only!!"
-                )
-            if len(gs) < 3:
-                self.critical("Refusing to work under this conditions")
-                return
-
-            with self._people_lock:
-                gl = gs.values()[1]
-                """ :type : dict[unicode, int|set|unicode] """
-                gr = gs.values()[2]
-                """ :type : dict[unicode, int|set|unicode] """
-
-                percent_left = self._group_calc_percentage(1, gl)
-                percent_right = self._group_calc_percentage(2, gr)
-
-                if 0.0 <= percent_left <= 1.0 and 0.0 <= percent_right <= 1.0:
-                    # TODO: only update on changes
-                    # Valid percentage value
-                    try:
-                        self._channels_volume(
-                            gl['channel'], (percent_left, 0.0)
-                        )
-                        self._channels_volume(
-                            gr['channel'], (0.0, percent_right)
-                        )
-                    except (ValueError, PlayerException):
-                        self.exception("Failed to set volume")
+        if len(gs) != 3:
+            self.warning(
+                "This plugin is configured for 2 (left - right) only!!"
+            )
+        if len(gs) < 3:
+            self.critical("Refusing to work under this conditions")
+            return None
+        # Percentages are counted per group id
+        group_ids = sorted(gs.keys())
+        left, right = group_ids[1], group_ids[2]
+        key = (left, gs[left]['channel'], right, gs[right]['channel'])
+        if self._preset != key:
+            routes = []
+            if key[1] is not None:
+                routes.append({
+                    'group_id': left, 'channel': key[1],
+                    'left': 1.0, 'right': 0.0
+                })
+            if key[3] is not None:
+                routes.append({
+                    'group_id': right, 'channel': key[3],
+                    'left': 0.0, 'right': 1.0
+                })
+            # Reported by get_data()
+            self._matrix = self._matrix_create(routes)
+            self._preset = key
+        return self._matrix
+
+    def on_config(self, settings):
+        if "matrix" in settings:
+            self.warning("Matrix is set by the left/right groups - ignored")
+            settings = dict(settings)
+            del settings['matrix']
+        super(SoundMixLeftRightPlugin, self).on_config(settings)
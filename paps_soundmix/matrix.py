@@ -0,0 +1,140 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 22:20
+""" Plugin routing any number of groups to any speaker layout """
+
+from .plugin import SoundMixPlugin, PlayerException
+from .routing import np, RoutingMatrix, NumpyRoutingMatrix
+
+
+class SoundMixMatrixPlugin(SoundMixPlugin):
+    """
+    Plugin setting channel volumes through a routing matrix
+
+    Every route feeds the percentage of a group with a gain into the left
+    and right side of a channel. Speaker layouts with more than two
+    speakers use multiple channels (e.g. quad - 2 channels, 5.1 - 3).
+    """
+
+    def __init__(self, settings=None):
+        if settings is None:
+            settings = {}
+        super(SoundMixMatrixPlugin, self).__init__(settings)
+        self._matrix_engine = settings.get(
+            'matrix_engine', "numpy" if np is not None else "python"
+        )
+        """ Implementation of routing matrix (python/numpy)
+            :type _matrix_engine: unicode """
+        if self._matrix_engine not in ["python", "numpy"]:
+            raise ValueError("Matrix engine needs to be python/numpy")
+        self._matrix = self._matrix_create(settings.get('matrix', []))
+        """ Routing matrix (replaced, not modified -> read without locking)
+            :type _matrix: paps_soundmix.routing.RoutingMatrix """
+
+    def _matrix_create(self, routes):
+        """
+        Create routing matrix
+
+        :param routes: Routes (group_id, channel, left, right)
+        :type routes: list[dict]
+        :rtype: paps_soundmix.routing.RoutingMatrix
+        :raises ValueError: Invalid route
+        """
+        if self._matrix_engine == "numpy":
+            return NumpyRoutingMatrix(routes)
+        return RoutingMatrix(routes)
+
+    def _matrix_get(self, gs):
+        """
+        Get routing matrix for the current groups
+
+        Note: Assumes :attr:`_people_lock` already aquired!
+
+        :param gs: Groups
+        :type gs: dict[int, dict]
+        :return: Routing matrix (None -> don't touch volumes)
+        :rtype: None | paps_soundmix.routing.RoutingMatrix
+        """
+        return self._matrix
+
+    def _matrix_set(self, routes):
+        """
+        Replace routing matrix
+
+        :param routes: Routes (group_id, channel, left, right)
+        :type routes: list[dict]
+        :rtype: None
+        :raises ValueError: Invalid route
+        """
+        matrix = self._matrix_create(routes)
+        old, self._matrix = self._matrix, matrix
+        # Recalculate all routed channels
+        for channel_index in set(old.channels) | set(matrix.channels):
+            self._channels_invalidate(channel_index)
+
+    def _volume_update(self):
+        """
+        Calculate percentages of routed groups and set channel gains
+        people_lock - channel_lock
+
+        :return: None
+        """
+        with self._people_lock:
+            # Groups are swapped under people_lock
+            # -> consistent with crowd
+            gs = self._groups
+            with self._channels_lock:
+                # Invalidated channels might not belong to any group
+                channels_dirty = bool(self._channels_dirty)
+            dirty = self._volume_dirty_pop(gs)
+            matrix = self._matrix_get(gs)
+            if matrix is None:
+                return
+            if not channels_dirty and not dirty.intersection(matrix.groups):
+                # Nothing changed
+                return
+            percents = self._groups_calc_percentages({
+                group_id: gs[group_id]
+                for group_id in matrix.groups
+                if group_id in gs
+            })
+        self._volume_stats['computed'] += len(percents)
+        gains = matrix.gains(percents)
+        curve = self._volume_curve
+        for channel_index in gains:
+            left, right = gains[channel_index]
+            try:
+                self._volume_apply(channel_index, (curve(left), curve(right)))
+            except (ValueError, PlayerException):
+                self.exception("Failed to set volume")
+
+    def on_config(self, settings):
+        if "matrix" in settings:
+            try:
+                self._matrix_set(settings['matrix'])
+            except ValueError:
+                self.exception("Failed to set matrix")
+        super(SoundMixMatrixPlugin, self).on_config(settings)
+
+    def get_data(self, since=None):
+        res = super(SoundMixMatrixPlugin, self).get_data(since)
+        res['matrix'] = [
+            {
+                'group_id': group_id,
+                'channel': channel_index,
+                'left': left,
+                'right': right
+            }
+            for group_id, channel_index, left, right in self._matrix.routes
+        ]
+        return res
@@ -0,0 +1,255 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 17:10
+""" Timing histograms for the volume pipeline """
+
+import bisect
+import threading
+from timeit import default_timer
+
+
+BOUNDS = [
+    round(m * 10 ** e, 9)
+    for e in range(-6, 3)
+    for m in (1.0, 2.0, 5.0)
+]
+""" Default upper bucket bounds in seconds (1us - 500s) """
+
+
+class Histogram(object):
+    """ Thread safe histogram with fixed buckets """
+
+    def __init__(self, bounds=None):
+        """
+        Initialize object
+
+        :param bounds: Sorted upper bounds of buckets (default: None)
+            None -> BOUNDS
+        :type bounds: None | list[float]
+        :rtype: None
+        """
+        super(Histogram, self).__init__()
+        if bounds is None:
+            bounds = BOUNDS
+        self.bounds = list(bounds)
+        """ Upper bounds of buckets (last bucket is open)
+            :type bounds: list[float] """
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._min = None
+        self._max = None
+        self._lock = threading.Lock()
+
+    def add(self, value):
+        """
+        Record a value
+
+        :param value: Value to record
+        :type value: float
+        :rtype: None
+        """
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            if self._min is None or value < self._min:
+                self._min = value
+            if self._max is None or value > self._max:
+                self._max = value
+
+    def _percentile(self, q):
+        """
+        Estimate percentile (upper bound of bucket)
+
+        Note: Assumes :attr:`_lock` already aquired!
+
+        :param q: Quantile (0.0 - 1.0)
+        :type q: float
+        :rtype: None | float
+        """
+        if not self._count:
+            return None
+        rank = q * self._count
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if count and seen >= rank:
+                if index >= len(self.bounds):
+                    return self._max
+                return min(self.bounds[index], self._max)
+        return self._max
+
+    def stats(self):
+        """
+        Get summary
+
+        :return: count, sum, min, max, mean, p50, p90, p99 and
+            non empty buckets (upper bound -> count, None is open bucket)
+        :rtype: dict[unicode, int | float | None | list]
+        """
+        with self._lock:
+            bounds = self.bounds + [None]
+            return {
+                'count': self._count,
+                'sum': self._sum,
+                'min': self._min,
+                'max': self._max,
+                'mean': self._sum / self._count if self._count else None,
+                'p50': self._percentile(0.50),
+                'p90': self._percentile(0.90),
+                'p99': self._percentile(0.99),
+                'buckets': [
+                    (bounds[index], count)
+                    for index, count in enumerate(self._counts)
+                    if count
+                ]
+            }
+
+    def reset(self):
+        """
+        Forget all recorded values
+
+        :rtype: None
+        """
+        with self._lock:
+            self._counts = [0] * (len(self.bounds) + 1)
+            self._count = 0
+            self._sum = 0.0
+            self._min = None
+            self._max = None
+
+
+class Metrics(object):
+    """ Named histograms """
+
+    def __init__(self, enabled=True):
+        """
+        Initialize object
+
+        :param enabled: Record values (default: True)
+        :type enabled: bool
+        :rtype: None
+        """
+        super(Metrics, self).__init__()
+        self.enabled = enabled
+        """ Record values (otherwise record() does nothing)
+            :type enabled: bool """
+        self._histograms = {}
+        """ :type _histograms: dict[unicode, Histogram] """
+        self._lock = threading.Lock()
+
+    def histogram(self, name):
+        """
+        Get (or create) histogram
+
+        :param name: Name of histogram
+        :type name: unicode
+        :rtype: Histogram
+        """
+        h = self._histograms.get(name)
+        if h is None:
+            with self._lock:
+                h = self._histograms.setdefault(name, Histogram())
+        return h
+
+    def record(self, name, value):
+        """
+        Record value in histogram
+
+        :param name: Name of histogram
+        :type name: unicode
+        :param value: Value to record
+        :type value: float
+        :rtype: None
+        """
+        if self.enabled:
+            self.histogram(name).add(value)
+
+    def stats(self):
+        """
+        Get summary of all histograms
+
+        :rtype: dict[unicode, dict]
+        """
+        with self._lock:
+            hs = dict(self._histograms)
+        return {name: hs[name].stats() for name in hs}
+
+    def reset(self):
+        """
+        Reset all histograms
+
+        :rtype: None
+        """
+        with self._lock:
+            hs = list(self._histograms.values())
+        for h in hs:
+            h.reset()
+
+
+class TimedLock(object):
+    """
+    Lock wrapper recording wait and hold times
+
+    Hold time is measured from the outermost acquire to the matching
+    release (reentrant locks)
+    """
+
+    def __init__(self, lock, metrics, name):
+        """
+        Initialize object
+
+        :param lock: Lock to wrap
+        :type lock: threading.RLock | threading.Lock
+        :param metrics: Where to record times
+        :type metrics: Metrics
+        :param name: Name of lock (histograms lock_wait.<name>,
+            lock_hold.<name>)
+        :type name: unicode
+        :rtype: None
+        """
+        super(TimedLock, self).__init__()
+        self._lock = lock
+        self._wait = metrics.histogram(u"lock_wait.{}".format(name))
+        self._hold = metrics.histogram(u"lock_hold.{}".format(name))
+        self._local = threading.local()
+        """ Nesting depth and time of outermost acquire per thread """
+
+    def acquire(self, blocking=True):
+        start = default_timer()
+        acquired = self._lock.acquire(blocking)
+        if not acquired:
+            return acquired
+        now = default_timer()
+        depth = getattr(self._local, "depth", 0)
+        if depth == 0:
+            self._wait.add(now - start)
+            self._local.acquired = now
+        self._local.depth = depth + 1
+        return acquired
+
+    def release(self):
+        depth = self._local.depth - 1
+        self._local.depth = depth
+        if depth == 0:
+            self._hold.add(default_timer() - self._local.acquired)
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
@@ -0,0 +1,606 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 14:05
+
+import os
+import threading
+import wave
+from abc import ABCMeta, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from timeit import default_timer
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+from flotils.logable import Logable
+from paps.crowd import PluginException
+
+
+class MixerBackend(Logable):
+    """
+    Abstract interface for the audio output of SoundMixPlugin
+
+    Channels returned by channel() follow the pygame.mixer.Channel interface
+    (play, stop, pause, unpause, set_volume, get_volume, get_busy)
+    """
+    __metaclass__ = ABCMeta
+
+    def __init__(self, settings=None):
+        """
+        Initialize object
+
+        :param settings: Settings for backend (default: None)
+        :type settings: dict | None
+        :rtype: None
+        """
+        if settings is None:
+            settings = {}
+        super(MixerBackend, self).__init__(settings)
+
+    @abstractmethod
+    def init(self):
+        """
+        Set up audio output
+
+        :rtype: None
+        """
+        raise NotImplementedError("Please implement")
+
+    @abstractmethod
+    def quit(self):
+        """
+        Shut down audio output (sounds become invalid)
+
+        :rtype: None
+        """
+        raise NotImplementedError("Please implement")
+
+    @abstractmethod
+    def channels_number_set(self, number):
+        """
+        Set number of available channels
+
+        :param number: Number of channels
+        :type number: int
+        :rtype: None
+        """
+        raise NotImplementedError("Please implement")
+
+    @abstractmethod
+    def channels_number_get(self):
+        """
+        Get number of available channels
+
+        :rtype: int
+        """
+        raise NotImplementedError("Please implement")
+
+    @abstractmethod
+    def channel(self, index):
+        """
+        Get channel
+
+        :param index: Index of channel
+        :type index: int
+        :return: Channel object
+        :rtype: pygame.mixer.Channel | NullChannel
+        """
+        raise NotImplementedError("Please implement")
+
+    @abstractmethod
+    def sound_load(self, path):
+        """
+        Decode sound file
+
+        :param path: Path to sound file
+        :type path: unicode
+        :return: Decoded sound
+        :rtype: object
+        """
+        raise NotImplementedError("Please implement")
+
+    @abstractmethod
+    def sound_size(self, sound):
+        """
+        Get memory used by decoded sound
+
+        :param sound: Decoded sound
+        :type sound: object
+        :return: Size in bytes
+        :rtype: int
+        """
+        raise NotImplementedError("Please implement")
+
+    @abstractmethod
+    def sound_busy(self, sound):
+        """
+        Is sound playing on any channel
+
+        :param sound: Decoded sound
+        :type sound: object
+        :rtype: bool
+        """
+        raise NotImplementedError("Please implement")
+
+    def stream_compatible(self, wav):
+        """
+        Can the samples of the file be played without decoding
+        (see sound_chunk)
+
+        :param wav: File to stream
+        :type wav: paps_soundmix.wavfile.WaveFile
+        :rtype: bool
+        """
+        return False
+
+    def sound_chunk(self, wav, frame, frames):
+        """
+        Create sound from part of a mapped file
+
+        Backends reference the mapped samples where possible instead of
+        copying them
+
+        :param wav: File to play
+        :type wav: paps_soundmix.wavfile.WaveFile
+        :param frame: First frame
+        :type frame: int
+        :param frames: Number of frames
+        :type frames: int
+        :return: Sound
+        :rtype: object
+        :raises IOError: Failed to read file
+        """
+        raise NotImplementedError("Streaming not supported")
+
+    @contextmanager
+    def batch(self):
+        """
+        Context for starting several channels together
+
+        Yields whether channels started within the context are guaranteed
+        to start with the same block (default: no guarantee)
+
+        :rtype: collections.Iterator[bool]
+        """
+        yield False
+
+    def stats(self):
+        """
+        Get backend specific information for frontend
+
+        :rtype: dict
+        """
+        return {}
+
+
+class PygameMixer(MixerBackend):
+    """ Audio output through pygame.mixer """
+
+    def __init__(self, settings=None):
+        """
+        Initialize object
+
+        :param settings: Settings for pygame.mixer.init()
+            (frequency, size, channels, buffer) (default: None)
+        :type settings: dict | None
+        :rtype: None
+        :raises PluginException: pygame not installed
+        """
+        if settings is None:
+            settings = {}
+        super(PygameMixer, self).__init__(settings)
+        if pygame is None:
+            raise PluginException("Package pygame not installed")
+        self._init_settings = {
+            key: settings[key]
+            for key in ["frequency", "size", "channels", "buffer"]
+            if key in settings
+        }
+        """ Arguments for pygame.mixer.init()
+            :type _init_settings: dict[unicode, int] """
+
+    def init(self):
+        pygame.mixer.init(**self._init_settings)
+
+    def quit(self):
+        pygame.mixer.quit()
+
+    def channels_number_set(self, number):
+        pygame.mixer.set_num_channels(number)
+
+    def channels_number_get(self):
+        return pygame.mixer.get_num_channels()
+
+    def channel(self, index):
+        return pygame.mixer.Channel(index)
+
+    def sound_load(self, path):
+        return pygame.mixer.Sound(path)
+
+    def sound_size(self, sound):
+        frequency, fmt, channels = pygame.mixer.get_init()
+        return int(
+            sound.get_length() * frequency * channels * (abs(fmt) // 8)
+        )
+
+    def sound_busy(self, sound):
+        return sound.get_num_channels() > 0
+
+    def stream_compatible(self, wav):
+        init = pygame.mixer.get_init()
+        if init is None:
+            return False
+        frequency, fmt, channels = init
+        if wav.frequency != frequency or wav.channels != channels:
+            return False
+        # 8 bit wav is unsigned, 16 bit signed
+        return (wav.sample_width, fmt) in [(1, 8), (2, -16)]
+
+    def sound_chunk(self, wav, frame, frames):
+        # pygame copies the samples into its own chunk
+        return pygame.mixer.Sound(buffer=wav.view(frame, frames))
+
+
+class NullSound(object):
+    """ Sound that is never decoded (only header information) """
+
+    def __init__(self, path, size=None, length=None, chunk=None):
+        """
+        Initialize object
+
+        :param path: Path to sound file
+        :type path: unicode
+        :param size: Size in bytes (default: None)
+            None -> read from file
+        :type size: None | int
+        :param length: Length in seconds (default: None)
+            None -> read from file
+        :type length: None | float
+        :param chunk: Part of file (first frame, frames) (default: None)
+            None -> whole file
+        :type chunk: None | (int, int)
+        :rtype: None
+        :raises IOError: File not found
+        """
+        super(NullSound, self).__init__()
+        self.path = path
+        """ Path to sound file
+            :type path: unicode """
+        self.size = size
+        """ Size of (decoded) sound in bytes
+            :type size: int """
+        self.length = length
+        """ Length of sound in seconds
+            :type length: float """
+        self.chunk = chunk
+        """ Part of file (first frame, frames) - None means whole file
+            :type chunk: None | (int, int) """
+        if size is None or length is None:
+            self.size = os.path.getsize(path)
+            self.length = 0.0
+            try:
+                w = wave.open(path, "rb")
+                try:
+                    self.size = w.getnframes() * w.getnchannels() * \
+                        w.getsampwidth()
+                    self.length = w.getnframes() / w.getframerate()
+                finally:
+                    w.close()
+            except (wave.Error, EOFError):
+                # Not a wav file -> keep file size
+                pass
+        self.channels = set()
+        """ Channels currently set to this sound
+            :type channels: set[NullChannel] """
+
+    def get_length(self):
+        return self.length
+
+    def get_num_channels(self):
+        return len([c for c in self.channels if c.get_busy()])
+
+
+class NullChannel(object):
+    """ Channel without audio output (records calls) """
+
+    def __init__(self, mixer, index):
+        """
+        Initialize object
+
+        :param mixer: Mixer this channel belongs to
+        :type mixer: NullMixer
+        :param index: Index of channel
+        :type index: int
+        :rtype: None
+        """
+        super(NullChannel, self).__init__()
+        self._mixer = mixer
+        self.index = index
+        """ Index of channel
+            :type index: int """
+        self._sound = None
+        """ :type _sound: None | NullSound """
+        self._queue = None
+        """ :type _queue: None | NullSound """
+        self._volume = (1.0, 1.0)
+        self._loops = 0
+        self._maxtime = 0
+        self._started = None
+        """ Time playback started (shifted by time paused)
+            :type _started: None | float """
+        self._paused = None
+        """ Time paused
+            :type _paused: None | float """
+
+    def _elapsed(self):
+        if self._started is None:
+            return 0.0
+        now = self._paused if self._paused is not None else default_timer()
+        return now - self._started
+
+    def _end(self):
+        """
+        Time playback of current sound ends (relative to start)
+
+        :rtype: None | float
+        """
+        if self._sound is None or self._loops < 0:
+            end = None
+        else:
+            end = self._sound.length * (self._loops + 1)
+        if self._maxtime > 0:
+            maxtime = self._maxtime / 1000.0
+            end = maxtime if end is None else min(end, maxtime)
+        return end
+
+    def _advance(self):
+        """ Switch to queued sound if current one ended """
+        end = self._end()
+        if self._sound is None or end is None or self._elapsed() < end:
+            return
+        self._sound.channels.discard(self)
+        self._sound = None
+        if self._queue is not None:
+            queued, self._queue = self._queue, None
+            self._start(queued, 0, 0, self._started + end)
+
+    def _start(self, sound, loops, maxtime, started):
+        if self._sound is not None:
+            self._sound.channels.discard(self)
+        self._sound = sound
+        self._loops = loops
+        self._maxtime = maxtime
+        self._started = started
+        self._paused = None
+        sound.channels.add(self)
+
+    def play(self, sound, loops=0, maxtime=0, fade_ms=0):
+        with self._mixer.lock:
+            self._mixer.record(
+                self.index, "play", sound.path, loops, maxtime, sound.chunk
+            )
+            self._start(sound, loops, maxtime, default_timer())
+
+    def queue(self, sound):
+        with self._mixer.lock:
+            self._mixer.record(self.index, "queue", sound.path, sound.chunk)
+            self._advance()
+            if self._sound is None:
+                self._start(sound, 0, 0, default_timer())
+            else:
+                self._queue = sound
+
+    def stop(self):
+        with self._mixer.lock:
+            self._mixer.record(self.index, "stop")
+            if self._sound is not None:
+                self._sound.channels.discard(self)
+            self._sound = None
+            self._queue = None
+            self._started = None
+            self._paused = None
+
+    def pause(self):
+        with self._mixer.lock:
+            self._mixer.record(self.index, "pause")
+            if self._paused is None:
+                self._paused = default_timer()
+
+    def unpause(self):
+        with self._mixer.lock:
+            self._mixer.record(self.index, "unpause")
+            if self._paused is not None:
+                self._started += default_timer() - self._paused
+                self._paused = None
+
+    def set_volume(self, left, right=None):
+        with self._mixer.lock:
+            self._mixer.record(self.index, "set_volume", left, right)
+            if right is None:
+                right = left
+            self._volume = (left, right)
+
+    def get_volume(self):
+        with self._mixer.lock:
+            return self._volume[0]
+
+    def get_busy(self):
+        with self._mixer.lock:
+            self._advance()
+            return self._sound is not None
+
+    def get_sound(self):
+        with self._mixer.lock:
+            self._advance()
+            return self._sound
+
+    def get_queue(self):
+        with self._mixer.lock:
+            self._advance()
+            return self._queue
+
+    def state(self):
+        """
+        Get playback state (e.g. to recreate it on another mixer)
+
+        :return: Sound, queued sound, seconds played, loops, maxtime,
+            paused - None means not playing
+        :rtype: None | dict
+        """
+        with self._mixer.lock:
+            self._advance()
+            if self._sound is None:
+                return None
+            return {
+                'sound': self._sound,
+                'queue': self._queue,
+                'elapsed': self._elapsed(),
+                'loops': self._loops,
+                'maxtime': self._maxtime,
+                'paused': self._paused is not None
+            }
+
+
+class NullMixer(MixerBackend):
+    """
+    Mixer without audio output for headless benchmarking/testing
+
+    Records all channel calls with a timestamp (see calls) and counts them
+    """
+
+    def __init__(self, settings=None):
+        """
+        Initialize object
+
+        :param settings: Settings for backend (default: None)
+            history: Number of calls to remember (default: 10000)
+        :type settings: dict | None
+        :rtype: None
+        """
+        if settings is None:
+            settings = {}
+        super(NullMixer, self).__init__(settings)
+        self.calls = deque(maxlen=settings.get('history', 10000))
+        """ Recent calls (timestamp, channel index, method, arguments..)
+            :type calls: collections.deque[tuple] """
+        self._counts = {}
+        """ Number of calls per method
+            :type _counts: dict[unicode, int] """
+        self._channels = {}
+        """ :type _channels: dict[int, NullChannel] """
+        self._channels_number = 8
+        self.lock = threading.RLock()
+        """ Lock for calls and channel states (channels are used from
+            several threads)
+            :type lock: threading.RLock """
+
+    def record(self, index, method, *args):
+        """
+        Record a call
+
+        :param index: Index of channel
+        :type index: int
+        :param method: Called method
+        :type method: unicode
+        :param args: Arguments of call
+        :rtype: None
+        """
+        with self.lock:
+            self.calls.append((default_timer(), index, method) + args)
+            self._counts[method] = self._counts.get(method, 0) + 1
+
+    def init(self):
+        pass
+
+    def quit(self):
+        with self.lock:
+            for c in self._channels.values():
+                c.stop()
+
+    def channels_number_set(self, number):
+        with self.lock:
+            for i in list(self._channels.keys()):
+                if i >= number:
+                    self._channels.pop(i).stop()
+            self._channels_number = number
+
+    def channels_number_get(self):
+        return self._channels_number
+
+    def channel(self, index):
+        with self.lock:
+            if index not in self._channels:
+                self._channels[index] = NullChannel(self, index)
+            return self._channels[index]
+
+    def sound_load(self, path):
+        return NullSound(path)
+
+    def sound_size(self, sound):
+        return sound.size
+
+    def sound_busy(self, sound):
+        with self.lock:
+            return sound.get_num_channels() > 0
+
+    def stream_compatible(self, wav):
+        return True
+
+    @contextmanager
+    def batch(self):
+        # Channels can't advance while the lock is held
+        with self.lock:
+            yield True
+
+    def sound_chunk(self, wav, frame, frames):
+        frames = max(0, min(frames, wav.frames - frame))
+        return NullSound(
+            wav.path, frames * wav.frame_size, frames / wav.frequency,
+            (frame, frames)
+        )
+
+    def stats(self):
+        with self.lock:
+            return {'calls': dict(self._counts)}
+
+
+def mixer_create(mixer="pygame", settings=None):
+    """
+    Create mixer backend
+
+    :param mixer: Name of backend (pygame, software, null, remote) or
+        backend instance (default: pygame)
+    :type mixer: unicode | MixerBackend
+    :param settings: Settings for backend (default: None)
+    :type settings: dict | None
+    :return: Mixer backend
+    :rtype: MixerBackend
+    :raises ValueError: Unknown backend
+    """
+    if isinstance(mixer, MixerBackend):
+        return mixer
+    if mixer == "pygame":
+        return PygameMixer(settings)
+    if mixer == "null":
+        return NullMixer(settings)
+    if mixer == "software":
+        # Needs numpy -> only import when used
+        from .softmix import SoftwareMixer
+        return SoftwareMixer(settings)
+    if mixer == "remote":
+        from .remote import RemoteMixer
+        return RemoteMixer(settings)
+    raise ValueError(u"Unknown mixer '{}'".format(mixer))
@@ -0,0 +1,143 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 20:40
+""" Track order of channel playlists """
+
+import random
+
+
+MODES = ("sequential", "repeat_all", "shuffle")
+""" Supported playlist modes """
+
+
+class Playlist(object):
+    """
+    Hands out the files of a channel one after another
+
+    sequential - files in order, then end
+    repeat_all - files in order, forever
+    shuffle - random order (reshuffled every round), forever
+    """
+
+    def __init__(self, files, mode="sequential", rand=None):
+        """
+        Initialize object
+
+        :param files: File indices
+        :type files: list[int]
+        :param mode: Playlist mode (see MODES) (default: sequential)
+        :type mode: unicode
+        :param rand: Random generator (default: None)
+            None -> new random.Random
+        :type rand: None | random.Random
+        :rtype: None
+        :raises ValueError: Unknown mode
+        """
+        super(Playlist, self).__init__()
+        if mode not in MODES:
+            raise ValueError(u"Unknown playlist mode '{}'".format(mode))
+        if rand is None:
+            rand = random.Random()
+        self.files = list(files)
+        """ File indices
+            :type files: list[int] """
+        self.mode = mode
+        """ Playlist mode
+            :type mode: unicode """
+        self._random = rand
+        self._order = []
+        """ Order of current round
+            :type _order: list[int] """
+        self._pos = 0
+        """ Position of next file in order
+            :type _pos: int """
+        self._last = None
+        """ Last file handed out
+            :type _last: None | int """
+        self.queued = None
+        """ Sound queued in channel, but not yet playing
+            (sound, file index, stream)
+            :type queued: None | (object, int, None | object) """
+
+    def _order_create(self):
+        """
+        Create order of next round
+
+        :rtype: list[int]
+        """
+        order = list(self.files)
+        if self.mode == "shuffle":
+            self._random.shuffle(order)
+            if len(order) > 1 and order[0] == self._last:
+                # Don't play the same file twice in a row
+                order[0], order[-1] = order[-1], order[0]
+        return order
+
+    def next(self):
+        """
+        Get next file
+
+        :return: File index (None at end)
+        :rtype: None | int
+        """
+        if self._pos >= len(self._order):
+            if self._order and self.mode == "sequential":
+                return None
+            self._order = self._order_create()
+            self._pos = 0
+            if not self._order:
+                return None
+        self._last = self._order[self._pos]
+        self._pos += 1
+        return self._last
+
+    def _continue(self):
+        """
+        Restart order after the last file handed out
+
+        :rtype: None
+        """
+        if self.mode == "shuffle":
+            self._order = self._order_create()
+            self._pos = 0
+            return
+        self._order = list(self.files)
+        self._pos = 0
+        if self._last in self._order:
+            self._pos = self._order.index(self._last) + 1
+
+    def files_set(self, files):
+        """
+        Change files (continues after the current one if still present)
+
+        :param files: File indices
+        :type files: list[int]
+        :rtype: None
+        """
+        self.files = list(files)
+        self._continue()
+
+    def mode_set(self, mode):
+        """
+        Change mode
+
+        :param mode: Playlist mode (see MODES)
+        :type mode: unicode
+        :rtype: None
+        :raises ValueError: Unknown mode
+        """
+        if mode not in MODES:
+            raise ValueError(u"Unknown playlist mode '{}'".format(mode))
+        if mode != self.mode:
+            self.mode = mode
+            self._continue()
@@ -8,23 +8,43 @@ __author__ = "d01"
 __email__ = "jungflor@gmail.com"
 __copyright__ = "Copyright (C) 2015-16, Florian JUNG"
 __license__ = "MIT"
-__version__ = "0.2.1"
-__date__ = "2016-04-02"
+__version__ = "0.3.0"
+__date__ = "2026-10-18"
 # Created: 2015-07-21 18:25
 
+import logging
+import math
+import os
 import threading
+import time
+from collections import deque
+from functools import partial
+from multiprocessing.pool import ThreadPool
 from pprint import pformat
+from timeit import default_timer
 
 from enum import IntEnum, unique
 
-try:
-    import pygame
-except ImportError:
-    pygame = None
-
 from paps.crowd import PluginException
 from paps_settings import SettablePlugin
 
+from .analysis import ARRAYS as ANALYSIS_ARRAYS, AnalysisCache
+from .cache import SoundCache
+from .crowd import CrowdState, NumpyCrowdState
+from .gain import VolumeCurve, track_gains
+from .journal import Journal, file_replace, settings_merge
+from .metrics import Metrics, TimedLock
+from .mixer import mixer_create
+from .playlist import MODES as PLAYLIST_MODES, Playlist
+from .smoother import GainSmoother
+from .stream import Stream
+from .tempo import BeatGrid, tempo_detect, tempo_parse
+from .timeline import (
+    RUNTIME as TIMELINE_RUNTIME, CueScheduler, cues_parse
+)
+from .trace import TraceWriter
+from .wavfile import WaveFiles
+
 
 @unique
 class PlayState(IntEnum):
@@ -49,8 +69,11 @@ class SoundMixPlugin(SettablePlugin):
         if settings is None:
             settings = {}
         super(SoundMixPlugin, self).__init__(settings)
-        if pygame is None:
-            raise PluginException("Package pygame not installed")
+        self._mixer = mixer_create(
+            settings.get('mixer', "pygame"), settings.get('mixer_settings')
+        )
+        """ Audio output
+            :type _mixer: paps_soundmix.mixer.MixerBackend """
 
         self._files = {
             i: file_name
@@ -59,34 +82,123 @@ class SoundMixPlugin(SettablePlugin):
         """ File id/name map
             :type : dict[int, unicode] """
         self._channels = {}
-        """ Active channels
+        """ Active channels (copy on write - replaced under channels_lock,
+            never modified -> read without locking)
             :type _channels: dict[int, dict[unicode, object] """
         self._channels_number_default = settings.get("channels_number", 8)
         """ Number of channels per default
         (change number at runtime via _channels_number_set - method)
             :type _channels_number: int """
-        self._channels_lock = threading.RLock()
+        self._metrics = Metrics(settings.get('metrics', False))
+        """ Timing histograms (event latency, lock wait/hold, update pass)
+            :type _metrics: paps_soundmix.metrics.Metrics """
+        self._metrics_events = deque()
+        """ Receive times of changes applied, but not yet written to a channel
+            :type _metrics_events: collections.deque[float] """
+        self._channels_lock = self._lock_create("channels")
+        self._channels_dirty = set()
+        """ Channels whose volume has to be reapplied (played, changed, ..)
+            :type _channels_dirty: set[int] """
+        self._volume_applied = {}
+        """ Last volume set per channel by the volume updater
+            :type _volume_applied: dict[int, float | (float, float)] """
+        self._volume_stats = {
+            'passes': 0,
+            'computed': 0,
+            'clean': 0,
+            'applied': 0,
+            'skipped': 0
+        }
+        """ Volume updater counters (update passes, groups recomputed,
+            groups left untouched, mixer calls, unchanged volumes skipped)
+            :type _volume_stats: dict[unicode, int] """
+        self._map_files = settings.get('map_files', True)
+        """ Play wav files from memory maps instead of decoding them
+            (if the mixer supports their format)
+            :type _map_files: bool """
+        self._wave_files = WaveFiles()
+        """ Mapped wav files (shared by cache and streams)
+            :type _wave_files: paps_soundmix.wavfile.WaveFiles """
+        self._sound_cache = SoundCache(
+            self._sound_load,
+            self._mixer.sound_size,
+            self._mixer.sound_busy,
+            settings.get('sound_cache_size', 256 * 1024 * 1024)
+        )
+        """ Decoded sounds shared by all channels
+            :type _sound_cache: paps_soundmix.cache.SoundCache """
 
         self._groups = {
             0: {
                 'name': "Not yet placed people",
-                'people': set(),
+                'people': frozenset(),
                 'active_definition': None,
                 'action': None,
                 'channel': None
             }
         }
-        """ Groups
+        """ Groups (copy on write - replaced under groups_lock and
+            people_lock, never modified -> read without locking)
             :type _groups: dict[int, dict] """
-        self._groups_lock = threading.RLock()
-
-        self._people_active = set()
-        """ Set of active person ids
-            :type _people_active: set[unicode] """
-        self._people = set()
-        """ Set of all person ids
-            :type _people: set[unicode] """
-        self._people_lock = threading.RLock()
+        self._groups_dirty = set()
+        """ Groups whose settings changed since the last volume update
+            (guarded by people_lock)
+            :type _groups_dirty: set[int] """
+        self._groups_lock = self._lock_create("groups")
+        """ Lock serializing group writers
+            :type _groups_lock: threading.RLock """
+
+        self._state_version = 0
+        """ Incremented on every change of channels/groups (see get_data)
+            :type _state_version: int """
+        self._state_lock = threading.Lock()
+        """ Lock for versions and snapshots (only taken by get_data)
+            :type _state_lock: threading.Lock """
+        self._state_snapshot = None
+        """ Last full channels/groups info (version, channels, groups)
+            :type _state_snapshot: None | (int, dict, list[dict]) """
+        self._groups_snapshot = {}
+        """ Version of last change, group and info per group
+            :type _groups_snapshot: dict[int, (int, dict, dict)] """
+        self._channels_snapshot = {}
+        """ Version of last change and info per channel
+            :type _channels_snapshot: dict[int, (int, dict)] """
+        self._channels_removed = {}
+        """ Version channels were removed in
+            :type _channels_removed: dict[int, int] """
+        self._channels_count = (0, None)
+        """ Version of last change and number of mixer channels
+            :type _channels_count: (int, None | int) """
+
+        crowd_engine = settings.get('crowd_engine', "python")
+        if crowd_engine == "python":
+            self._crowd = CrowdState()
+        elif crowd_engine == "numpy":
+            self._crowd = NumpyCrowdState()
+        else:
+            raise ValueError("Crowd engine needs to be python/numpy")
+        """ Registered/active people and per group counters
+            :type _crowd: paps_soundmix.crowd.CrowdState
+                | paps_soundmix.crowd.NumpyCrowdState """
+        self._people_lock = self._lock_create("people")
+        self._people_queue = deque()
+        """ Person state changes not yet applied (filled without locking)
+            (id, active, receive time - None if metrics disabled)
+            :type _people_queue: collections.deque[(unicode, bool, float)] """
+        self._people_ingest_lock = threading.Lock()
+        """ Lock to keep the order of changes while emptying the queue
+            :type _people_ingest_lock: threading.Lock """
+        self._people_batch_size = settings.get('people_batch_size', 500)
+        """ Maximum number of people applied while holding people_lock
+            :type _people_batch_size: int """
+        self._ingest_stats = {
+            'events': 0,
+            'applied': 0,
+            'batches': 0
+        }
+        """ Queue counters (changes received, changes applied after
+            coalescing, batches)
+            :type _ingest_stats: dict[unicode, int] """
         self._active_definition = settings.get('active_definition', "standing")
         if self._active_definition not in ['standing', 'sitting']:
             raise ValueError("Active definition needs to be standing/sitting")
@@ -97,9 +209,530 @@ class SoundMixPlugin(SettablePlugin):
         self._updater_timeout = settings.get('updater_timeout', 1.0)
         """ Timeout for updater (merge updates) - 0.0 means no timeout
             :type _updater_timeout: float """
+        attack = settings.get('volume_attack', 0.0)
+        release = settings.get('volume_release')
+        if release is None:
+            release = attack
+        self._volume_smoother = None
+        """ Ramps volumes towards the computed ones (guarded by
+            channels_lock) - None means volumes are set directly
+            :type _volume_smoother: None
+                | paps_soundmix.smoother.GainSmoother """
+        if attack > 0.0 or release > 0.0:
+            self._volume_smoother = GainSmoother(
+                attack, release, settings.get('volume_threshold', 0.005)
+            )
+        self._volume_rate = settings.get('volume_rate', 50.0)
+        """ Steps per second of volume ramps
+            :type _volume_rate: float """
+        self._volume_should_smooth = threading.Event()
+        """ Event signaling new volume targets
+            :type _volume_should_smooth: threading.Event """
         self._data_file = settings.get('data_file')
         """ Location to save current settings to
             :type : None | unicode """
+        self._journal = None
+        """ Changes since the data file was written (<data_file>.journal)
+            :type _journal: None | paps_soundmix.journal.Journal """
+        if self._data_file and settings.get('journal', True):
+            self._journal = Journal(
+                self._data_file + ".journal",
+                settings.get('journal_fsync', True)
+            )
+        self._journal_interval = settings.get('journal_interval', 1.0)
+        """ Seconds between checks for changes to journal
+            :type _journal_interval: float """
+        self._journal_compact_entries = settings.get(
+            'journal_compact_entries', 1000
+        )
+        """ Rewrite data file after this many journal entries
+            :type _journal_compact_entries: int """
+        self._journal_compact_interval = settings.get(
+            'journal_compact_interval', 300.0
+        )
+        """ Rewrite data file after this many seconds (if journal not empty)
+            :type _journal_compact_interval: float """
+        self._journal_version = None
+        """ State version written to data file/journal
+            :type _journal_version: None | int """
+        self._journal_channels = {}
+        """ Channel info written to data file/journal (without volume)
+            :type _journal_channels: dict[unicode, dict] """
+        self._journal_lock = threading.RLock()
+        self._journal_should_write = threading.Event()
+        """ Event signaling the journal writer to stop waiting
+            :type _journal_should_write: threading.Event """
+        self._journal_thread = None
+        """ :type _journal_thread: None | threading.Thread """
+        self._preload = settings.get('preload')
+        """ Files to decode on start (all, list of file indices or none)
+            :type _preload: None | unicode | list[int] """
+        self._preload_workers = settings.get('preload_workers', 4)
+        """ Number of threads decoding files on start
+            :type _preload_workers: int """
+        self._preload_state = {
+            'ready': False,
+            'files': {},
+            'failed': [],
+            'evicted': [],
+            'total': None
+        }
+        """ Progress of preloading (load time per file index, failed and
+            evicted (not resident) file indices, total time)
+            :type _preload_state: dict[unicode, bool | dict | list | float] """
+        self._preload_lock = threading.RLock()
+        self._analysis_cache = None
+        """ Analysis of files stored by content hash (None -> off)
+            :type _analysis_cache: None | paps_soundmix.analysis.AnalysisCache
+        """
+        if settings.get('analysis_cache'):
+            self._analysis_cache = AnalysisCache({
+                'path': settings['analysis_cache'],
+                'workers': settings.get('analysis_workers')
+            })
+        self._analysis = {}
+        """ Analysis per file index (loudness, envelopes, waveform,..)
+            :type _analysis: dict[int, dict] """
+        self._analysis_state = {
+            'ready': False,
+            'failed': [],
+            'total': None
+        }
+        """ Progress of analysis (failed file indices, total time)
+            :type _analysis_state: dict[unicode, bool | list | float] """
+        self._volume_curve = VolumeCurve(
+            settings.get('volume_curve', "linear"),
+            settings.get('volume_curve_range', 60.0)
+        )
+        """ Maps crowd percentages to volumes (replaced, not modified)
+            :type _volume_curve: paps_soundmix.gain.VolumeCurve """
+        self._loudness = {
+            'normalise': settings.get('loudness_normalise', False),
+            'target': settings.get('loudness_target')
+        }
+        """ Loudness normalisation (on, target in LUFS - None means
+            quietest file)
+            :type _loudness: dict """
+        self._track_gains = {}
+        """ Normalising gain per file index (replaced, not modified)
+            :type _track_gains: dict[int, float] """
+        if self._loudness['normalise'] and self._analysis_cache is None:
+            self.warning("Loudness normalisation needs analysis_cache")
+        self._stream_files = set(settings.get('stream_files', []))
+        """ Indices of files always played in chunks (not fully decoded)
+            :type _stream_files: set[int] """
+        self._stream_threshold = settings.get('stream_threshold')
+        """ Files of at least this size (bytes) are streamed
+            (None -> only stream_files)
+            :type _stream_threshold: None | int """
+        self._stream_chunk = settings.get('stream_chunk', 1.0)
+        """ Length of streamed chunks in seconds
+            :type _stream_chunk: float """
+        self._streams = {}
+        """ Streams per channel index (guarded by channels_lock)
+            :type _streams: dict[int, paps_soundmix.stream.Stream] """
+        self._stream_stats = {
+            'started': 0,
+            'chunks': 0,
+            'underruns': 0,
+            'fallbacks': 0
+        }
+        """ Streaming counters (streams started, chunks queued, chunks
+            played after channel ran empty, streams decoded instead)
+            :type _stream_stats: dict[unicode, int] """
+        self._streams_should_service = threading.Event()
+        """ Event signaling the stream service to check the channels
+            :type _streams_should_service: threading.Event """
+        self._playlists = {}
+        """ Playlists per channel index (guarded by channels_lock)
+            :type _playlists: dict[int, paps_soundmix.playlist.Playlist] """
+        self._playlist_stats = {
+            'tracks': 0,
+            'underruns': 0
+        }
+        """ Playlist counters (tracks started, tracks played after channel
+            ran empty)
+            :type _playlist_stats: dict[unicode, int] """
+        self._sync_last = None
+        """ Result of last synchronised start
+            :type _sync_last: None | dict """
+        self._threaded = settings.get('threaded', True)
+        """ Run updater/services in threads (otherwise driven by tick())
+            :type _threaded: bool """
+        self._tick_time = 0.0
+        """ Time advanced by tick() (clock of timeline without threads)
+            :type _tick_time: float """
+        self._timeline = CueScheduler({
+            'clock': default_timer if self._threaded else self._tick_clock
+        })
+        """ Runs the cues of the timeline
+            :type _timeline: paps_soundmix.timeline.CueScheduler """
+        self._timeline_settings = settings.get('timeline')
+        """ Timeline to set on start
+            :type _timeline_settings: None | dict """
+        self._timeline_cues = []
+        """ Cues of timeline (as set)
+            :type _timeline_cues: list[dict] """
+        self._timeline_bpm = None
+        """ Tempo for beat relative cues
+            :type _timeline_bpm: None | float """
+        self._timeline_start = None
+        """ Clock time of timeline position 0 (None -> stopped)
+            :type _timeline_start: None | float """
+        self._tempo = {}
+        """ Tempo metadata per file index (set or detected - {} means
+            unknown)
+            :type _tempo: dict[int, dict] """
+        self._tempo_set(settings.get('tempo', {}))
+        self._tempo_detect = settings.get('tempo_detect', True)
+        """ Detect tempo of files without metadata
+            :type _tempo_detect: bool """
+        self._tempo_pending = set()
+        """ Indices of files whose tempo is being detected
+            :type _tempo_pending: set[int] """
+        self._tempo_lock = threading.Lock()
+        self._quantise = {
+            'master': None,
+            'grid': "beat",
+            'volume': True,
+            'tolerance': 0.02
+        }
+        """ Quantiser settings (master channel (None -> off), grid
+            (beat/bar), quantise volumes, late seconds counting as on grid)
+            :type _quantise: dict """
+        self._beat_grid = None
+        """ Grid of master channel (replaced, not modified -> read without
+            locking) - None means changes are not quantised
+            :type _beat_grid: None | paps_soundmix.tempo.BeatGrid """
+        self._beat_grid_paused = None
+        """ Time master channel was paused
+            :type _beat_grid_paused: None | float """
+        self._beat_grid_track = None
+        """ File playing on master channel and its start time (shifted by
+            pauses) - grid is created once the tempo is known
+            :type _beat_grid_track: None | (int, float) """
+        self._quantise_pending = {}
+        """ Volumes waiting for next grid point (guarded by channels_lock)
+            :type _quantise_pending: dict[int, float | (float, float)] """
+        self._quantise_flush = None
+        """ Time pending volumes are applied
+            :type _quantise_flush: None | float """
+        self._quantise_stats = {
+            'starts': 0,
+            'stops': 0,
+            'volumes': 0
+        }
+        """ Changes moved to the grid
+            :type _quantise_stats: dict[unicode, int] """
+        if settings.get('quantise'):
+            self._quantise_set(settings['quantise'])
+        self._trace = None
+        """ Recording of people/config calls
+            :type _trace: None | paps_soundmix.trace.TraceWriter """
+        if settings.get('trace_file'):
+            self._trace = TraceWriter(settings['trace_file'])
+            trace_settings = dict(settings)
+            # Replay might run from somewhere else
+            trace_settings['files'] = [
+                os.path.abspath(self._files[i]) for i in sorted(self._files)
+            ]
+            self._trace.record("init", {
+                'plugin': self.__class__.__name__,
+                'settings': trace_settings
+            })
+
+    def _state_bump(self):
+        """
+        Increment state version
+
+        Note: Assumes :attr:`_state_lock` already aquired!
+
+        :return: New version
+        :rtype: int
+        """
+        self._state_version += 1
+        return self._state_version
+
+    def _groups_replace(self, groups):
+        """
+        Swap in new version of groups
+
+        Note: Assumes :attr:`_groups_lock` and :attr:`_people_lock`
+        already aquired!
+
+        :param groups: Changed groups (new objects) per group id
+        :type groups: dict[int, dict]
+        :rtype: None
+        """
+        gs = dict(self._groups)
+        gs.update(groups)
+        self._groups = gs
+        self._groups_dirty.update(groups)
+
+    def _channels_replace(self, channel_index, **kwargs):
+        """
+        Swap in new version of channel with changed values
+
+        Note: Assumes :attr:`_channels_lock` already aquired!
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :param kwargs: Changed values
+        :rtype: None
+        :raises ValueError: Invalid channel index
+        """
+        c = dict(self._channels_get(channel_index))
+        c.update(kwargs)
+        cs = dict(self._channels)
+        cs[channel_index] = c
+        self._channels = cs
+
+    def _lock_create(self, name):
+        """
+        Create lock (timed if metrics are enabled)
+
+        :param name: Name of lock
+        :type name: unicode
+        :rtype: threading.RLock | paps_soundmix.metrics.TimedLock
+        """
+        lock = threading.RLock()
+        if self._metrics.enabled:
+            lock = TimedLock(lock, self._metrics, name)
+        return lock
+
+    def _preload_indices(self):
+        """
+        Get file indices selected for preloading
+
+        :return: File indices
+        :rtype: list[int]
+        :raises ValueError: Invalid preload setting
+        """
+        preload = self._preload
+        if preload is None or preload == "none":
+            return []
+        if preload == "all":
+            return sorted(self._files.keys())
+        if not isinstance(preload, list):
+            raise ValueError(u"Invalid preload setting '{}'".format(preload))
+        for fi in preload:
+            if fi not in self._files:
+                raise ValueError(u"File index {} not found".format(fi))
+        return list(preload)
+
+    def _file_preload(self, file_index):
+        """
+        Decode file into sound cache
+
+        :param file_index: Index of file
+        :type file_index: int
+        :return: Index and time it took to load in seconds (None on failure)
+        :rtype: (int, None | float)
+        """
+        if not self._is_running:
+            return file_index, None
+        start = default_timer()
+        try:
+            self._sound_cache.get(self._files[file_index])
+        except:
+            self.exception(u"Failed to preload '{}'".format(
+                self._files[file_index]
+            ))
+            return file_index, None
+        return file_index, default_timer() - start
+
+    def _files_preload(self):
+        """
+        Threaded function decoding the preload files on a thread pool
+
+        :rtype: None
+        """
+        try:
+            indices = self._preload_indices()
+        except ValueError:
+            self.exception("Failed to preload")
+            indices = []
+        start = default_timer()
+        evictions = self._sound_cache.stats()['evictions']
+        if indices:
+            pool = ThreadPool(max(1, min(self._preload_workers, len(indices))))
+            try:
+                for file_index, duration in pool.imap_unordered(
+                        self._file_preload, indices
+                ):
+                    with self._preload_lock:
+                        if duration is None:
+                            self._preload_state['failed'].append(file_index)
+                        else:
+                            self._preload_state['files'][file_index] = duration
+            finally:
+                pool.close()
+                pool.join()
+        with self._preload_lock:
+            state = self._preload_state
+            state['total'] = default_timer() - start
+            # Loaded, but pushed out by later ones
+            state['evicted'] = [
+                file_index for file_index in sorted(state['files'])
+                if not self._sound_cache.contains(self._files[file_index])
+            ]
+            state['ready'] = not state['failed'] and not state['evicted']
+        if self._sound_cache.stats()['evictions'] != evictions:
+            self.warning("Sound cache too small to hold all preloaded files")
+        self.info(u"Preloaded {} files in {:.3f}s".format(
+            len(state['files']), state['total']
+        ))
+
+    def _files_analyse(self):
+        """
+        Threaded function analysing the files (cached by content hash)
+
+        Detected tempos are used for files without tempo metadata
+
+        :rtype: None
+        """
+        start = default_timer()
+        files = dict(self._files)
+        try:
+            results = self._analysis_cache.analyse(
+                sorted(set(files.values()))
+            )
+        except:
+            self.exception("Failed to analyse files")
+            results = {}
+        failed = []
+        for file_index, path in files.items():
+            result = results.get(path)
+            if result is None:
+                failed.append(file_index)
+                continue
+            self._analysis[file_index] = result
+            if self._tempo_detect:
+                # Only if neither set nor detected already
+                self._tempo.setdefault(file_index, result['tempo'] or {})
+        state = {
+            'ready': not failed,
+            'failed': failed,
+            'total': default_timer() - start
+        }
+        self._analysis_state = state
+        self._loudness_apply()
+        self.info(u"Analysed {} files in {:.3f}s".format(
+            len(files) - len(failed), state['total']
+        ))
+
+    def analysis_get(self, file_index):
+        """
+        Get analysis of file (e.g. to draw waveforms)
+
+        :param file_index: Index of file
+        :type file_index: int
+        :return: Duration, loudness (LUFS), peak, rms, tempo, envelopes
+            (rms/peak per window seconds), waveform (min/max)
+            - None means not analysed (yet)
+        :rtype: None | dict
+        """
+        result = self._analysis.get(file_index)
+        if result is None:
+            return None
+        res = dict(result)
+        for key in ANALYSIS_ARRAYS:
+            res[key] = [float(x) for x in result[key]]
+        return res
+
+    def _analysis_get(self):
+        """
+        Create analysis info for frontend (without arrays)
+
+        :return: Progress, cache statistics and summary per file index
+        :rtype: dict
+        """
+        res = dict(self._analysis_state)
+        res['cache'] = None
+        if self._analysis_cache is not None:
+            res['cache'] = self._analysis_cache.stats()
+        res['files'] = {
+            file_index: {
+                'duration': result['duration'],
+                'loudness': result['loudness'],
+                'peak': result['peak'],
+                'rms': result['rms'],
+                'bpm': result['tempo']['bpm'] if result['tempo'] else None
+            }
+            for file_index, result in list(self._analysis.items())
+        }
+        return res
+
+    def _loudness_apply(self):
+        """
+        Recalculate gains of tracks and update the playing channels
+
+        Volumes set by hand keep the old gain until they are set again
+
+        :rtype: None
+        """
+        gains = {}
+        if self._loudness['normalise']:
+            gains = track_gains({
+                file_index: result['loudness']
+                for file_index, result in list(self._analysis.items())
+            }, self._loudness['target'])
+        self._track_gains = gains
+        with self._channels_lock:
+            for channel_index, c in list(self._channels.items()):
+                gain = gains.get(c['track'], 1.0)
+                if c['gain'] != gain:
+                    self._channels_replace(channel_index, gain=gain)
+                    self._channels_invalidate(channel_index)
+
+    def _loudness_set(self, l_sett):
+        """
+        Apply loudness normalisation settings
+
+        :param l_sett: Settings (normalise, target)
+        :type l_sett: dict
+        :rtype: None
+        """
+        loudness = dict(self._loudness)
+        for key in ["normalise", "target"]:
+            if key in l_sett:
+                loudness[key] = l_sett[key]
+        self._loudness = loudness
+        self._loudness_apply()
+
+    def _volume_curve_set(self, curve):
+        """
+        Set curve mapping crowd percentages to volumes
+
+        :param curve: Name of curve or settings (curve, range)
+        :type curve: unicode | dict
+        :rtype: None
+        :raises ValueError: Unknown curve
+        """
+        if not isinstance(curve, dict):
+            curve = {'curve': curve}
+        self._volume_curve = VolumeCurve(
+            curve.get('curve', self._volume_curve.curve),
+            curve.get('range', self._volume_curve.range_db)
+        )
+        # Same percentages are different volumes now
+        for channel_index in list(self._channels.keys()):
+            self._channels_invalidate(channel_index)
+
+    def _loudness_get(self):
+        """
+        Create loudness info for frontend
+
+        :return: Normalisation settings, volume curve, gain per file index
+        :rtype: dict
+        """
+        res = dict(self._loudness)
+        res.update({
+            'curve': self._volume_curve.curve,
+            'range': self._volume_curve.range_db,
+            'gains': dict(self._track_gains)
+        })
+        return res
 
     def _channels_number_set(self, number):
         """
@@ -114,14 +747,17 @@ class SoundMixPlugin(SettablePlugin):
         if number <= 0:
             raise ValueError('A minimum of 1 channel is required')
         with self._channels_lock:
-            cs = self._channels
+            cs = dict(self._channels)
             old_num = len(cs)
             if old_num == number:
                 # done
                 return
+            added = []
             if number < old_num:
                 # reducing channels
                 for i in range(number, old_num):
+                    self._streams_remove(i)
+                    self._playlists.pop(i, None)
                     c = cs[i]['channel']
                     c.stop()
                     del c
@@ -132,17 +768,41 @@ class SoundMixPlugin(SettablePlugin):
                     if i in cs:
                         continue
                     cs[i] = {
-                        'channel': pygame.mixer.Channel(i),
+                        'channel': self._mixer.channel(i),
                         'files': [],
-                        'paused': False
+                        'paused': False,
+                        # Playlist mode (None -> only play first file)
+                        'playlist': None,
+                        # File currently playing
+                        'track': None,
+                        # Loudness normalising gain of track
+                        'gain': 1.0
                     }
-            pygame.mixer.set_num_channels(number)
+                    added.append(i)
+            self._channels = cs
+            for i in added:
+                self._channels_invalidate(i)
+            self._mixer.channels_number_set(number)
+
+    def _channels_invalidate(self, channel_index):
+        """
+        Force volume updater to reapply the volume of channel
+        (e.g. volume was changed by someone else)
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :rtype: None
+        """
+        with self._channels_lock:
+            self._volume_applied.pop(channel_index, None)
+            self._channels_dirty.add(channel_index)
+        self._volume_should_update.set()
 
     def _channels_get(self, channel_index):
         """
         Get a channel
 
-        Note: Assumes :attr:`channel_lock` already aquired!
+        Note: The channel must not be modified (see _channels_replace)
 
         :param channel_index: Index of channel
         :type channel_index: int`
@@ -181,11 +841,10 @@ class SoundMixPlugin(SettablePlugin):
                 raise ValueError(u"File index {} not found".format(fi))
 
         with self._channels_lock:
-            if channel_index not in self._channels:
-                raise ValueError(
-                    u"Channel index {} not found".format(channel_index)
-                )
-            self._channels[channel_index]['files'] = file_index
+            self._channels_replace(channel_index, files=file_index)
+            playlist = self._playlists.get(channel_index)
+            if playlist is not None:
+                playlist.files_set(file_index)
 
     def _channels_state_get(self, channel):
         """
@@ -209,189 +868,642 @@ class SoundMixPlugin(SettablePlugin):
         # self.debug("()")
         if isinstance(channel, dict):
             return get_state(channel)
-        with self._channels_lock:
-            if channel not in self._channels:
-                raise ValueError(
-                    u"Channel index {} not found".format(channel)
-                )
-            return get_state(self._channels[channel])
+        return get_state(self._channels_get(channel))
 
-    def _channels_play(self, channel_index, file_index=None, options=None):
+    def _file_should_stream(self, file_index):
         """
-        Play a file (and add it to channel files, if not present)
+        Play file in chunks instead of decoding it completely
 
-        :param channel_index: Index of channel
-        :type channel_index: int
-        :param file_index: Index of file (default: None)
-            None -> select next from files
-        :type file_index: None | int
-        :param options: Additional options for playback (default: None)
-        :type options: None | dict
-        :rtype: None
-        :raises ValueError: Invalid file index
-        :raises ValueError: Invalid channel index
-        :raises PlayerException: No files in channel to play
+        :param file_index: Index of file
+        :type file_index: int
+        :rtype: bool
         """
-        self.debug(
-            u"(channel_index={}, file_index={}, options={})".format(
-                channel_index, file_index, options
-            )
-        )
-        if options is None:
-            options = {}
-        if file_index is not None:
-            self._channels_files_replace(channel_index, file_index)
-
-        with self._channels_lock:
-            if channel_index not in self._channels:
-                raise ValueError(
-                    u"Channel index {} not found".format(channel_index)
-                )
-            c = self._channels[channel_index]
-            # TODO: Maybe unpause?
+        if file_index in self._stream_files:
+            return True
+        if self._stream_threshold is None:
+            return False
+        try:
+            size = os.path.getsize(self._files[file_index])
+        except OSError:
+            return False
+        return size >= self._stream_threshold
 
-            if not c['files']:
-                raise PlayerException("Nothing to play")
-            file_index = c['files'][0]
+    def _sound_load(self, path):
+        """
+        Load sound for cache (mapped if possible, otherwise decoded)
 
+        :param path: Path to sound file
+        :type path: unicode
+        :return: Sound
+        :rtype: object
+        :raises Exception: Failed to load
+        """
+        if self._map_files:
             try:
-                sound = pygame.mixer.Sound(self._files[file_index])
-            except:
-                raise ValueError(
-                    u"Loading sound from  '{}' failed".format(
-                        self._files[file_index]
-                    )
-                )
-            try:
-                # On failure probably not paused either
-                c['paused'] = False
-                c['channel'].play(
-                    sound,
-                    options.get('loops', 0),
-                    options.get('maxtime', 0),
-                    options.get('fade_ms', 0)
+                wav = self._wave_files.get(path)
+            except (IOError, ValueError):
+                # Not a PCM wav file
+                wav = None
+            if wav is not None and self._mixer.stream_compatible(wav):
+                return self._mixer.sound_chunk(wav, 0, wav.frames)
+        return self._mixer.sound_load(path)
+
+    def _stream_open(self, file_index, options):
+        """
+        Open file for streaming
+
+        :param file_index: Index of file
+        :type file_index: int
+        :param options: Options for playback (loops, maxtime)
+        :type options: dict
+        :return: Stream (None -> file has to be decoded)
+        :rtype: None | paps_soundmix.stream.Stream
+        """
+        path = self._files[file_index]
+        try:
+            wav = self._wave_files.get(path)
+        except (IOError, ValueError):
+            self.info(u"Can not stream '{}' - decoding".format(path))
+            self._stream_stats['fallbacks'] += 1
+            return None
+        if not self._mixer.stream_compatible(wav):
+            self.info(
+                u"Format of '{}' not supported by mixer - decoding".format(
+                    path
                 )
-            except:
-                raise PlayerException("Playing failed")
-            self.debug(self._channels_state_get(channel_index))
+            )
+            self._stream_stats['fallbacks'] += 1
+            return None
+        return Stream(
+            wav,
+            self._mixer.sound_chunk,
+            int(self._stream_chunk * wav.frequency),
+            options.get('loops', 0),
+            options.get('maxtime', 0)
+        )
 
-    def _channels_stop(self, channel_index):
+    def _streams_remove(self, channel_index):
         """
-        Stop channel
+        Stop streaming to channel
+
+        Note: Assumes :attr:`_channels_lock` already aquired!
 
         :param channel_index: Index of channel
         :type channel_index: int
         :rtype: None
-        :raises ValueError: Invalid channel index
-        :raises PlayerException: Error stopping
         """
-        self.debug(u"(channel_index={})".format(channel_index))
-        with self._channels_lock:
-            if channel_index not in self._channels:
-                raise ValueError(
-                    u"Channel index {} not found".format(channel_index)
-                )
-            c = self._channels[channel_index]
-            try:
-                # on failure propably not paused either
-                c['paused'] = False
-                c['channel'].stop()
-            except:
-                raise PlayerException("Stopping failed")
+        stream = self._streams.pop(channel_index, None)
+        if stream is not None:
+            stream.close()
 
-    def _channels_pause(self, channel_index):
+    def _stream_service(self, channel_index, stream):
         """
-        Pause channel
+        Queue next chunk if channel has room
 
         :param channel_index: Index of channel
         :type channel_index: int
+        :param stream: Stream of channel
+        :type stream: paps_soundmix.stream.Stream
         :rtype: None
-        :raises ValueError: Invalid channel index
-        :raises PlayerException: Error pausing
         """
-        self.debug(u"(channel_index={})".format(channel_index))
         with self._channels_lock:
-            if channel_index not in self._channels:
-                raise ValueError(
-                    u"Channel index {} not found".format(channel_index)
-                )
-            c = self._channels[channel_index]
-            try:
-                c['channel'].pause()
-            except:
-                raise PlayerException("Pausing failed")
+            if self._streams.get(channel_index) is not stream:
+                return
+            c = self._channels_get(channel_index)
+            if c['paused']:
+                return
+            busy = c['channel'].get_busy()
+            if busy and c['channel'].get_queue() is not None:
+                # Queue full
+                return
+            if stream.ended:
+                if not busy:
+                    # Last chunk played
+                    self._streams_remove(channel_index)
+                return
+        # Read outside of lock
+        sound = stream.next()
+        with self._channels_lock:
+            if self._streams.get(channel_index) is not stream:
+                return
+            c = self._channels_get(channel_index)
+            if c['channel'].get_busy():
+                c['channel'].queue(sound)
             else:
-                c['paused'] = True
+                self._stream_stats['underruns'] += 1
+                c['channel'].play(sound)
+                self._channels_invalidate(channel_index)
+            self._stream_stats['chunks'] += 1
 
-    def _channels_unpause(self, channel_index):
+    def _playlist_started(self, channel_index, file_index, stream):
         """
-        Unpause channel
+        Track of playlist started playing
+
+        Note: Assumes :attr:`_channels_lock` already aquired!
 
         :param channel_index: Index of channel
         :type channel_index: int
+        :param file_index: Index of file
+        :type file_index: int
+        :param stream: Stream of track (None -> not streamed)
+        :type stream: None | paps_soundmix.stream.Stream
         :rtype: None
-        :raises ValueError: Invalid channel index
-        :raises PlayerException: Error unpausing
         """
-        self.debug(u"(channel_index={})".format(channel_index))
-        with self._channels_lock:
-            if channel_index not in self._channels:
-                raise ValueError(
-                    u"Channel index {} not found".format(channel_index)
-                )
-            c = self._channels[channel_index]
-            try:
-                # on failure propably not paused either
-                c['paused'] = False
-                c['channel'].unpause()
-            except:
-                raise PlayerException("Unpausing failed")
+        # Previous stream handed out all chunks
+        self._streams_remove(channel_index)
+        if stream is not None:
+            self._streams[channel_index] = stream
+            self._stream_stats['started'] += 1
+        self._channels_replace(
+            channel_index, track=file_index,
+            gain=self._track_gains.get(file_index, 1.0)
+        )
+        self._playlist_stats['tracks'] += 1
+        # Starting might reset the volume
+        self._channels_invalidate(channel_index)
+        # Keep queue of new stream filled
+        self._streams_should_service.set()
 
-    def _channels_volume(self, channel_index, volume):
+    def _playlist_service(self, channel_index, playlist):
         """
-        Set volume for channel
+        Queue next track of playlist before the current one ends
+
+        Decoding happens outside of the lock - the mixer switches to the
+        queued sound without a gap
 
         :param channel_index: Index of channel
         :type channel_index: int
-        :param volume: Volume to set - stereo or (left, right)
-        :type volume: float | (float, None) | (float, float)
+        :param playlist: Playlist of channel
+        :type playlist: paps_soundmix.playlist.Playlist
         :rtype: None
-        :raises ValueError: Invalid channel index
-        :raises PlayerException: Error setting volume
         """
-        if not isinstance(volume, float) and len(volume) == 2:
-            left, right = volume
+        with self._channels_lock:
+            if self._playlists.get(channel_index) is not playlist:
+                return
+            c = self._channels_get(channel_index)
+            if c['paused']:
+                return
+            channel = c['channel']
+            busy = channel.get_busy()
+            if playlist.queued is not None:
+                sound, file_index, stream = playlist.queued
+                if busy and channel.get_sound() is not sound:
+                    # Previous track still playing
+                    return
+                playlist.queued = None
+                self._playlist_started(channel_index, file_index, stream)
+                return
+            stream = self._streams.get(channel_index)
+            if stream is not None and not stream.ended:
+                # Chunks of current track left
+                return
+            if busy and channel.get_queue() is not None:
+                # Last chunk of current track waiting
+                return
+            file_index = playlist.next()
+            if file_index is None:
+                if not busy:
+                    # Last track played
+                    del self._playlists[channel_index]
+                    self._streams_remove(channel_index)
+                return
+        # Load outside of lock
+        stream = None
+        if self._file_should_stream(file_index):
+            stream = self._stream_open(file_index, {})
+        if stream is None:
+            sound = self._sound_cache.get(self._files[file_index])
         else:
-            left, right = volume, volume
-        # self.debug(u"Setting {} to {}-{}".format(channel_index, left, right))
+            sound = stream.next()
+        with self._channels_lock:
+            if self._playlists.get(channel_index) is not playlist:
+                if stream is not None:
+                    stream.close()
+                return
+            channel = self._channels_get(channel_index)['channel']
+            if channel.get_busy():
+                channel.queue(sound)
+                playlist.queued = (sound, file_index, stream)
+            else:
+                # Current track ended before next one was ready
+                self._playlist_stats['underruns'] += 1
+                channel.play(sound)
+                self._playlist_started(channel_index, file_index, stream)
+
+    def _streams_service(self):
+        """
+        Threaded function keeping the queues of streaming channels and
+        playlists filled
 
+        :rtype: None
+        """
+        playlists = False
+        while self._is_running:
+            timeout = self._stream_chunk / 4.0
+            if playlists:
+                # Notice started tracks early (short tracks)
+                timeout = min(timeout, 0.05)
+            self._streams_should_service.wait(timeout)
+            self._streams_should_service.clear()
+            playlists = self._streams_tick()
         with self._channels_lock:
-            if channel_index not in self._channels:
-                raise ValueError(
-                    u"Channel index {} not found".format(channel_index)
-                )
+            for channel_index in list(self._streams.keys()):
+                self._streams_remove(channel_index)
+            self._playlists.clear()
+        self.debug("ended")
+
+    def _streams_tick(self):
+        """
+        Service all streams and playlists once
+
+        :return: Playlists active
+        :rtype: bool
+        """
+        with self._channels_lock:
+            streams = list(self._streams.items())
+            playlists = list(self._playlists.items())
+        for channel_index, stream in streams:
             try:
-                self._channels[channel_index]['channel'].set_volume(
-                    left, right
-                )
+                self._stream_service(channel_index, stream)
+            except:
+                self.exception(u"Failed to stream to channel {}".format(
+                    channel_index
+                ))
+                with self._channels_lock:
+                    if self._streams.get(channel_index) is stream:
+                        self._streams_remove(channel_index)
+        for channel_index, playlist in playlists:
+            try:
+                self._playlist_service(channel_index, playlist)
             except:
                 self.exception(
-                    u"Failed to change volume to {}-{}".format(left, right)
+                    u"Failed to queue next track of channel {}".format(
+                        channel_index
+                    )
                 )
-                raise PlayerException("Setting volume failed")
+                with self._channels_lock:
+                    if self._playlists.get(channel_index) is playlist:
+                        del self._playlists[channel_index]
+        return bool(playlists)
 
-    def _channels_do(self, channel_index, cmd, val, options=None):
+    def _channels_load(self, channel_index, file_index=None, options=None):
         """
-        Execute command on channels
+        Load the sound a channel is going to play (without playing it)
 
         :param channel_index: Index of channel
         :type channel_index: int
-        :param cmd: Command to execute (files, state, volume)
-        :type cmd: unicode
-        :param val: Value for command
-        :type val: None | unicode | float | int | list[int]
-        :param options: Additional options for command (default: {})
-        :type options: dict
+        :param file_index: Index of file (default: None)
+            None -> select next from files
+        :type file_index: None | int
+        :param options: Additional options for playback (default: None)
+        :type options: None | dict
+        :return: What to play (file, sound, stream, playlist, options)
+        :rtype: dict
+        :raises ValueError: Invalid file index
+        :raises ValueError: Invalid channel index
+        :raises ValueError: Loading failed
+        :raises PlayerException: No files in channel to play
+        """
+        if options is None:
+            options = {}
+        if file_index is not None:
+            self._channels_files_replace(channel_index, file_index)
+
+        c = self._channels_get(channel_index)
+        if not c['files']:
+            raise PlayerException("Nothing to play")
+        playlist = None
+        if c['playlist'] is not None:
+            playlist = Playlist(c['files'], c['playlist'])
+            file_index = playlist.next()
+            # Tracks are played once each (queued one after another)
+            options = dict(options, loops=0, maxtime=0)
+        else:
+            file_index = c['files'][0]
+
+        if channel_index == self._quantise['master']:
+            # Grid is created on start or once detected
+            self._tempo_get(file_index)
+        stream = None
+        if self._file_should_stream(file_index):
+            stream = self._stream_open(file_index, options)
+        # Decode outside of lock (cache miss might take a while)
+        try:
+            if stream is None:
+                sound = self._sound_cache.get(self._files[file_index])
+            else:
+                sound = stream.next()
+        except:
+            if stream is not None:
+                stream.close()
+            raise ValueError(
+                u"Loading sound from  '{}' failed".format(
+                    self._files[file_index]
+                )
+            )
+        return {
+            'file': file_index,
+            'sound': sound,
+            'stream': stream,
+            'playlist': playlist,
+            'options': options
+        }
+
+    def _channels_start(self, channel_index, load):
+        """
+        Start playing a loaded sound
+
+        Note: Assumes :attr:`_channels_lock` already aquired!
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :param load: What to play (see _channels_load)
+        :type load: dict
+        :rtype: None
+        :raises ValueError: Invalid channel index
+        :raises PlayerException: Error playing
+        """
+        options = load['options']
+        stream = load['stream']
+        self._streams_remove(channel_index)
+        self._playlists.pop(channel_index, None)
+        # Channel might have been removed in the meantime
+        c = self._channels_get(channel_index)
+        # TODO: Maybe unpause?
+        # On failure probably not paused either
+        self._channels_replace(
+            channel_index, paused=False, track=load['file'],
+            gain=self._track_gains.get(load['file'], 1.0)
+        )
+        try:
+            if stream is None:
+                c['channel'].play(
+                    load['sound'],
+                    options.get('loops', 0),
+                    options.get('maxtime', 0),
+                    options.get('fade_ms', 0)
+                )
+            else:
+                # Loops/maxtime handled by stream
+                c['channel'].play(
+                    load['sound'], 0, 0, options.get('fade_ms', 0)
+                )
+                self._streams[channel_index] = stream
+                self._stream_stats['started'] += 1
+                self._streams_should_service.set()
+        except:
+            if stream is not None:
+                stream.close()
+            raise PlayerException("Playing failed")
+        if load['playlist'] is not None:
+            self._playlists[channel_index] = load['playlist']
+            self._playlist_stats['tracks'] += 1
+            self._streams_should_service.set()
+        if channel_index == self._quantise['master']:
+            self._beat_grid_start(load['file'])
+        # Playing might reset the volume
+        self._channels_invalidate(channel_index)
+
+    def _channels_play(self, channel_index, file_index=None, options=None):
+        """
+        Play a file (and add it to channel files, if not present)
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :param file_index: Index of file (default: None)
+            None -> select next from files
+        :type file_index: None | int
+        :param options: Additional options for playback (default: None)
+        :type options: None | dict
+        :rtype: None
+        :raises ValueError: Invalid file index
+        :raises ValueError: Invalid channel index
+        :raises PlayerException: No files in channel to play
+        """
+        self.debug(
+            u"(channel_index={}, file_index={}, options={})".format(
+                channel_index, file_index, options
+            )
+        )
+        load = self._channels_load(channel_index, file_index, options)
+        with self._channels_lock:
+            self._channels_start(channel_index, load)
+            self.debug(self._channels_state_get(channel_index))
+
+    def _channels_play_sync(self, channel_indices, options=None):
+        """
+        Start several channels together (e.g. layered stems)
+
+        All sounds are loaded first, then the channels are started in one
+        go. Mixers supporting it start them with the same block.
+
+        :param channel_indices: Indices of channels
+        :type channel_indices: list[int]
+        :param options: Additional options for playback (default: None)
+        :type options: None | dict
+        :return: Result (channels started, load time, start skew in ms,
+            started within one mixer block)
+        :rtype: dict
+        :raises ValueError: Invalid channel index
+        :raises ValueError: Loading failed
+        :raises PlayerException: No files in channel to play
+        :raises PlayerException: Error playing
+        """
+        self.debug(u"(channel_indices={}, options={})".format(
+            channel_indices, options
+        ))
+        start = default_timer()
+        loads = [
+            (channel_index, self._channels_load(channel_index, None, options))
+            for channel_index in channel_indices
+        ]
+        loaded = default_timer()
+        started = []
+        with self._channels_lock:
+            with self._mixer.batch() as atomic:
+                for channel_index, load in loads:
+                    self._channels_start(channel_index, load)
+                    started.append(default_timer())
+        res = {
+            'channels': list(channel_indices),
+            'load_ms': (loaded - start) * 1000.0,
+            'skew_ms': (started[-1] - started[0]) * 1000.0 if started else 0.0,
+            'atomic': atomic
+        }
+        self._sync_last = res
+        self.info(u"Started channels {} together (skew {:.3f}ms{})".format(
+            res['channels'], res['skew_ms'], ", same block" if atomic else ""
+        ))
+        return res
+
+    def _channels_stop(self, channel_index):
+        """
+        Stop channel
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :rtype: None
+        :raises ValueError: Invalid channel index
+        :raises PlayerException: Error stopping
+        """
+        self.debug(u"(channel_index={})".format(channel_index))
+        with self._channels_lock:
+            c = self._channels_get(channel_index)
+            self._streams_remove(channel_index)
+            self._playlists.pop(channel_index, None)
+            # on failure propably not paused either
+            self._channels_replace(channel_index, paused=False)
+            if channel_index == self._quantise['master']:
+                self._beat_grid = None
+                self._beat_grid_track = None
+            try:
+                c['channel'].stop()
+            except:
+                raise PlayerException("Stopping failed")
+
+    def _channels_pause(self, channel_index):
+        """
+        Pause channel
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :rtype: None
+        :raises ValueError: Invalid channel index
+        :raises PlayerException: Error pausing
+        """
+        self.debug(u"(channel_index={})".format(channel_index))
+        with self._channels_lock:
+            c = self._channels_get(channel_index)
+            try:
+                c['channel'].pause()
+            except:
+                raise PlayerException("Pausing failed")
+            else:
+                self._channels_replace(channel_index, paused=True)
+                if channel_index == self._quantise['master'] \
+                        and self._beat_grid_paused is None:
+                    self._beat_grid_paused = self._timeline.clock()
+
+    def _channels_unpause(self, channel_index):
+        """
+        Unpause channel
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :rtype: None
+        :raises ValueError: Invalid channel index
+        :raises PlayerException: Error unpausing
+        """
+        self.debug(u"(channel_index={})".format(channel_index))
+        with self._channels_lock:
+            c = self._channels_get(channel_index)
+            # on failure propably not paused either
+            self._channels_replace(channel_index, paused=False)
+            grid, paused = self._beat_grid, self._beat_grid_paused
+            if channel_index == self._quantise['master'] \
+                    and paused is not None:
+                self._beat_grid_paused = None
+                track = self._beat_grid_track
+                if track is not None:
+                    self._beat_grid_track = (
+                        track[0], track[1] + self._timeline.clock() - paused
+                    )
+                if grid is not None:
+                    # Beats moved by the time paused
+                    self._beat_grid = BeatGrid(
+                        grid.anchor + self._timeline.clock() - paused,
+                        grid.period, grid.tolerance
+                    )
+            try:
+                c['channel'].unpause()
+            except:
+                raise PlayerException("Unpausing failed")
+
+    def _channels_playlist(self, channel_index, mode):
+        """
+        Set playlist mode of channel (applies to a running playlist)
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :param mode: Playlist mode (None -> only play first file)
+        :type mode: None | unicode
+        :rtype: None
+        :raises ValueError: Invalid channel index
+        :raises ValueError: Unknown mode
+        """
+        self.debug(u"(channel_index={}, mode={})".format(channel_index, mode))
+        if mode is not None and mode not in PLAYLIST_MODES:
+            raise ValueError(u"Unknown playlist mode '{}'".format(mode))
+        with self._channels_lock:
+            self._channels_replace(channel_index, playlist=mode)
+            playlist = self._playlists.get(channel_index)
+            if playlist is None:
+                return
+            if mode is None:
+                # Current track plays to its end
+                del self._playlists[channel_index]
+            else:
+                playlist.mode_set(mode)
+
+    def _channels_volume(self, channel_index, volume):
+        """
+        Set volume for channel (scaled by gain of track)
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :param volume: Volume to set - stereo or (left, right)
+        :type volume: float | (float, None) | (float, float)
+        :rtype: None
+        :raises ValueError: Invalid channel index
+        :raises PlayerException: Error setting volume
+        """
+        if not isinstance(volume, float) and len(volume) == 2:
+            left, right = volume
+        else:
+            left, right = volume, volume
+        # self.debug(u"Setting {} to {}-{}".format(channel_index, left, right))
+
+        with self._channels_lock:
+            c = self._channels_get(channel_index)
+            # Normalised loudness of track
+            gain = c['gain']
+            try:
+                c['channel'].set_volume(
+                    left * gain, right * gain
+                )
+            except:
+                self.exception(
+                    u"Failed to change volume to {}-{}".format(left, right)
+                )
+                raise PlayerException("Setting volume failed")
+
+    def _channels_volume_get(self, channel):
+        """
+        Get volume of channel without gain of track (as set)
+
+        :param channel: Channel
+        :type channel: dict
+        :return: Volume (left channel)
+        :rtype: float
+        """
+        volume = channel['channel'].get_volume()
+        if channel['gain'] > 0.0:
+            # Mixer volume includes gain of track
+            volume /= channel['gain']
+        return volume
+
+    def _channels_do(self, channel_index, cmd, val, options=None):
+        """
+        Execute command on channels
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :param cmd: Command to execute (files, state, playlist, volume)
+        :type cmd: unicode
+        :param val: Value for command
+        :type val: None | unicode | float | int | list[int]
+        :param options: Additional options for command (default: {})
+        :type options: dict
         :return: None
         """
         self.debug("()")
@@ -404,18 +1516,34 @@ class SoundMixPlugin(SettablePlugin):
             except ValueError:
                 self.exception("Failed to put file")
         elif cmd == "state":
+            when = None
+            if val in ["play", "stop"]:
+                when = self._quantise_when(channel_index)
             if val == "play":
                 try:
-                    self._channels_play(
-                        channel_index, options.get('file', None), options
-                    )
+                    if when is None:
+                        self._channels_play(
+                            channel_index, options.get('file', None), options
+                        )
+                    else:
+                        self._channels_play_at(
+                            when, channel_index, options.get('file', None),
+                            options
+                        )
                 except (ValueError, PlayerException):
                     self.exception("Failed to play")
             elif val == "stop":
-                try:
-                    self._channels_stop(channel_index)
-                except (ValueError, PlayerException):
-                    self.exception("Failed to stop")
+                if when is None:
+                    try:
+                        self._channels_stop(channel_index)
+                    except (ValueError, PlayerException):
+                        self.exception("Failed to stop")
+                else:
+                    self._quantise_stats['stops'] += 1
+                    self._timeline.schedule(
+                        when, partial(self._quantised_stop, channel_index),
+                        tag="quantise"
+                    )
             elif val == "pause":
                 try:
                     self._channels_pause(channel_index)
@@ -426,11 +1554,17 @@ class SoundMixPlugin(SettablePlugin):
                     self._channels_unpause(channel_index)
                 except (ValueError, PlayerException):
                     self.exception("Failed to unpause")
+        elif cmd == "playlist":
+            try:
+                self._channels_playlist(channel_index, val)
+            except ValueError:
+                self.exception("Failed to set playlist")
         elif cmd == "volume":
             try:
                 self._channels_volume(channel_index, val)
             except (ValueError, PlayerException):
                 self.exception("Failed to set volume")
+            self._channels_invalidate(channel_index)
 
     def _channels_settings(self, cs_sett):
         """
@@ -457,6 +1591,11 @@ class SoundMixPlugin(SettablePlugin):
                         self._channels_do(
                             c_sett['id'], "files", c_sett['files']
                         )
+                if "playlist" in c_sett:
+                    if c['playlist'] != c_sett['playlist']:
+                        self._channels_do(
+                            c_sett['id'], "playlist", c_sett['playlist']
+                        )
                 if "state" in c_sett:
                     old = self._channels_state_get(c).name
                     # check if changed
@@ -469,7 +1608,7 @@ class SoundMixPlugin(SettablePlugin):
                                 c_sett['id'], "state", c_sett['state'].lower()
                             )
                 if "volume" in c_sett:
-                    old = c['channel'].get_volume()
+                    old = self._channels_volume_get(c)
                     if old != c_sett['volume']:
                         self._channels_do(
                             c_sett['id'], "volume", c_sett['volume']
@@ -499,17 +1638,27 @@ class SoundMixPlugin(SettablePlugin):
             if group_id is None or group_id not in gs:
                 # generate new group (id)
                 group_id = max(gs.keys()) + 1
-            g = gs.setdefault(group_id, {})
-            # name of group (displayed)
-            g['name'] = g_sett['name']
             # people in group (set of ids)
-            g['people'] = {p['id'] for p in g_sett['people']}
-            # what counts as 'active' (standing/sitting)
-            g['active_definition'] = g_sett['active_definition']
-            # what action to take (perc/perc_total)
-            g['action'] = g_sett['action']
-            # corresponding channel id (set for this group) - None if nothing
-            g['channel'] = g_sett['channel_id']
+            old = gs.get(group_id, {}).get('people', frozenset())
+            new = frozenset(p['id'] for p in g_sett['people'])
+            # New object - readers might still use the old one
+            g = {
+                # name of group (displayed)
+                'name': g_sett['name'],
+                'people': new,
+                # what counts as 'active' (standing/sitting)
+                'active_definition': g_sett['active_definition'],
+                # what action to take (perc/perc_total)
+                'action': g_sett['action'],
+                # corresponding channel id (set for this group)
+                # - None if nothing
+                'channel': g_sett['channel_id']
+            }
+            with self._people_lock:
+                self._crowd.group_discard(group_id, old - new)
+                self._crowd.group_add(group_id, new - old)
+                self._groups_replace({group_id: g})
+        self._volume_should_update.set()
 
     def _groups_settings(self, gs_sett):
         """
@@ -535,146 +1684,997 @@ class SoundMixPlugin(SettablePlugin):
         :return: Sound percent of group (-1.0 on failure, else 0 <= percent <= 1.0)
         :rtype: float
         """
-        # Calculate percentage
-        percent = -1.0
-        gp = self._people.intersection(group['people'])
-        """ :type : set[unicode] """
-        # Assert isinstance(gp, set)
-        act = self._people_active.intersection(gp)
-        """ :type : set[unicode] """
-
-        if self._active_definition != group['active_definition']:
-            act = gp.difference(act)
-
-        # self.debug(u"GP: {}".format(gp))
-        # self.debug(u"Act: {}".format(act))
-        action = group['action']
-        if action == "percent":
-            # protect div 0
-            if len(gp):
-                # get percentage of active people in this group
-                percent = len(act) / len(gp)
-        elif action == "percent_total":
-            # protect div 0
-            if len(self._people):
-                # get percentage of active people in audience
-                percent = len(act) / len(self._people)
-        else:
-            self.error(u"Unknown action in group {}: '{}'".format(
-                group_id, action
+        return self._groups_calc_percentages({group_id: group}).get(
+            group_id, -1.0
+        )
+
+    def _groups_calc_percentages(self, gs):
+        """
+        Calculate percent of sound volume for groups (in one pass)
+
+        :param gs: Groups to calculate
+        :type gs: dict[int, dict[unicode, int|set|unicode]]
+        :return: Sound percent per group id
+            (-1.0 on failure, else 0 <= percent <= 1.0)
+        :rtype: dict[int, float]
+        """
+        specs = []
+        for group_id in gs:
+            group = gs[group_id]
+            action = group['action']
+            if action not in ["percent", "percent_total"]:
+                self.error(u"Unknown action in group {}: '{}'".format(
+                    group_id, action
+                ))
+            specs.append((
+                group_id,
+                action,
+                # Count inactive people instead
+                self._active_definition != group['active_definition']
             ))
-        return percent
+        percents = self._crowd.percentages(specs)
+        return {
+            spec[0]: percent
+            for spec, percent in zip(specs, percents)
+        }
+
+    def _volume_apply(self, channel_index, volume, quantise=True):
+        """
+        Set volume for channel - only if it differs from the last one applied
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :param volume: Volume to set - stereo or (left, right)
+        :type volume: float | (float, float)
+        :param quantise: Wait for next grid point when quantising
+            (default: True)
+        :type quantise: bool
+        :rtype: None
+        :raises ValueError: Invalid channel index
+        :raises PlayerException: Error setting volume
+        """
+        with self._channels_lock:
+            if quantise and self._quantise_defer(channel_index, volume):
+                return
+            if self._volume_applied.get(channel_index) == volume:
+                self._volume_stats['skipped'] += 1
+                return
+            if self._volume_smoother is not None:
+                # Validate index - smoother writes later
+                self._channels_get(channel_index)
+                self._volume_smoother.target_set(
+                    channel_index,
+                    volume,
+                    # Invalidated -> mixer might have reset it
+                    force=channel_index not in self._volume_applied
+                )
+                self._volume_applied[channel_index] = volume
+                self._volume_should_smooth.set()
+                return
+            self._channels_volume(channel_index, volume)
+            self._volume_applied[channel_index] = volume
+            self._volume_stats['applied'] += 1
+            self._metrics_applied()
+
+    def _volume_dirty_pop(self, gs):
+        """
+        Get and reset groups whose percentage might have changed
+
+        Note: Assumes :attr:`_people_lock` already aquired!
+
+        :param gs: Groups
+        :type gs: dict[int, dict]
+        :return: Ids of changed groups
+        :rtype: set[int]
+        """
+        dirty, total_changed = self._crowd.dirty_pop()
+        dirty.update(self._groups_dirty)
+        self._groups_dirty = set()
+        if total_changed:
+            # Depend on the number of all people
+            dirty.update(
+                group_id for group_id in gs
+                if gs[group_id]['action'] == "percent_total"
+            )
+        with self._channels_lock:
+            if self._channels_dirty:
+                cs = self._channels_dirty
+                self._channels_dirty = set()
+                dirty.update(
+                    group_id for group_id in gs
+                    if gs[group_id]['channel'] in cs
+                )
+        self._volume_stats['passes'] += 1
+        self._volume_stats['clean'] += len(gs) - len(dirty)
+        return dirty
 
     def _volume_update(self):
         """
-        Calculate percentages for each group and adjust volume
-        groups_lock - people_lock - channel_lock
+        Calculate percentages for each changed group and adjust volume
+        people_lock - channel_lock
 
         :return: None
         """
-        with self._groups_lock:
+        with self._people_lock:
+            # Groups are swapped under people_lock
+            # -> consistent with crowd
             gs = self._groups
-
-            with self._people_lock:
-                for group_id in gs:
-                    # self.debug("G: {}".format(group_id))
-                    g = gs[group_id]
-                    """ :type : dict[unicode, int|set|unicode] """
-                    if group_id == 0:
-                        # don't calc for not placed group
-                        continue
-
-                    percent = self._group_calc_percentage(group_id, g)
-                    # self.debug("Perc: {}".format(percent))
-                    if 0.0 <= percent <= 1.0:
-                        # TODO: only update on changes
-                        # valid percentage value
-                        try:
-                            self._channels_volume(g['channel'], percent)
-                        except (ValueError, PlayerException):
-                            self.exception("Failed to set volume")
+            dirty = {
+                group_id: gs[group_id]
+                for group_id in self._volume_dirty_pop(gs)
+                # don't calc for not placed group
+                if group_id != 0 and group_id in gs
+            }
+            percents = self._groups_calc_percentages(dirty)
+        self._volume_stats['computed'] += len(dirty)
+        for group_id in dirty:
+            g = dirty[group_id]
+            """ :type : dict[unicode, int|set|unicode] """
+            percent = percents[group_id]
+            # self.debug("Perc: {}".format(percent))
+            if 0.0 <= percent <= 1.0:
+                # valid percentage value
+                try:
+                    self._volume_apply(
+                        g['channel'], self._volume_curve(percent)
+                    )
+                except (ValueError, PlayerException):
+                    self.exception("Failed to set volume")
 
     def on_config(self, settings):
         self.debug("()")
         settings = dict(settings)
-        self.debug(pformat(settings))
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self.debug(pformat(settings))
+        if self._trace is not None:
+            self._trace.record("config", settings)
+        if "tempo" in settings:
+            try:
+                self._tempo_set(settings['tempo'])
+            except ValueError:
+                self.exception("Failed to set tempo")
+        if "quantise" in settings:
+            try:
+                self._quantise_set(settings['quantise'])
+            except ValueError:
+                self.exception("Failed to set quantiser")
+
+        if "volume_curve" in settings:
+            try:
+                self._volume_curve_set(settings['volume_curve'])
+            except ValueError:
+                self.exception("Failed to set volume curve")
+        if "loudness" in settings:
+            self._loudness_set(settings['loudness'])
 
         if "channels" in settings:
             cs_sett = dict(settings['channels'])
             self._channels_settings(cs_sett)
-        if "groups" in settings:
-            gs_sett = list(settings['groups'])
+        if "sync_play" in settings:
+            sync = settings['sync_play']
+            if isinstance(sync, dict):
+                indices, options = sync['channels'], sync.get('options')
+            else:
+                indices, options = sync, None
+            try:
+                self._channels_play_sync(indices, options)
+            except (ValueError, PlayerException):
+                self.exception("Failed to play synchronised")
+        if "groups" in settings:
+            gs_sett = list(settings['groups'])
             self._groups_settings(gs_sett)
+        if "timeline" in settings:
+            try:
+                self._timeline_set(settings['timeline'])
+            except ValueError:
+                self.exception("Failed to set timeline")
+
+    def _tick_clock(self):
+        """
+        Clock of timeline without threads (advanced by tick())
+
+        :rtype: float
+        """
+        return self._tick_time
+
+    def _groups_channel_set(self, group_id, channel_index):
+        """
+        Let group control another channel
+
+        :param group_id: Id of group
+        :type group_id: int
+        :param channel_index: Index of channel (None -> no channel)
+        :type channel_index: None | int
+        :rtype: None
+        :raises ValueError: Unknown group
+        """
+        with self._groups_lock:
+            g = self._groups.get(group_id)
+            if g is None:
+                raise ValueError(u"Unknown group {}".format(group_id))
+            # New object - readers might still use the old one
+            g = dict(g)
+            g['channel'] = channel_index
+            with self._people_lock:
+                self._groups_replace({group_id: g})
+        if channel_index is not None:
+            # Same percentage might be a different volume for this channel
+            self._channels_invalidate(channel_index)
+        self._volume_should_update.set()
 
-    def get_data(self):
+    def _cue_volume(self, channel_index, volume):
+        """
+        Set volume of channel (step of fade)
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :param volume: Volume to set - stereo or (left, right)
+        :type volume: float | (float, float)
+        :rtype: None
+        """
+        try:
+            self._channels_volume(channel_index, volume)
+        except (ValueError, PlayerException):
+            self.exception("Failed to fade")
+
+    def _cue_fade(self, cue):
+        """
+        Schedule volume steps from the current to the cue volume
+        (volume_rate steps per second over 'duration' seconds)
+
+        :param cue: Fade cue
+        :type cue: dict
+        :rtype: None
+        """
+        channel_index = cue['channel']
         with self._channels_lock:
-            cs = self._channels
-            channels_info = {
-                'count': pygame.mixer.get_num_channels()
-            }
+            try:
+                c = self._channels_get(channel_index)
+            except ValueError:
+                self.exception("Failed to fade")
+                return
+            left = right = self._channels_volume_get(c)
+        target = cue['volume']
+        if isinstance(target, float):
+            target = (target, target)
+        duration = float(cue.get('duration', 1.0))
+        steps = max(1, int(math.ceil(duration * self._volume_rate)))
+        # Relative to due time (not delayed by jitter)
+        start = self._timeline_start + cue['time']
+        for step in range(1, steps + 1):
+            f = step / steps
+            self._timeline.schedule(start + duration * f, partial(
+                self._cue_volume, channel_index, (
+                    left + (target[0] - left) * f,
+                    right + (target[1] - right) * f
+                )
+            ), tag="timeline")
+
+    def _cue_execute(self, cue):
+        """
+        Do what the cue says (called by timeline)
+
+        :param cue: Cue
+        :type cue: dict
+        :rtype: None
+        """
+        action = cue['action']
+        self.debug(u"Cue {} ({})".format(cue['id'], action))
+        if action == "map":
+            try:
+                self._groups_channel_set(cue['group_id'], cue['channel'])
+            except ValueError:
+                self.exception("Failed to map group")
+        elif action == "sync_play":
+            try:
+                self._channels_play_sync(cue['channels'], cue.get('options'))
+            except (ValueError, PlayerException):
+                self.exception("Failed to play synchronised")
+        elif action == "fade":
+            self._cue_fade(cue)
+        elif action == "volume":
+            self._channels_do(cue['channel'], "volume", cue['volume'])
+        else:
+            options = dict(cue.get('options', {}))
+            if "file" in cue:
+                options['file'] = cue['file']
+            self._channels_do(cue['channel'], "state", action, options)
+
+    def _timeline_play(self, position=0.0):
+        """
+        (Re)start timeline
+
+        :param position: Start at this time of the timeline (in seconds)
+            - earlier cues are skipped (default: 0.0)
+        :type position: float
+        :rtype: None
+        :raises ValueError: Invalid cue
+        """
+        cues = cues_parse(self._timeline_cues, self._timeline_bpm)
+        self._timeline_stop()
+        self._timeline.stats_clear()
+        start = self._timeline.clock() - position
+        self._timeline_start = start
+        for cue in cues:
+            if cue['time'] < position:
+                continue
+            self._timeline.schedule(
+                start + cue['time'], partial(self._cue_execute, cue),
+                cue['id'], "timeline"
+            )
+
+    def _timeline_stop(self):
+        """
+        Stop timeline (running fades stop too)
+
+        :rtype: None
+        """
+        self._timeline.clear("timeline")
+        self._timeline_start = None
+
+    def _timeline_set(self, t_sett):
+        """
+        Apply timeline settings
+
+        :param t_sett: Settings (cues, bpm, state (play/stop), position)
+        :type t_sett: dict
+        :rtype: None
+        :raises ValueError: Invalid cue
+        """
+        cues = t_sett.get('cues', self._timeline_cues)
+        bpm = t_sett.get('bpm', self._timeline_bpm)
+        # Validate before changing anything
+        cues_parse(cues, bpm)
+        self._timeline_cues, self._timeline_bpm = list(cues), bpm
+        state = t_sett.get('state')
+        if state == "play":
+            self._timeline_play(float(t_sett.get('position', 0.0)))
+        elif state == "stop":
+            self._timeline_stop()
+
+    def _timeline_get(self):
+        """
+        Create timeline info for frontend
+
+        :return: State, position (seconds), pending entries, tempo,
+            cues (as set), jitter per cue id
+        :rtype: dict
+        """
+        start = self._timeline_start
+        return {
+            'state': "stop" if start is None else "play",
+            'position': None if start is None
+            else self._timeline.clock() - start,
+            'pending': self._timeline.pending,
+            'bpm': self._timeline_bpm,
+            'cues': list(self._timeline_cues),
+            'jitter': self._timeline.stats()
+        }
+
+    def _tempo_set(self, tempo):
+        """
+        Set tempo metadata of files
+
+        :param tempo: Tempo (bpm, downbeat, beats_per_bar) per file index
+        :type tempo: dict[int | unicode, dict]
+        :rtype: None
+        :raises ValueError: Invalid metadata or file index
+        """
+        parsed = {}
+        for file_index, meta in tempo.items():
+            try:
+                file_index = int(file_index)
+            except ValueError:
+                raise ValueError(u"Invalid file index {}".format(file_index))
+            if file_index not in self._files:
+                raise ValueError(u"Invalid file index {}".format(file_index))
+            parsed[file_index] = tempo_parse(meta)
+        self._tempo.update(parsed)
+
+    def _tempo_get(self, file_index):
+        """
+        Get tempo of file - if not set, detection starts on first use
+        (in the background when threaded)
+
+        :param file_index: Index of file
+        :type file_index: int
+        :return: Tempo (None -> unknown or not detected yet)
+        :rtype: None | dict
+        """
+        tempo = self._tempo.get(file_index)
+        if tempo is not None or not self._tempo_detect:
+            return tempo or None
+        with self._tempo_lock:
+            if file_index in self._tempo_pending:
+                return None
+            self._tempo_pending.add(file_index)
+        if not self._threaded:
+            # Deterministic (e.g. offline rendering)
+            self._tempo_detect_file(file_index)
+            return self._tempo.get(file_index) or None
+        try:
+            a_thread = threading.Thread(
+                target=self._tempo_detect_file, args=(file_index,)
+            )
+            a_thread.daemon = True
+            a_thread.start()
+        except:
+            self.exception("Failed to start tempo detection")
+            with self._tempo_lock:
+                self._tempo_pending.discard(file_index)
+        return None
+
+    def _tempo_detect_file(self, file_index):
+        """
+        Detect tempo of file (only once) and start the beat grid, if the
+        file is already playing on the master channel
+
+        Uses the analysis (cached by content hash), if available
+
+        :param file_index: Index of file
+        :type file_index: int
+        :rtype: None
+        """
+        path = self._files[file_index]
+        try:
+            result = self._analysis.get(file_index)
+            if result is None and self._analysis_cache is not None:
+                # Stored for later runs
+                result = self._analysis_cache.analyse([path]).get(path)
+            if result is not None:
+                tempo = result['tempo']
+                if tempo is None:
+                    raise ValueError("Not detected by analysis")
+            else:
+                tempo = tempo_detect(self._wave_files.get(path))
+            self.info(u"Detected {:.1f}bpm in {}".format(
+                tempo['bpm'], path
+            ))
+        except (IOError, ValueError, PluginException) as e:
+            self.warning(u"Failed to detect tempo of {} ({})".format(
+                path, e
+            ))
+            tempo = {}
+        with self._channels_lock:
+            # Only once (unless set meanwhile)
+            tempo = self._tempo.setdefault(file_index, tempo)
+            track = self._beat_grid_track
+            if tempo and self._beat_grid is None and track is not None \
+                    and track[0] == file_index:
+                # Unpausing moves the grid, if paused now
+                self._beat_grid = BeatGrid.from_tempo(
+                    tempo, track[1],
+                    self._quantise['grid'], self._quantise['tolerance']
+                )
+        with self._tempo_lock:
+            self._tempo_pending.discard(file_index)
+
+    def _quantise_set(self, q_sett):
+        """
+        Apply quantiser settings
+
+        :param q_sett: Settings (master, grid, volume, tolerance)
+        :type q_sett: dict
+        :rtype: None
+        :raises ValueError: Invalid grid
+        """
+        q = dict(self._quantise)
+        q.update({
+            key: q_sett[key]
+            for key in ["master", "grid", "volume", "tolerance"]
+            if key in q_sett
+        })
+        if q['grid'] not in ["beat", "bar"]:
+            raise ValueError("Grid needs to be beat/bar")
+        with self._channels_lock:
+            if q['master'] != self._quantise['master']:
+                # Phase of master unknown until (re)started
+                self._beat_grid = None
+                self._beat_grid_paused = None
+                self._beat_grid_track = None
+            self._quantise = q
+            master = q['master']
+            files = []
+            if master is not None and master in self._channels:
+                files = self._channels[master]['files']
+        for file_index in files:
+            # Detect before starting
+            self._tempo_get(file_index)
+
+    def _beat_grid_start(self, file_index):
+        """
+        Create grid for the file the master channel just started
+
+        Note: Assumes :attr:`_channels_lock` already aquired!
+
+        :param file_index: Index of file
+        :type file_index: int
+        :rtype: None
+        """
+        tempo = self._tempo.get(file_index)
+        self._beat_grid_paused = None
+        self._beat_grid_track = (file_index, self._timeline.clock())
+        if not tempo:
+            self._beat_grid = None
+            if file_index in self._tempo_pending:
+                self.info(u"Quantising once tempo of file {} is known".format(
+                    file_index
+                ))
+            else:
+                self.warning(u"No tempo for file {} - not quantising".format(
+                    file_index
+                ))
+            return
+        self._beat_grid = BeatGrid.from_tempo(
+            tempo, self._beat_grid_track[1],
+            self._quantise['grid'], self._quantise['tolerance']
+        )
+
+    def _quantise_when(self, channel_index):
+        """
+        Get time a change of channel should happen
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :return: Next grid point (None -> now)
+        :rtype: None | float
+        """
+        grid = self._beat_grid
+        if grid is None or self._beat_grid_paused is not None \
+                or channel_index == self._quantise['master']:
+            return None
+        now = self._timeline.clock()
+        when = grid.next(now)
+        if when <= now:
+            return None
+        return when
+
+    def _quantise_defer(self, channel_index, volume):
+        """
+        Keep volume for the next grid point
+
+        Note: Assumes :attr:`_channels_lock` already aquired!
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :param volume: Volume to set - stereo or (left, right)
+        :type volume: float | (float, float)
+        :return: Volume deferred (otherwise set it now)
+        :rtype: bool
+        """
+        when = None
+        if self._quantise['volume']:
+            when = self._quantise_when(channel_index)
+        if when is None:
+            # Newer than pending one
+            self._quantise_pending.pop(channel_index, None)
+            return False
+        self._quantise_pending[channel_index] = volume
+        self._quantise_stats['volumes'] += 1
+        if self._quantise_flush != when:
+            self._quantise_flush = when
+            self._timeline.schedule(
+                when, self._quantised_volumes, tag="quantise"
+            )
+        return True
+
+    def _quantised_volumes(self):
+        """
+        Apply pending volumes (called on grid point)
+
+        :rtype: None
+        """
+        with self._channels_lock:
+            pending, self._quantise_pending = self._quantise_pending, {}
+            self._quantise_flush = None
+            for channel_index, volume in pending.items():
+                try:
+                    self._volume_apply(channel_index, volume, False)
+                except (ValueError, PlayerException):
+                    self.exception("Failed to set volume")
+
+    def _channels_play_at(self, when, channel_index, file_index=None,
+                          options=None):
+        """
+        Load now, start playing at time
+
+        :param when: Time to start (clock of timeline)
+        :type when: float
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :param file_index: Index of file (default: None)
+            None -> select next from files
+        :type file_index: None | int
+        :param options: Additional options for playback (default: None)
+        :type options: None | dict
+        :rtype: None
+        :raises ValueError: Invalid file index
+        :raises ValueError: Invalid channel index
+        :raises PlayerException: No files in channel to play
+        """
+        load = self._channels_load(channel_index, file_index, options)
+        self._quantise_stats['starts'] += 1
+        self._timeline.schedule(
+            when, partial(self._quantised_start, channel_index, load),
+            tag="quantise"
+        )
+
+    def _quantised_start(self, channel_index, load):
+        """
+        Start loaded sound (called on grid point)
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :param load: What to play (see _channels_load)
+        :type load: dict
+        :rtype: None
+        """
+        with self._channels_lock:
+            try:
+                self._channels_start(channel_index, load)
+            except (ValueError, PlayerException):
+                self.exception("Failed to play")
+                if load['stream'] is not None:
+                    load['stream'].close()
+
+    def _quantised_stop(self, channel_index):
+        """
+        Stop channel (called on grid point)
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :rtype: None
+        """
+        try:
+            self._channels_stop(channel_index)
+        except (ValueError, PlayerException):
+            self.exception("Failed to stop")
+
+    def _quantise_get(self):
+        """
+        Create quantiser info for frontend
+
+        :return: Settings, tempo of master, seconds to next grid point,
+            pending volumes, changes moved to the grid
+        :rtype: dict
+        """
+        grid = self._beat_grid
+        res = dict(self._quantise)
+        res.update({
+            'period': None,
+            'next': None,
+            'pending': len(self._quantise_pending),
+            'stats': dict(self._quantise_stats)
+        })
+        if grid is not None:
+            now = self._timeline.clock()
+            res['period'] = grid.period
+            res['next'] = grid.next(now) - now
+        return res
+
+    def _groups_info(self, group_id, group):
+        """
+        Create info for frontend
+
+        :param group_id: Id of group
+        :type group_id: int
+        :param group: Group
+        :type group: dict
+        :rtype: dict
+        """
+        return {
+            'id': group_id,
+            'name': group['name'],
+            # json cant handle sets
+            # TODO: make json set serializer
+            'people': [{'id': p} for p in group['people']],
+            'active_definition': group['active_definition'],
+            'action': group['action'],
+            'channel_id': group['channel']
+        }
+
+    def _channels_info(self, channel_index, channel, group_id):
+        """
+        Create info for frontend
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :param channel: Channel
+        :type channel: dict
+        :param group_id: Id of group associated with channel
+        :type group_id: None | int
+        :rtype: dict
+        """
+        state = self._channels_state_get(channel)
+        return {
+            'id': channel_index,
+            'files': list(channel['files']),
+            'volume': self._channels_volume_get(channel),
+            'output_volume': channel['channel'].get_volume(),
+            'state': state.name,
+            'group_id': group_id,
+            'playlist': channel['playlist'],
+            'track': channel['track'] if state != PlayState.STOP else None,
+            'gain': channel['gain']
+        }
+
+    def get_data(self, since=None):
+        """
+        Get channels, groups and files (plus statistics)
+
+        Channels and groups are versioned. Unchanged info is served from
+        a cached snapshot (do not modify the result).
+
+        :param since: Only include channels/groups changed after this version
+            (default: None) - None means everything
+        :type since: None | int
+        :return: Data with current version
+        :rtype: dict
+        """
+        # No locking - groups/channels are replaced, not modified
+        gs = self._groups
+        cs = self._channels
+        group_ids = list(gs.keys())
+        with self._state_lock:
+            snapshot = self._groups_snapshot
+            channel_groups = {}
+            for group_id in group_ids:
+                group = gs[group_id]
+                if group_id not in snapshot or \
+                        snapshot[group_id][1] is not group:
+                    # Changed since last call
+                    snapshot[group_id] = (
+                        self._state_bump(),
+                        group,
+                        self._groups_info(group_id, group)
+                    )
+                if group['channel'] is not None:
+                    channel_groups[group['channel']] = group_id
+            groups_snapshot = dict(snapshot)
+
+            # Channels change on their own (e.g. track ended)
+            # -> compare with last info
+            snapshot = self._channels_snapshot
+            count = self._mixer.channels_number_get()
+            if count != self._channels_count[1]:
+                self._channels_count = (self._state_bump(), count)
             for i in cs:
-                c = cs[i]
-                ci = c['channel']
-                state = self._channels_state_get(c)
-
-                channels_info[i] = {
-                    'id': i,
-                    'files': c['files'],
-                    'volume': ci.get_volume(),
-                    'state': state.name,
-                    'group_id': None
-                }
-        with self._groups_lock:
-            group_info = []
-            for group_id in self._groups:
-                group = self._groups[group_id]
-                g = {
-                    'id': group_id,
-                    'name': group['name'],
-                    # json cant handle sets
-                    # TODO: make json set serializer
-                    'people': [{'id': p} for p in group['people']],
-                    'active_definition': group['active_definition'],
-                    'action': group['action'],
-                    'channel_id': group['channel']
+                info = self._channels_info(i, cs[i], channel_groups.get(i))
+                if i not in snapshot or snapshot[i][1] != info:
+                    snapshot[i] = (self._state_bump(), info)
+            for i in list(snapshot.keys()):
+                if i not in cs:
+                    del snapshot[i]
+                    self._channels_removed[i] = self._state_bump()
+            channels_snapshot = dict(snapshot)
+            channels_removed = dict(self._channels_removed)
+            count_version = self._channels_count[0]
+            version = self._state_version
+
+        if since is None:
+            cached = self._state_snapshot
+            if cached is not None and cached[0] == version:
+                _, channels_info, group_info = cached
+            else:
+                channels_info = {'count': count}
+                for i in channels_snapshot:
+                    channels_info[i] = channels_snapshot[i][1]
+                group_info = [groups_snapshot[gid][2] for gid in group_ids]
+                self._state_snapshot = (version, channels_info, group_info)
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self.debug(u"Result:\n{}".format(pformat({
+                    'channels': channels_info,
+                    'files': self._files,
+                    'groups': group_info
+                })))
+            res = {
+                'version': version,
+                'channels': channels_info,
+                'groups': group_info
+            }
+        else:
+            channels_info = {}
+            if count_version > since:
+                channels_info['count'] = count
+            for i in channels_snapshot:
+                if channels_snapshot[i][0] > since:
+                    channels_info[i] = channels_snapshot[i][1]
+            res = {
+                'version': version,
+                'since': since,
+                'channels': channels_info,
+                'groups': [
+                    groups_snapshot[gid][2]
+                    for gid in group_ids
+                    if groups_snapshot[gid][0] > since
+                ],
+                'removed': {
+                    'channels': [
+                        i for i in channels_removed
+                        if channels_removed[i] > since
+                    ]
                 }
-                if group['channel'] is not None:
-                    channels_info[group['channel']]['group_id'] = group_id
-                group_info.append(g)
-        self.debug(u"Result:\n{}".format(pformat({
-            'channels': channels_info,
-            'files': self._files,
-            'groups': group_info
-        })))
-        return {
-            'channels': channels_info,
+            }
+        res.update({
             'files': self._files,
-            'groups': group_info
-        }
+            'cache': self._sound_cache.stats(),
+            'preload': self._preload_get(),
+            'volume_stats': dict(self._volume_stats),
+            'ingest_stats': dict(self._ingest_stats),
+            'mixer': self._mixer.stats(),
+            'streams': dict(self._stream_stats, active=len(self._streams)),
+            'maps': self._wave_files.stats(),
+            'playlists': dict(
+                self._playlist_stats, active=len(self._playlists)
+            ),
+            'sync': self._sync_last,
+            'timeline': self._timeline_get(),
+            'quantise': self._quantise_get(),
+            'analysis': self._analysis_get(),
+            'loudness': self._loudness_get(),
+            'metrics': self._metrics.stats()
+        })
+        return res
+
+    def _preload_get(self):
+        """
+        Get preload progress (ready flag, load times per file, total time)
+
+        :return: Copy of preload state
+        :rtype: dict[unicode, bool | dict | list | float]
+        """
+        with self._preload_lock:
+            state = dict(self._preload_state)
+            state['files'] = dict(state['files'])
+            state['failed'] = list(state['failed'])
+            state['evicted'] = list(state['evicted'])
+        return state
+
+    def _journal_mark(self, data, channels):
+        """
+        Remember what has been written
+
+        Note: Assumes :attr:`_journal_lock` already aquired!
+
+        :param data: Result of get_data()
+        :type data: dict
+        :param channels: Written channel info per index
+        :type channels: dict
+        :rtype: None
+        """
+        self._journal_version = data['version']
+        for key, c in channels.items():
+            key = "{}".format(key)
+            if key == "count":
+                continue
+            c = dict(c)
+            # Changes all the time (volume updater)
+            c.pop('volume', None)
+            c.pop('output_volume', None)
+            self._journal_channels[key] = c
 
     def save_data(self):
         """
-        Save data to file
+        Save data to file (atomically) and empty journal
 
         :rtype: None
         """
-        if self._data_file:
+        if not self._data_file:
+            return
+        with self._journal_lock:
             try:
-                self._saveJSONFile(self._data_file, self.get_data())
+                data = self.get_data()
+                file_replace(
+                    self._data_file,
+                    # Keys of channels are mixed (count, ints) -> no sorting
+                    lambda f: self._saveJSONFile(f, data, sort=False)
+                )
             except:
                 self.exception("Failed to save data")
+                return
+            self._journal_channels = {}
+            self._journal_mark(data, data['channels'])
+            if self._journal is not None:
+                try:
+                    self._journal.reset()
+                except:
+                    self.exception("Failed to reset journal")
 
     def load_data(self):
         """
-        Load data from file and trigger on_config
+        Load data from file, replay journal and trigger on_config
 
         :rtype: None
         """
-        if self._data_file:
+        if not self._data_file:
+            return
+        settings = {}
+        entries = []
+        if self._journal is None or os.path.isfile(self._data_file):
+            try:
+                settings = self._loadJSONFile(self._data_file)
+            except:
+                self.exception("Failed to load data")
+        if self._journal is not None:
             try:
-                self.on_config(self._loadJSONFile(self._data_file))
+                entries = self._journal.replay()
             except:
-                self.exception("Failed to load and apply data")
+                self.exception("Failed to replay journal")
+        settings = settings_merge(settings, entries)
+        if isinstance(settings.get('timeline'), dict):
+            # Only the cues are data - don't restart a saved playback
+            settings['timeline'] = {
+                key: value
+                for key, value in settings['timeline'].items()
+                if key not in TIMELINE_RUNTIME
+            }
+        try:
+            self.on_config(settings)
+        except:
+            self.exception("Failed to apply data")
+
+    def _journal_write(self):
+        """
+        Append changes since the last write to the journal
+
+        :return: Entry has been written
+        :rtype: bool
+        """
+        with self._journal_lock:
+            if self._journal_version is None:
+                # Nothing written yet -> everything is a change
+                self.save_data()
+                return True
+            data = self.get_data(since=self._journal_version)
+            entry = {}
+            if data['groups']:
+                entry['groups'] = data['groups']
+            channels = {}
+            for key, c in data['channels'].items():
+                # Same keys as after loading from json
+                key = "{}".format(key)
+                if key == "count":
+                    channels[key] = c
+                    continue
+                c = dict(c)
+                c.pop('volume', None)
+                c.pop('output_volume', None)
+                if self._journal_channels.get(key) != c:
+                    channels[key] = c
+            if channels:
+                entry['channels'] = channels
+            if entry:
+                self._journal.append(entry)
+            self._journal_mark(data, channels)
+            return bool(entry)
+
+    def _journal_writer(self):
+        """
+        Threaded function writing changes to the journal and compacting it
+
+        :rtype: None
+        """
+        compacted = default_timer()
+        try:
+            self._journal.open()
+        except:
+            self.exception("Failed to open journal")
+            return
+        while self._is_running:
+            self._journal_should_write.wait(self._journal_interval)
+            self._journal_should_write.clear()
+            try:
+                self._journal_write()
+                entries = self._journal.entries
+                if entries >= self._journal_compact_entries or (
+                    entries and default_timer() - compacted >=
+                    self._journal_compact_interval
+                ):
+                    self.save_data()
+                    compacted = default_timer()
+            except:
+                self.exception("Journaling failed")
+        self.debug("ended")
 
     def _people_is_active(self, person, active_definition=None):
         """
@@ -695,58 +2695,129 @@ class SoundMixPlugin(SettablePlugin):
         else:
             return person.sitting
 
+    def _people_ingest(self):
+        """
+        Apply queued person state changes in batches
+        (only the latest state of each person is applied)
+
+        :rtype: None
+        """
+        queue = self._people_queue
+        stats = self._ingest_stats
+        metrics = self._metrics.enabled
+        with self._people_ingest_lock:
+            while queue:
+                batch = {}
+                stamps = []
+                while len(batch) < self._people_batch_size:
+                    try:
+                        person_id, active, stamp = queue.popleft()
+                    except IndexError:
+                        break
+                    batch[person_id] = active
+                    stats['events'] += 1
+                    if stamp is not None:
+                        stamps.append(stamp)
+                if not batch:
+                    break
+                with self._people_lock:
+                    self._crowd.people_update(batch.items())
+                stats['applied'] += len(batch)
+                stats['batches'] += 1
+                if metrics and stamps:
+                    now = default_timer()
+                    for stamp in stamps:
+                        self._metrics.record("event_ingest", now - stamp)
+                    self._metrics_events.extend(stamps)
+
     def on_person_new(self, people):
-        self.debug("People: {}".format([unicode(p) for p in people]))
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self.debug("People: {}".format([unicode(p) for p in people]))
+        if self._trace is not None:
+            self._trace.record("person_new", [p.to_tuple() for p in people])
         people_set = {person.id for person in people}
-        with self._people_lock:
-            self._people.update(people_set)
-            self._people_active.update(
-                {
-                    person.id for person in people
-                    if self._people_is_active(person)
-                }
-            )
-            # self.debug("All: {}".format(self._people))
-            # self.debug("Active: {}".format(self._people_active))
+        # Keep order of changes
+        self._people_ingest()
         with self._groups_lock:
-            self._groups[0]['people'].update(people_set)
+            with self._people_lock:
+                self._crowd.people_add(
+                    (person.id, self._people_is_active(person))
+                    for person in people
+                )
+                g = dict(self._groups[0])
+                g['people'] = g['people'].union(people_set)
+                self._crowd.group_add(0, people_set)
+                self._groups_replace({0: g})
         # New people -> percent changed -> update
         self._volume_should_update.set()
 
     def on_person_leave(self, people):
+        if self._trace is not None:
+            self._trace.record("person_leave", [p.to_tuple() for p in people])
+        # Keep order of changes
+        self._people_ingest()
         with self._people_lock:
-            ps = {person.id for person in people}
-            self._people -= ps
-            self._people_active -= ps
-            # self.debug("All: {}".format(self._people))
-            # self.debug("Active: {}".format(self._people_active))
+            self._crowd.people_remove(person.id for person in people)
         # people left -> percent changed -> update
         self._volume_should_update.set()
 
     def on_person_update(self, people):
-        self.debug("People: {}".format([unicode(p) for p in people]))
-        with self._people_lock:
-            active = {
-                person.id for person in people
-                if self._people_is_active(person)
-            }
-            inactive = {
-                person.id for person in people
-                if not self._people_is_active(person)
-            }
-            # Remove inactive
-            self._people_active -= inactive
-            # Add active
-            self._people_active.update(active)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self.debug("People: {}".format([unicode(p) for p in people]))
+        if self._trace is not None:
+            self._trace.record("person_update", [p.to_tuple() for p in people])
+        stamp = default_timer() if self._metrics.enabled else None
+        # Applied by volume updater (no locking here)
+        self._people_queue.extend(
+            (person.id, self._people_is_active(person), stamp)
+            for person in people
+        )
         # People changed -> percent changed -> update
         self._volume_should_update.set()
 
+    def _volume_tick(self):
+        """
+        Apply queued people changes and update volumes once
+
+        :rtype: None
+        """
+        metrics = self._metrics
+        start = default_timer()
+        self._people_ingest()
+        self._volume_update()
+        if metrics.enabled:
+            metrics.record("update_pass", default_timer() - start)
+            smoother = self._volume_smoother
+            with self._channels_lock:
+                if not self._quantise_pending and (
+                        smoother is None or not smoother.active
+                ):
+                    # Nothing deferred -> changes didn't alter any volume
+                    self._metrics_events.clear()
+
+    def _metrics_applied(self):
+        """
+        Record time from changes to their first volume written to a channel
+        (smoothed/quantised volumes are written after the volume pass)
+
+        Note: Assumes :attr:`_channels_lock` already aquired!
+
+        :rtype: None
+        """
+        events = self._metrics_events
+        if not events:
+            return
+        now = default_timer()
+        while events:
+            self._metrics.record("event_apply", now - events.popleft())
+
     def _volume_updater(self):
         """
         Threaded function responsible for timing the volume updates
 
         :rtype: None
         """
+        metrics = self._metrics
         while self._is_running:
             #if self._updater_timeout > 0.0:
             #    time.sleep(self._updater_timeout)
@@ -754,12 +2825,88 @@ class SoundMixPlugin(SettablePlugin):
                 # do it before updating -> might get triggered again
                 # too often better than missed update
                 self._volume_should_update.clear()
-                self._volume_update()
-                self._volume_should_update.wait(self._updater_timeout)
+                self._volume_tick()
+                if metrics.enabled:
+                    now = default_timer()
+                    self._volume_should_update.wait(self._updater_timeout)
+                    metrics.record("update_wait", default_timer() - now)
+                else:
+                    self._volume_should_update.wait(self._updater_timeout)
             except:
                 self.exception("Updating failed")
         self.debug("ended")
 
+    def tick(self, dt):
+        """
+        Advance plugin by dt seconds (only without threads - see threaded)
+
+        Runs due cues, updates volumes, fills stream/playlist queues and
+        steps volume ramps once. Used for rendering faster than realtime.
+
+        :param dt: Elapsed (virtual) time since last tick in seconds
+        :type dt: float
+        :rtype: None
+        """
+        self._tick_time += dt
+        # Cue changes are part of this volume pass
+        self._timeline.run_pending()
+        self._volume_tick()
+        self._streams_tick()
+        if self._volume_smoother is not None:
+            self._volume_smooth(dt)
+
+    def _volume_smooth(self, dt):
+        """
+        Advance volume ramps and write changed volumes
+
+        :param dt: Elapsed time since last step in seconds
+        :type dt: float
+        :rtype: None
+        """
+        with self._channels_lock:
+            volumes = self._volume_smoother.step(dt)
+            for channel_index, volume in volumes.items():
+                try:
+                    self._channels_volume(channel_index, volume)
+                except ValueError:
+                    # Channel removed
+                    self._volume_smoother.remove(channel_index)
+                except PlayerException:
+                    self.exception("Failed to set volume")
+                else:
+                    self._volume_stats['applied'] += 1
+                    self._metrics_applied()
+
+    def _volume_smoother_loop(self):
+        """
+        Threaded function stepping the volume ramps at a fixed rate
+        (sleeps while all volumes are at their targets)
+
+        :rtype: None
+        """
+        period = 1.0 / self._volume_rate
+        last = default_timer()
+        deadline = last
+        while self._is_running:
+            with self._channels_lock:
+                active = self._volume_smoother.active
+            if not active:
+                self._volume_should_smooth.wait()
+                self._volume_should_smooth.clear()
+                # Start ramp with a full step
+                last = default_timer() - period
+                deadline = last
+            try:
+                now = default_timer()
+                self._volume_smooth(now - last)
+                last = now
+            except:
+                self.exception("Smoothing failed")
+            # Fixed rate - don't accumulate the time spent stepping
+            deadline = max(deadline + period, default_timer())
+            time.sleep(max(0.0, deadline - default_timer()))
+        self.debug("ended")
+
     def resource_update_list(self, reset=False):
         with self._resource_lock:
             res = super(SoundMixPlugin, self).resource_update_list(reset)
@@ -774,15 +2921,76 @@ class SoundMixPlugin(SettablePlugin):
         self.debug("()")
         super(SoundMixPlugin, self).start(False)
         try:
-            pygame.mixer.init()
+            self._mixer.init()
             with self._channels_lock:
                 self._channels_number_set(self._channels_number_default)
         except:
             self.exception("Failed to init mixer")
             self.stop()
             return
-        # Needs pygame set up
+        # Needs mixer set up
+        if not self._threaded:
+            # Deterministic (e.g. offline rendering)
+            self._files_preload()
+        else:
+            try:
+                a_thread = threading.Thread(target=self._files_preload)
+                a_thread.daemon = True
+                a_thread.start()
+            except:
+                self.exception("Failed to start preloading")
+        if self._analysis_cache is not None:
+            if not self._threaded:
+                self._files_analyse()
+            else:
+                try:
+                    a_thread = threading.Thread(target=self._files_analyse)
+                    a_thread.daemon = True
+                    a_thread.start()
+                except:
+                    self.exception("Failed to start analysis")
         self.load_data()
+        if self._journal is not None:
+            # Snapshot of replayed state -> start with empty journal
+            self.save_data()
+            try:
+                a_thread = threading.Thread(target=self._journal_writer)
+                # Just in case
+                a_thread.daemon = True
+                a_thread.start()
+                self._journal_thread = a_thread
+            except:
+                self.exception("Failed to start journal writer")
+        if self._threaded:
+            self._timeline.start()
+        if self._timeline_settings:
+            try:
+                self._timeline_set(self._timeline_settings)
+            except ValueError:
+                self.exception("Failed to set timeline")
+        if self._trace is not None:
+            self._trace.record("start")
+        if not self._threaded:
+            # Driven by tick()
+            super(SoundMixPlugin, self).start(blocking)
+            return
+        try:
+            a_thread = threading.Thread(target=self._streams_service)
+            # Just in case
+            a_thread.daemon = True
+            a_thread.start()
+        except:
+            self.exception("Failed to start stream service")
+        if self._volume_smoother is not None:
+            try:
+                a_thread = threading.Thread(
+                    target=self._volume_smoother_loop
+                )
+                # Just in case
+                a_thread.daemon = True
+                a_thread.start()
+            except:
+                self.exception("Failed to start volume smoother")
         try:
             a_thread = threading.Thread(
                 target=self._volume_updater
@@ -801,8 +3009,36 @@ class SoundMixPlugin(SettablePlugin):
         if not self._is_running:
             return
         super(SoundMixPlugin, self).stop()
+        if self._trace is not None:
+            self._trace.record("stop")
+            self._trace.close()
+        self._timeline.stop()
+        self._timeline_stop()
+        # Quantised changes too
+        self._timeline.clear()
+        self._beat_grid = None
+        self._beat_grid_track = None
         self._volume_should_update.set()
+        self._journal_should_write.set()
+        self._streams_should_service.set()
+        self._volume_should_smooth.set()
+        if self._journal_thread is not None:
+            self._journal_thread.join()
+            self._journal_thread = None
+            try:
+                # Changes until stop (before channels are stopped)
+                self._journal_write()
+            except:
+                self.exception("Journaling failed")
+            self._journal.close()
+        with self._channels_lock:
+            for channel_index in list(self._streams.keys()):
+                self._streams_remove(channel_index)
+            self._playlists.clear()
         try:
-            pygame.mixer.quit()
+            self._mixer.quit()
         except:
             self.exception("Failed to stop mixer")
+        # Decoded sounds are bound to the mixer
+        self._sound_cache.clear()
+        self._wave_files.clear()
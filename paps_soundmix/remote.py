@@ -0,0 +1,1057 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 23:40
+""" Playback on several machines (coordinator mixer and playback nodes) """
+
+import argparse
+import json
+import logging
+import os
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from timeit import default_timer
+
+from flotils.logable import Logable
+from flotils.runable import StartStopable
+
+from .mixer import NullMixer, mixer_create
+from .wavfile import WaveFile
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+GAIN_MAGIC = b"PSMG"
+PING_MAGIC = b"PSMP"
+PONG_MAGIC = b"PSMQ"
+GAIN_HEADER = struct.Struct("!4sIIdH")
+""" Gain frame - magic, session, sequence number, send time, channels """
+GAIN_ENTRY = struct.Struct("!Hff")
+""" Gain of one channel - index, left, right """
+PING = struct.Struct("!4sId")
+""" Ping - magic, sequence number, send time (coordinator) """
+PONG = struct.Struct("!4sIddd")
+""" Pong - magic, sequence number, ping send time (coordinator),
+    receive time (node), send time (node) """
+OFFSET_SAMPLES = 8
+""" Number of clock offset measurements to choose from """
+
+
+def gains_pack(session, seq, stamp, gains):
+    """
+    Create gain frame
+
+    :param session: Id of coordinator run
+    :type session: int
+    :param seq: Sequence number
+    :type seq: int
+    :param stamp: Send time
+    :type stamp: float
+    :param gains: Gain (left, right) per channel index
+    :type gains: dict[int, (float, float)]
+    :rtype: bytes
+    """
+    return GAIN_HEADER.pack(
+        GAIN_MAGIC, session, seq, stamp, len(gains)
+    ) + b"".join(
+        GAIN_ENTRY.pack(index, left, right)
+        for index, (left, right) in sorted(gains.items())
+    )
+
+
+def gains_unpack(data):
+    """
+    Parse gain frame
+
+    :param data: Received frame
+    :type data: bytes
+    :return: Session, sequence number, send time, gains
+    :rtype: (int, int, float, dict[int, (float, float)])
+    :raises ValueError: Invalid frame
+    """
+    try:
+        magic, session, seq, stamp, count = GAIN_HEADER.unpack_from(data)
+    except struct.error:
+        raise ValueError("Frame too short")
+    if magic != GAIN_MAGIC:
+        raise ValueError("Not a gain frame")
+    if len(data) != GAIN_HEADER.size + count * GAIN_ENTRY.size:
+        raise ValueError("Invalid frame size")
+    gains = {}
+    for i in range(count):
+        index, left, right = GAIN_ENTRY.unpack_from(
+            data, GAIN_HEADER.size + i * GAIN_ENTRY.size
+        )
+        gains[index] = (left, right)
+    return session, seq, stamp, gains
+
+
+class RemoteNode(object):
+    """ Coordinator side state of a playback node """
+
+    def __init__(self, host, port):
+        """
+        Initialize object
+
+        :param host: Host of node
+        :type host: unicode
+        :param port: Port of node (tcp control and udp gains)
+        :type port: int
+        :rtype: None
+        """
+        super(RemoteNode, self).__init__()
+        self.address = (host, port)
+        """ Address of node
+            :type address: (unicode, int) """
+        self.sock = None
+        """ Control connection
+            :type sock: None | socket.socket """
+        self.connect_last = None
+        """ Time of last connection attempt
+            :type connect_last: None | float """
+        self.queue = queue.Queue()
+        """ Commands waiting to be sent (None wakes up sender)
+            :type queue: queue.Queue """
+        self.thread = None
+        """ Thread connecting and sending commands
+            :type thread: None | threading.Thread """
+        self.samples = []
+        """ Recent measurements (offset, round trip time)
+            :type samples: list[(float, float)] """
+        self.offset = None
+        """ Estimated node clock - coordinator clock in seconds
+            :type offset: None | float """
+        self.rtt = None
+        """ Round trip time of the offset estimate in seconds
+            :type rtt: None | float """
+        self.commands = 0
+        """ Commands sent
+            :type commands: int """
+        self.dropped = 0
+        """ Commands not sent (not connected)
+            :type dropped: int """
+
+    def sample_add(self, t0, t1, t2, t3):
+        """
+        Add clock measurement (ping/pong timestamps)
+
+        The offset of the fastest recent round trip is used, as it has the
+        least queuing delay
+
+        :param t0: Ping sent (coordinator clock)
+        :type t0: float
+        :param t1: Ping received (node clock)
+        :type t1: float
+        :param t2: Pong sent (node clock)
+        :type t2: float
+        :param t3: Pong received (coordinator clock)
+        :type t3: float
+        :rtype: None
+        """
+        offset = ((t1 - t0) + (t2 - t3)) / 2.0
+        rtt = (t3 - t0) - (t2 - t1)
+        self.samples.append((offset, rtt))
+        del self.samples[:-OFFSET_SAMPLES]
+        self.offset, self.rtt = min(self.samples, key=lambda s: s[1])
+
+    def samples_clear(self):
+        """
+        Forget clock measurements (e.g. node restarted)
+
+        :rtype: None
+        """
+        self.samples = []
+        self.offset = None
+        self.rtt = None
+
+    def stats(self):
+        """
+        Get information for frontend
+
+        :rtype: dict
+        """
+        return {
+            'address': "{}:{}".format(*self.address),
+            'connected': self.sock is not None,
+            'offset_ms': None if self.offset is None else self.offset * 1000,
+            'rtt_ms': None if self.rtt is None else self.rtt * 1000,
+            'commands': self.commands,
+            'dropped': self.dropped
+        }
+
+
+class RemoteMixer(NullMixer):
+    """
+    Mixer forwarding all channel calls to playback nodes
+
+    Runs on the coordinator: channel states are simulated locally (see
+    NullMixer), commands (play, queue, stop,..) go to every node over tcp.
+    Every node has its own thread (and queue) for connecting and sending
+    commands, so a slow or unreachable node doesn't hold up the others.
+    Volumes are sent as gain frames over udp - each frame holds all
+    channels, so a lost frame is repaired by the next one (resent every
+    gain_interval)
+    """
+
+    def __init__(self, settings=None):
+        """
+        Initialize object
+
+        :param settings: Settings for backend (default: None)
+            nodes: Playback nodes ("host:port")
+            gain_interval: Resend gains after seconds (default: 0.1)
+            ping_interval: Measure clock offsets every seconds
+                (default: 1.0)
+            reconnect_interval: Retry connecting nodes after seconds
+                (default: 1.0)
+            timeout: Socket timeout in seconds - also drops pings
+                unanswered for that long (default: 1.0)
+            sync_lead: Start synchronised channels seconds in the future
+                (default: 0.1)
+        :type settings: dict | None
+        :rtype: None
+        :raises ValueError: Invalid node address
+        """
+        if settings is None:
+            settings = {}
+        super(RemoteMixer, self).__init__(settings)
+        self._nodes = []
+        """ :type _nodes: list[RemoteNode] """
+        for node in settings.get('nodes', []):
+            try:
+                host, port = node.rsplit(":", 1)
+                self._nodes.append(RemoteNode(host, int(port)))
+            except ValueError:
+                raise ValueError(u"Invalid node address '{}'".format(node))
+        self._gain_interval = settings.get('gain_interval', 0.1)
+        self._ping_interval = settings.get('ping_interval', 1.0)
+        self._reconnect_interval = settings.get('reconnect_interval', 1.0)
+        self._timeout = settings.get('timeout', 1.0)
+        self._sync_lead = settings.get('sync_lead', 0.1)
+        self._session = random.randint(1, 2 ** 32 - 1)
+        """ Id of this run (nodes reset sequence numbers on change)
+            :type _session: int """
+        self._seq = 0
+        """ Sequence number of last gain frame
+            :type _seq: int """
+        self._command_seq = 0
+        """ Sequence number of last command
+            :type _command_seq: int """
+        self._pings = {}
+        """ Outstanding pings (sequence number -> node, send time)
+            :type _pings: dict[int, (RemoteNode, float)] """
+        self._ping_seq = 0
+        self._batch_at = None
+        """ Start time of channels played in batch (coordinator clock)
+            :type _batch_at: None | float """
+        self._udp = None
+        """ :type _udp: None | socket.socket """
+        self._gains_should_send = threading.Event()
+        self._running = False
+        self._threads = []
+
+    def init(self):
+        super(RemoteMixer, self).init()
+        self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._udp.bind(("", 0))
+        self._udp.settimeout(0.5)
+        self._running = True
+        for target in [self._sender, self._receiver]:
+            a_thread = threading.Thread(target=target)
+            a_thread.daemon = True
+            a_thread.start()
+            self._threads.append(a_thread)
+        for node in self._nodes:
+            node.thread = threading.Thread(
+                target=self._node_loop, args=(node,)
+            )
+            node.thread.daemon = True
+            node.thread.start()
+
+    def quit(self):
+        # Forwards stop of all channels
+        super(RemoteMixer, self).quit()
+        self._running = False
+        self._gains_should_send.set()
+        for node in self._nodes:
+            # Wake up (stops are sent before)
+            node.queue.put(None)
+        for a_thread in self._threads:
+            a_thread.join()
+        self._threads = []
+        for node in self._nodes:
+            if node.thread is not None:
+                node.thread.join()
+                node.thread = None
+            self._node_disconnect(node)
+        if self._udp is not None:
+            self._udp.close()
+            self._udp = None
+
+    def _node_disconnect(self, node):
+        """
+        Close control connection (only called by thread of node)
+
+        :param node: Node to disconnect
+        :type node: RemoteNode
+        :rtype: None
+        """
+        if node.sock is None:
+            return
+        try:
+            node.sock.close()
+        except socket.error:
+            pass
+        node.sock = None
+
+    def _node_send(self, node, msg):
+        """
+        Send command to node (only called by thread of node)
+
+        :param node: Node to send to
+        :type node: RemoteNode
+        :param msg: Command
+        :type msg: dict
+        :rtype: None
+        """
+        if node.sock is None:
+            node.dropped += 1
+            return
+        try:
+            node.sock.sendall(
+                "{}\n".format(json.dumps(msg)).encode("utf-8")
+            )
+            node.commands += 1
+        except socket.error:
+            self.exception(u"Lost node {}:{}".format(*node.address))
+            node.dropped += 1
+            self._node_disconnect(node)
+
+    def _command(self, msg, at=None):
+        """
+        Queue command for all nodes (sent by the thread of each node)
+
+        :param msg: Command
+        :type msg: dict
+        :param at: Execute at time (coordinator clock) (default: None)
+            None -> immediately
+        :type at: None | float
+        :rtype: None
+        """
+        with self.lock:
+            self._command_seq += 1
+            msg['seq'] = self._command_seq
+            for node in self._nodes:
+                node_msg = msg
+                if at is not None:
+                    node_msg = dict(msg)
+                    if node.offset is not None:
+                        node_msg['at'] = at + node.offset
+                    else:
+                        # No clock estimate yet
+                        node_msg['delay'] = at - default_timer()
+                node.queue.put(node_msg)
+
+    def record(self, index, method, *args):
+        super(RemoteMixer, self).record(index, method, *args)
+        if method == "set_volume":
+            self._gains_should_send.set()
+            return
+        msg = {'cmd': method, 'channel': index}
+        if method == "play":
+            msg['path'], msg['loops'], msg['maxtime'], msg['chunk'] = args
+        elif method == "queue":
+            # Streamed chunks are read by the node from its own file
+            msg['path'], msg['chunk'] = args
+        self._command(msg, self._batch_at if method == "play" else None)
+
+    def channels_number_set(self, number):
+        super(RemoteMixer, self).channels_number_set(number)
+        self._command({'cmd': "channels", 'number': number})
+
+    @contextmanager
+    def batch(self):
+        # Every node starts them at the same (estimated) time
+        with self.lock:
+            self._batch_at = default_timer() + self._sync_lead
+            try:
+                yield False
+            finally:
+                self._batch_at = None
+
+    def _gains_get(self):
+        """
+        Get volumes of all channels
+
+        :rtype: dict[int, (float, float)]
+        """
+        with self.lock:
+            return {
+                index: channel._volume
+                for index, channel in self._channels.items()
+            }
+
+    def _channels_state(self):
+        """
+        Commands recreating the current channel states on a node
+
+        Note: Assumes :attr:`lock` already aquired!
+
+        :rtype: list[dict]
+        """
+        msgs = []
+        for index, channel in sorted(self._channels.items()):
+            state = channel.state()
+            if state is None:
+                continue
+            sound = state['sound']
+            elapsed = state['elapsed']
+            loops, maxtime = state['loops'], state['maxtime']
+            if maxtime > 0:
+                maxtime = max(1, int(maxtime - elapsed * 1000.0))
+            if loops != 0 and sound.length > 0:
+                done = int(elapsed // sound.length)
+                elapsed -= done * sound.length
+                if loops > 0:
+                    loops -= done
+            msgs.append({
+                'cmd': "play",
+                'channel': index,
+                'path': sound.path,
+                'chunk': sound.chunk,
+                'loops': loops,
+                'maxtime': maxtime,
+                'position': elapsed
+            })
+            if state['queue'] is not None:
+                msgs.append({
+                    'cmd': "queue",
+                    'channel': index,
+                    'path': state['queue'].path,
+                    'chunk': state['queue'].chunk
+                })
+            if state['paused']:
+                msgs.append({'cmd': "pause", 'channel': index})
+        return msgs
+
+    def _node_connect(self, node):
+        """
+        Open control connection and bring node up to date (only called by
+        thread of node)
+
+        Commands queued while disconnected are dropped - the current
+        channel states are sent instead
+
+        :param node: Node to connect
+        :type node: RemoteNode
+        :rtype: None
+        """
+        node.connect_last = default_timer()
+        try:
+            sock = socket.create_connection(node.address, self._timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except socket.error as e:
+            self.debug(u"Failed to connect {}:{} ({})".format(
+                node.address[0], node.address[1], e
+            ))
+            return
+        self.info(u"Connected node {}:{}".format(*node.address))
+        with self.lock:
+            # Commands queued from now on follow the state
+            while True:
+                try:
+                    if node.queue.get_nowait() is not None:
+                        node.dropped += 1
+                except queue.Empty:
+                    break
+            msgs = [{
+                'cmd': "hello",
+                'session': self._session,
+                'channels': self._channels_number
+            }] + self._channels_state()
+            # Node might have restarted (other clock)
+            node.samples_clear()
+        node.sock = sock
+        for msg in msgs:
+            self._node_send(node, msg)
+
+    def _node_loop(self, node):
+        """
+        Threaded function connecting a node and sending its commands
+
+        :param node: Node to serve
+        :type node: RemoteNode
+        :rtype: None
+        """
+        while self._running:
+            if node.sock is None:
+                if node.connect_last is None or default_timer() - \
+                        node.connect_last >= self._reconnect_interval:
+                    self._node_connect(node)
+                if node.sock is None:
+                    try:
+                        if node.queue.get(timeout=0.1) is not None:
+                            node.dropped += 1
+                    except queue.Empty:
+                        pass
+                    continue
+            try:
+                msg = node.queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if msg is not None:
+                self._node_send(node, msg)
+        # Commands queued until quit (e.g. stops)
+        while node.sock is not None:
+            try:
+                msg = node.queue.get_nowait()
+            except queue.Empty:
+                break
+            if msg is not None:
+                self._node_send(node, msg)
+        self.debug(u"ended {}:{}".format(*node.address))
+
+    def _sender(self):
+        """
+        Threaded function sending gain frames and pings and connecting nodes
+
+        :rtype: None
+        """
+        gains_last = 0.0
+        ping_last = 0.0
+        while self._running:
+            now = default_timer()
+            timeout = min(
+                gains_last + self._gain_interval,
+                ping_last + self._ping_interval
+            ) - now
+            if timeout > 0:
+                self._gains_should_send.wait(timeout)
+            self._gains_should_send.clear()
+            if not self._running:
+                break
+            try:
+                now = default_timer()
+                self._seq += 1
+                frame = gains_pack(
+                    self._session, self._seq, now, self._gains_get()
+                )
+                for node in self._nodes:
+                    self._udp.sendto(frame, node.address)
+                gains_last = now
+                if now - ping_last >= self._ping_interval:
+                    ping_last = now
+                    with self.lock:
+                        # Pings never answered
+                        for seq, (_, sent) in list(self._pings.items()):
+                            if now - sent > self._timeout:
+                                del self._pings[seq]
+                    for node in self._nodes:
+                        self._ping_seq += 1
+                        with self.lock:
+                            self._pings[self._ping_seq] = (node, now)
+                        self._udp.sendto(
+                            PING.pack(PING_MAGIC, self._ping_seq, now),
+                            node.address
+                        )
+            except:
+                self.exception("Failed to send")
+                time.sleep(self._gain_interval)
+        self.debug("ended")
+
+    def _receiver(self):
+        """
+        Threaded function receiving pongs (clock offset estimation)
+
+        :rtype: None
+        """
+        while self._running:
+            try:
+                data, address = self._udp.recvfrom(1024)
+            except socket.timeout:
+                continue
+            except socket.error:
+                if self._running:
+                    self.exception("Failed to receive")
+                    time.sleep(0.1)
+                continue
+            t3 = default_timer()
+            try:
+                magic, seq, t0, t1, t2 = PONG.unpack(data)
+            except struct.error:
+                continue
+            if magic != PONG_MAGIC:
+                continue
+            with self.lock:
+                # Every node answers its own ping (expired by sender)
+                ping = self._pings.pop(seq, None)
+                if ping is not None:
+                    ping[0].sample_add(t0, t1, t2, t3)
+        self.debug("ended")
+
+    def stats(self):
+        stats = super(RemoteMixer, self).stats()
+        with self.lock:
+            stats.update({
+                'session': self._session,
+                'frames': self._seq,
+                'nodes': [node.stats() for node in self._nodes]
+            })
+        return stats
+
+
+class PlaybackNode(Logable, StartStopable):
+    """
+    Plays the commands and gains of a coordinator (RemoteMixer) on a
+    local mixer backend
+    """
+
+    def __init__(self, settings=None):
+        """
+        Initialize object
+
+        :param settings: Settings for node (default: None)
+            host: Address to listen on (default: 0.0.0.0)
+            port: Port for control (tcp) and gains (udp) (default: 9000)
+            mixer: Mixer backend (see mixer_create) (default: pygame)
+            mixer_settings: Settings for mixer backend
+            root: Resolve relative sound paths from here (default: None)
+            sync_max: Longest wait for a scheduled start in seconds
+                (default: 5.0)
+        :type settings: dict | None
+        :rtype: None
+        :raises ValueError: Unknown mixer
+        """
+        if settings is None:
+            settings = {}
+        super(PlaybackNode, self).__init__(settings)
+        self._address = (
+            settings.get('host', "0.0.0.0"), settings.get('port', 9000)
+        )
+        self._mixer = mixer_create(
+            settings.get('mixer', "pygame"), settings.get('mixer_settings')
+        )
+        """ Audio output
+            :type _mixer: paps_soundmix.mixer.MixerBackend """
+        self._root = settings.get('root')
+        self._sync_max = settings.get('sync_max', 5.0)
+        self._lock = threading.RLock()
+        """ Lock for mixer calls and state """
+        self._sounds = {}
+        """ Loaded sounds per path
+            :type _sounds: dict[unicode, object] """
+        self._waves = {}
+        """ Mapped wav files per path (chunks of streamed sounds)
+            :type _waves: dict[unicode, paps_soundmix.wavfile.WaveFile] """
+        self._gains = {}
+        """ Last received gain per channel index
+            :type _gains: dict[int, (float, float)] """
+        self._session = None
+        """ Session of coordinator
+            :type _session: None | int """
+        self._seq = None
+        """ Sequence number of last applied gain frame
+            :type _seq: None | int """
+        self._tcp = None
+        self._udp = None
+        self._connection = None
+        """ Current control connection
+            :type _connection: None | socket.socket """
+        self._stats = {
+            'frames': 0,
+            'lost': 0,
+            'stale': 0,
+            'commands': 0,
+            'pings': 0
+        }
+
+    @property
+    def port(self):
+        """
+        Port listened on (after start - useful with port 0)
+
+        :rtype: int
+        """
+        return self._tcp.getsockname()[1]
+
+    def _path_resolve(self, path):
+        """
+        Get local path of sound
+
+        :param path: Path as sent by coordinator
+        :type path: unicode
+        :rtype: unicode
+        """
+        if self._root is not None and not os.path.isabs(path):
+            return os.path.join(self._root, path)
+        return path
+
+    def _wave_get(self, path):
+        """
+        Get (cached) mapped wav file
+
+        Note: Assumes :attr:`_lock` already aquired!
+
+        :param path: Path as sent by coordinator
+        :type path: unicode
+        :rtype: paps_soundmix.wavfile.WaveFile
+        :raises IOError: Failed to read file
+        :raises ValueError: Not a PCM wav file
+        """
+        wav = self._waves.get(path)
+        if wav is None:
+            wav = WaveFile(self._path_resolve(path))
+            self._waves[path] = wav
+        return wav
+
+    def _sound_get(self, path, chunk=None):
+        """
+        Get (cached) sound or chunk of it
+
+        Note: Assumes :attr:`_lock` already aquired!
+
+        :param path: Path as sent by coordinator
+        :type path: unicode
+        :param chunk: Part of file (first frame, frames) (default: None)
+            None -> whole file
+        :type chunk: None | (int, int)
+        :return: Sound (None -> nothing to play)
+        :rtype: None | object
+        :raises Exception: Failed to load
+        """
+        if chunk is not None:
+            wav = self._wave_get(path)
+            if self._mixer.stream_compatible(wav):
+                return self._mixer.sound_chunk(wav, chunk[0], chunk[1])
+            if chunk[0] > 0:
+                # Whole file is already playing (started with first chunk)
+                return None
+        sound = self._sounds.get(path)
+        if sound is None:
+            sound = self._mixer.sound_load(self._path_resolve(path))
+            self._sounds[path] = sound
+        return sound
+
+    def _sound_seek(self, path, chunk, position):
+        """
+        Get sound starting position seconds into it
+
+        Note: Assumes :attr:`_lock` already aquired!
+
+        :param path: Path as sent by coordinator
+        :type path: unicode
+        :param chunk: Part of file (first frame, frames) (None -> whole)
+        :type chunk: None | (int, int)
+        :param position: Seconds to skip
+        :type position: float
+        :return: Sound (None -> mixer can't play part of file)
+        :rtype: None | object
+        :raises Exception: Failed to load
+        """
+        wav = self._wave_get(path)
+        if not self._mixer.stream_compatible(wav):
+            return None
+        first, frames = chunk if chunk is not None else (0, wav.frames)
+        skip = min(int(position * wav.frequency), frames)
+        return self._mixer.sound_chunk(wav, first + skip, frames - skip)
+
+    def _command(self, msg):
+        """
+        Execute command of coordinator
+
+        :param msg: Command
+        :type msg: dict
+        :rtype: None
+        """
+        cmd = msg.get('cmd')
+        delay = msg.get('delay')
+        if "at" in msg:
+            delay = msg['at'] - default_timer()
+        if delay is not None and delay > 0:
+            # Scheduled (synchronised) start
+            time.sleep(min(delay, self._sync_max))
+        with self._lock:
+            self._stats['commands'] += 1
+            if cmd == "hello":
+                self.info(u"Coordinator session {}".format(msg['session']))
+                self._mixer.channels_number_set(msg['channels'])
+                return
+            if cmd == "channels":
+                self._mixer.channels_number_set(msg['number'])
+                return
+            channel = self._mixer.channel(msg['channel'])
+            chunk = msg.get('chunk')
+            if cmd == "play":
+                loops = msg.get('loops', 0)
+                maxtime = msg.get('maxtime', 0)
+                sound = None
+                if msg.get('position', 0.0) > 0.0:
+                    # Joined while playing (e.g. node restarted)
+                    sound = self._sound_seek(
+                        msg['path'], chunk, msg['position']
+                    )
+                    if sound is None:
+                        self.warning(u"Can't seek {} - playing from start"
+                                     u"".format(msg['path']))
+                    else:
+                        channel.play(sound, loops=0, maxtime=maxtime)
+                        if loops != 0:
+                            # Only one more loop is restored
+                            channel.queue(self._sound_get(msg['path'], chunk))
+                if sound is None:
+                    sound = self._sound_get(msg['path'], chunk)
+                    if sound is None:
+                        return
+                    channel.play(sound, loops=loops, maxtime=maxtime)
+            elif cmd == "queue":
+                sound = self._sound_get(msg['path'], chunk)
+                if sound is None:
+                    return
+                channel.queue(sound)
+            elif cmd == "stop":
+                channel.stop()
+            elif cmd == "pause":
+                channel.pause()
+            elif cmd == "unpause":
+                channel.unpause()
+            else:
+                self.warning(u"Unknown command {}".format(cmd))
+                return
+            gain = self._gains.get(msg['channel'])
+            if cmd == "play" and gain is not None:
+                # pygame resets volume on play
+                channel.set_volume(*gain)
+
+    def _gains_apply(self, data):
+        """
+        Apply gain frame (older frames than the last one are ignored)
+
+        :param data: Received frame
+        :type data: bytes
+        :rtype: None
+        :raises ValueError: Invalid frame
+        """
+        session, seq, stamp, gains = gains_unpack(data)
+        with self._lock:
+            if session != self._session:
+                # Coordinator (re)started
+                self._session = session
+                self._seq = None
+            if self._seq is not None:
+                if seq <= self._seq:
+                    self._stats['stale'] += 1
+                    return
+                self._stats['lost'] += seq - self._seq - 1
+            self._seq = seq
+            self._stats['frames'] += 1
+            for index, gain in gains.items():
+                if self._gains.get(index) == gain:
+                    continue
+                try:
+                    self._mixer.channel(index).set_volume(*gain)
+                except (IndexError, ValueError):
+                    # Channel not available (yet)
+                    continue
+                self._gains[index] = gain
+
+    def _udp_loop(self):
+        """
+        Threaded function receiving gain frames and answering pings
+
+        :rtype: None
+        """
+        while self._is_running:
+            try:
+                data, address = self._udp.recvfrom(65536)
+            except socket.timeout:
+                continue
+            except socket.error:
+                if self._is_running:
+                    self.exception("Failed to receive")
+                    time.sleep(0.1)
+                continue
+            received = default_timer()
+            try:
+                if data[:4] == PING_MAGIC:
+                    magic, seq, t0 = PING.unpack(data)
+                    self._udp.sendto(PONG.pack(
+                        PONG_MAGIC, seq, t0, received, default_timer()
+                    ), address)
+                    self._stats['pings'] += 1
+                else:
+                    self._gains_apply(data)
+            except (ValueError, struct.error):
+                self.warning(u"Invalid packet from {}".format(address))
+            except:
+                self.exception("Failed to apply packet")
+        self.debug("ended")
+
+    def _control_loop(self, conn):
+        """
+        Threaded function executing the commands of one coordinator
+
+        :param conn: Control connection
+        :type conn: socket.socket
+        :rtype: None
+        """
+        f = conn.makefile("rb")
+        try:
+            for line in f:
+                if not self._is_running:
+                    break
+                try:
+                    msg = json.loads(line.decode("utf-8"))
+                except ValueError:
+                    self.warning(u"Invalid command {!r}".format(line))
+                    continue
+                try:
+                    self._command(msg)
+                except:
+                    self.exception(u"Failed to execute {}".format(msg))
+        except socket.error:
+            if self._is_running:
+                self.exception("Control connection failed")
+        finally:
+            f.close()
+            conn.close()
+        # Keep playing - coordinator might reconnect
+        self.info("Coordinator disconnected")
+
+    def _accept_loop(self):
+        """
+        Threaded function accepting coordinators (a new one replaces the
+        current one)
+
+        :rtype: None
+        """
+        while self._is_running:
+            try:
+                conn, address = self._tcp.accept()
+            except socket.timeout:
+                continue
+            except socket.error:
+                if self._is_running:
+                    self.exception("Failed to accept")
+                    time.sleep(0.1)
+                continue
+            self.info(u"Coordinator {}:{} connected".format(*address))
+            conn.settimeout(None)
+            with self._lock:
+                old, self._connection = self._connection, conn
+            if old is not None:
+                try:
+                    old.shutdown(socket.SHUT_RDWR)
+                except socket.error:
+                    pass
+            a_thread = threading.Thread(
+                target=self._control_loop, args=(conn,)
+            )
+            a_thread.daemon = True
+            a_thread.start()
+        self.debug("ended")
+
+    def start(self, blocking=False):
+        self.debug("()")
+        self._mixer.init()
+        self._tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._tcp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._tcp.bind(self._address)
+        self._tcp.listen(1)
+        self._tcp.settimeout(0.5)
+        self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # Same port for gains
+        self._udp.bind((self._address[0], self.port))
+        self._udp.settimeout(0.5)
+        self._is_running = True
+        for target in [self._accept_loop, self._udp_loop]:
+            a_thread = threading.Thread(target=target)
+            a_thread.daemon = True
+            a_thread.start()
+        super(PlaybackNode, self).start(blocking)
+
+    def stop(self):
+        self.debug("()")
+        if not self._is_running:
+            return
+        super(PlaybackNode, self).stop()
+        with self._lock:
+            if self._connection is not None:
+                try:
+                    self._connection.shutdown(socket.SHUT_RDWR)
+                except socket.error:
+                    pass
+                self._connection = None
+        self._tcp.close()
+        self._udp.close()
+        try:
+            self._mixer.quit()
+        except:
+            self.exception("Failed to stop mixer")
+        self._sounds.clear()
+        for wav in self._waves.values():
+            wav.close()
+        self._waves.clear()
+
+    def stats(self):
+        """
+        Get information about received frames and commands
+
+        :rtype: dict
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['session'] = self._session
+            stats['gains'] = dict(self._gains)
+            stats['mixer'] = self._mixer.stats()
+        return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Playback node for a coordinator using the remote mixer"
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument(
+        "--mixer", default="pygame", choices=["pygame", "software", "null"]
+    )
+    parser.add_argument(
+        "--root", default=None, help="Directory of relative sound paths"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    node = PlaybackNode({
+        'host': args.host,
+        'port': args.port,
+        'mixer': args.mixer,
+        'root': args.root
+    })
+    try:
+        node.start(blocking=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        node.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 23:05
+""" Offline (faster than realtime) rendering of recorded traces """
+
+import argparse
+import json
+import logging
+import sys
+from timeit import default_timer
+
+from paps.person import Person
+
+from .trace import is_placeholder, trace_read
+
+
+logger = logging.getLogger(__name__)
+SETTINGS_IGNORED = [
+    'trace_file', 'journal', 'data_file', 'mixer', 'mixer_settings',
+    'threaded'
+]
+""" Recorded settings not used for rendering (output/state files) """
+
+
+def _replay(plugin, entry):
+    """
+    Apply recorded call to plugin
+
+    :param plugin: Plugin to drive
+    :type plugin: paps_soundmix.plugin.SoundMixPlugin
+    :param entry: Recorded call
+    :type entry: dict
+    :rtype: None
+    """
+    call = entry['call']
+    args = entry.get('args')
+    if call == "config":
+        plugin.on_config(args)
+    elif call in ["person_new", "person_update", "person_leave"]:
+        people = [Person(person_id, sitting) for person_id, sitting in args]
+        getattr(plugin, "on_" + call)(people)
+    elif call not in ["init", "start", "stop"]:
+        logger.warning(u"Unknown call {}".format(call))
+
+
+def render(
+        trace_path, output_path, settings=None, tail=2.0,
+        block_size=1024, frequency=44100
+):
+    """
+    Render recorded trace into wav file
+
+    The plugin and mixer run without threads; recorded calls are applied
+    at their (virtual) time between mixed blocks
+
+    :param trace_path: Path to trace file
+    :type trace_path: unicode
+    :param output_path: Path to wav file to create
+    :type output_path: unicode
+    :param settings: Override recorded plugin settings (default: None)
+    :type settings: None | dict
+    :param tail: Seconds to keep rendering after stop (default: 2.0)
+    :type tail: float
+    :param block_size: Frames per block (default: 1024)
+    :type block_size: int
+    :param frequency: Sample rate (default: 44100)
+    :type frequency: int
+    :return: Rendered seconds, wall time seconds
+    :rtype: (float, float)
+    :raises ValueError: Invalid trace
+    """
+    # Avoid circular import
+    import paps_soundmix
+
+    entries = trace_read(trace_path)
+    if not entries or entries[0]['call'] != "init":
+        raise ValueError("Trace does not start with init")
+    init = entries[0]['args']
+    plugin_class = getattr(paps_soundmix, init['plugin'], None)
+    if plugin_class is None:
+        raise ValueError(u"Unknown plugin {}".format(init['plugin']))
+    plugin_settings = {
+        key: value
+        for key, value in init['settings'].items()
+        # Instances (e.g. mixer) can't be recreated -> use defaults
+        if key not in SETTINGS_IGNORED and not is_placeholder(value)
+    }
+    plugin_settings.update(settings or {})
+    plugin_settings.update({
+        'threaded': False,
+        'mixer': "software",
+        'mixer_settings': {
+            'sink': "wave",
+            'path': output_path,
+            'frequency': frequency,
+            'block_size': block_size,
+            'threaded': False,
+            'realtime': False
+        }
+    })
+    start_time = None
+    stop_time = None
+    for entry in entries:
+        if entry['call'] == "start" and start_time is None:
+            start_time = entry['t']
+        elif entry['call'] == "stop":
+            stop_time = entry['t']
+    if start_time is None:
+        raise ValueError("Plugin was never started")
+    if stop_time is None:
+        # Crashed/still running
+        stop_time = entries[-1]['t']
+    calls = [e for e in entries[1:] if e['call'] not in ["start", "stop"]]
+    plugin = plugin_class(plugin_settings)
+    mixer = plugin._mixer
+    """ :type : paps_soundmix.softmix.SoftwareMixer """
+    wall_start = default_timer()
+    i = 0
+    # Calls before start
+    while i < len(calls) and calls[i]['t'] <= start_time:
+        _replay(plugin, calls[i])
+        i += 1
+    plugin.start(False)
+    block_time = block_size / frequency
+    now = start_time
+    end = stop_time + tail
+    blocks = 0
+    try:
+        while now < end:
+            while i < len(calls) and calls[i]['t'] <= now:
+                _replay(plugin, calls[i])
+                i += 1
+            plugin.tick(block_time)
+            mixer.process()
+            blocks += 1
+            now = start_time + blocks * block_time
+    finally:
+        plugin.stop()
+    return blocks * block_time, default_timer() - wall_start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render a recorded trace faster than realtime"
+    )
+    parser.add_argument("trace", help="Trace file (settings: trace_file)")
+    parser.add_argument("output", help="Wav file to create")
+    parser.add_argument(
+        "--settings", default=None,
+        help="Json object overriding recorded plugin settings"
+    )
+    parser.add_argument(
+        "--tail", type=float, default=2.0,
+        help="Seconds to render after stop"
+    )
+    parser.add_argument("--block-size", type=int, default=1024)
+    parser.add_argument("--frequency", type=int, default=44100)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    settings = json.loads(args.settings) if args.settings else None
+    duration, wall = render(
+        args.trace, args.output, settings, args.tail,
+        args.block_size, args.frequency
+    )
+    print("Rendered {:.2f}s in {:.2f}s ({:.1f}x realtime)".format(
+        duration, wall, duration / wall if wall > 0 else float("inf")
+    ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 22:05
+""" Routing of group percentages to channel sides (speakers) """
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from paps.crowd import PluginException
+
+
+def routes_parse(routes):
+    """
+    Validate and normalize routes
+
+    :param routes: Routes (group_id, channel, left gain, right gain)
+        - gains default to 1.0
+    :type routes: list[dict]
+    :return: Routes (group id, channel index, left gain, right gain)
+    :rtype: list[(int, int, float, float)]
+    :raises ValueError: Invalid route
+    """
+    res = []
+    for route in routes:
+        try:
+            res.append((
+                int(route['group_id']),
+                int(route['channel']),
+                float(route.get('left', 1.0)),
+                float(route.get('right', 1.0))
+            ))
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(u"Invalid route {}".format(route))
+    return res
+
+
+class RoutingMatrix(object):
+    """
+    Maps group percentages to channel gains
+
+    The gain of a channel side is the weighted sum of the percentages of
+    all groups routed to it (clipped to 0.0 - 1.0)
+    """
+
+    def __init__(self, routes):
+        """
+        Initialize object
+
+        :param routes: Routes (see routes_parse)
+        :type routes: list[dict]
+        :rtype: None
+        :raises ValueError: Invalid route
+        """
+        super(RoutingMatrix, self).__init__()
+        self.routes = routes_parse(routes)
+        """ Routes (group id, channel index, left gain, right gain)
+            :type routes: list[(int, int, float, float)] """
+        self.groups = sorted(set(r[0] for r in self.routes))
+        """ Ids of routed groups
+            :type groups: list[int] """
+        self.channels = sorted(set(r[1] for r in self.routes))
+        """ Indices of routed channels
+            :type channels: list[int] """
+
+    def gains(self, percents):
+        """
+        Calculate channel gains
+
+        Channels fed by a group without valid percentage (< 0.0) are left
+        out (keep their volume)
+
+        :param percents: Percentage per group id
+        :type percents: dict[int, float]
+        :return: Gain (left, right) per channel index
+        :rtype: dict[int, (float, float)]
+        """
+        sums = {}
+        invalid = set()
+        for group_id, channel_index, left, right in self.routes:
+            percent = percents.get(group_id, -1.0)
+            if percent < 0.0:
+                if left or right:
+                    invalid.add(channel_index)
+                percent = 0.0
+            l, r = sums.get(channel_index, (0.0, 0.0))
+            sums[channel_index] = (l + left * percent, r + right * percent)
+        return {
+            channel_index: (
+                min(max(l, 0.0), 1.0), min(max(r, 0.0), 1.0)
+            )
+            for channel_index, (l, r) in sums.items()
+            if channel_index not in invalid
+        }
+
+
+class NumpyRoutingMatrix(RoutingMatrix):
+    """
+    Maps group percentages to channel gains with one matrix-vector product
+
+    (Same interface as RoutingMatrix)
+    """
+
+    def __init__(self, routes):
+        """
+        Initialize object
+
+        :param routes: Routes (see routes_parse)
+        :type routes: list[dict]
+        :rtype: None
+        :raises ValueError: Invalid route
+        :raises PluginException: numpy not installed
+        """
+        if np is None:
+            raise PluginException("Package numpy not installed")
+        super(NumpyRoutingMatrix, self).__init__(routes)
+        group_rows = {gid: i for i, gid in enumerate(self.groups)}
+        channel_rows = {ci: i for i, ci in enumerate(self.channels)}
+        self._matrix = np.zeros(
+            (len(self.channels) * 2, len(self.groups)), dtype="f8"
+        )
+        """ Gains (channel sides x groups)
+            :type _matrix: numpy.ndarray """
+        for group_id, channel_index, left, right in self.routes:
+            row = channel_rows[channel_index] * 2
+            col = group_rows[group_id]
+            self._matrix[row, col] += left
+            self._matrix[row + 1, col] += right
+        self._routed = (self._matrix != 0.0).reshape(
+            len(self.channels), 2, len(self.groups)
+        ).any(axis=1)
+        """ Groups feeding a channel (channels x groups)
+            :type _routed: numpy.ndarray """
+
+    def gains(self, percents):
+        p = np.array(
+            [percents.get(group_id, -1.0) for group_id in self.groups],
+            dtype="f8"
+        )
+        invalid = p < 0.0
+        out = np.clip(
+            self._matrix.dot(np.where(invalid, 0.0, p)), 0.0, 1.0
+        ).reshape(-1, 2)
+        skip = self._routed[:, invalid].any(axis=1)
+        return {
+            channel_index: (float(out[i, 0]), float(out[i, 1]))
+            for i, channel_index in enumerate(self.channels)
+            if not skip[i]
+        }
@@ -0,0 +1,180 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 15:20
+""" Outputs for blocks of mixed audio (interleaved 16 bit stereo) """
+
+import time
+import wave
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+from paps.crowd import PluginException
+
+
+class NullSink(object):
+    """ Discard all audio """
+
+    realtime = False
+    """ Does writing block until the audio is played """
+
+    def __init__(self, frequency=44100):
+        """
+        Initialize object
+
+        :param frequency: Sample rate (default: 44100)
+        :type frequency: int
+        :rtype: None
+        """
+        super(NullSink, self).__init__()
+        self.frequency = frequency
+        """ Sample rate
+            :type frequency: int """
+        self.frames = 0
+        """ Number of frames written
+            :type frames: int """
+
+    def open(self):
+        """
+        Prepare output
+
+        :rtype: None
+        """
+        self.frames = 0
+
+    def write(self, block):
+        """
+        Output block
+
+        :param block: Interleaved stereo samples
+        :type block: numpy.ndarray
+        :rtype: None
+        """
+        self.frames += len(block)
+
+    def close(self):
+        """
+        Finish output
+
+        :rtype: None
+        """
+        pass
+
+
+class WaveSink(NullSink):
+    """ Write audio to wav file """
+
+    def __init__(self, path, frequency=44100):
+        """
+        Initialize object
+
+        :param path: Path to wav file
+        :type path: unicode
+        :param frequency: Sample rate (default: 44100)
+        :type frequency: int
+        :rtype: None
+        """
+        super(WaveSink, self).__init__(frequency)
+        self.path = path
+        """ Path to wav file
+            :type path: unicode """
+        self._file = None
+        """ :type _file: None | wave.Wave_write """
+
+    def open(self):
+        super(WaveSink, self).open()
+        self._file = wave.open(self.path, "wb")
+        self._file.setnchannels(2)
+        self._file.setsampwidth(2)
+        self._file.setframerate(self.frequency)
+
+    def write(self, block):
+        super(WaveSink, self).write(block)
+        self._file.writeframes(block.astype("<i2").tobytes())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class PygameSink(NullSink):
+    """ Play audio on sound device (through pygame) """
+
+    realtime = True
+
+    def __init__(self, frequency=44100, buffer_size=1024):
+        """
+        Initialize object
+
+        :param frequency: Sample rate (default: 44100)
+        :type frequency: int
+        :param buffer_size: Device buffer size in frames (default: 1024)
+        :type buffer_size: int
+        :rtype: None
+        :raises PluginException: pygame not installed
+        """
+        super(PygameSink, self).__init__(frequency)
+        if pygame is None:
+            raise PluginException("Package pygame not installed")
+        self._buffer_size = buffer_size
+        self._channel = None
+        """ :type _channel: None | pygame.mixer.Channel """
+
+    def open(self):
+        super(PygameSink, self).open()
+        pygame.mixer.init(self.frequency, -16, 2, self._buffer_size)
+        self._channel = pygame.mixer.Channel(0)
+
+    def write(self, block):
+        super(PygameSink, self).write(block)
+        sound = pygame.mixer.Sound(buffer=block.astype("<i2").tobytes())
+        if not self._channel.get_busy():
+            self._channel.play(sound)
+            return
+        # Wait for room in the queue (paces the mixer)
+        while self._channel.get_queue() is not None:
+            time.sleep(0.001)
+        self._channel.queue(sound)
+
+    def close(self):
+        if self._channel is not None:
+            self._channel = None
+            pygame.mixer.quit()
+
+
+def sink_create(sink="null", settings=None):
+    """
+    Create sink
+
+    :param sink: Name of sink (device, wave, null) (default: null)
+    :type sink: unicode
+    :param settings: Settings for sink (frequency, path, buffer)
+        (default: None)
+    :type settings: dict | None
+    :return: Sink
+    :rtype: NullSink
+    :raises ValueError: Unknown sink
+    """
+    if settings is None:
+        settings = {}
+    frequency = settings.get('frequency', 44100)
+    if sink == "null":
+        return NullSink(frequency)
+    if sink == "wave":
+        return WaveSink(settings['path'], frequency)
+    if sink == "device":
+        return PygameSink(frequency, settings.get('buffer', 1024))
+    raise ValueError(u"Unknown sink '{}'".format(sink))
@@ -0,0 +1,158 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 21:25
+""" Attack/release smoothing of channel gains """
+
+import math
+
+
+class GainSmoother(object):
+    """
+    Moves channel gains towards their targets (one pole per side)
+
+    Rising gains follow the attack, falling ones the release time
+    constant. Only changes of at least threshold are handed out for
+    writing (plus the exact target once it is reached).
+
+    Note: Not thread safe
+    """
+
+    def __init__(self, attack, release, threshold=0.005):
+        """
+        Initialize object
+
+        :param attack: Time constant for rising gain in seconds
+            (0 -> jump)
+        :type attack: float
+        :param release: Time constant for falling gain in seconds
+            (0 -> jump)
+        :type release: float
+        :param threshold: Smallest change worth writing (default: 0.005)
+        :type threshold: float
+        :rtype: None
+        """
+        super(GainSmoother, self).__init__()
+        self.attack = attack
+        """ Time constant for rising gain in seconds
+            :type attack: float """
+        self.release = release
+        """ Time constant for falling gain in seconds
+            :type release: float """
+        self.threshold = threshold
+        """ Smallest change worth writing
+            :type threshold: float """
+        self._states = {}
+        """ State per channel index
+            :type _states: dict[int, dict] """
+
+    @property
+    def active(self):
+        """
+        Is any channel not yet written at its target
+
+        :rtype: bool
+        """
+        for state in self._states.values():
+            if state['written'] != state['target']:
+                return True
+        return False
+
+    def target_set(self, channel_index, volume, force=False):
+        """
+        Set gain to move to
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :param volume: Target - stereo or (left, right)
+        :type volume: float | (float, float)
+        :param force: Write on next step, even if nothing changed
+            (e.g. mixer reset the volume) (default: False)
+        :type force: bool
+        :rtype: None
+        """
+        stereo = not isinstance(volume, float)
+        target = tuple(volume) if stereo else (volume, volume)
+        state = self._states.get(channel_index)
+        if state is None:
+            # Nothing to smooth from
+            state = {
+                'current': target,
+                'written': None
+            }
+            self._states[channel_index] = state
+        state['target'] = target
+        state['stereo'] = stereo
+        if force:
+            state['written'] = None
+
+    def remove(self, channel_index):
+        """
+        Forget channel
+
+        :param channel_index: Index of channel
+        :type channel_index: int
+        :rtype: None
+        """
+        self._states.pop(channel_index, None)
+
+    def _side_step(self, current, target, dt):
+        """
+        Move one side towards target
+
+        :param current: Current gain
+        :type current: float
+        :param target: Target gain
+        :type target: float
+        :param dt: Elapsed time in seconds
+        :type dt: float
+        :rtype: float
+        """
+        tau = self.attack if target > current else self.release
+        if tau <= 0.0:
+            return target
+        current += (target - current) * (1.0 - math.exp(-dt / tau))
+        if abs(target - current) < self.threshold / 2.0:
+            # Close enough - don't approach forever
+            return target
+        return current
+
+    def step(self, dt):
+        """
+        Advance all channels
+
+        :param dt: Elapsed time since last step in seconds
+        :type dt: float
+        :return: Volumes to write per channel index
+        :rtype: dict[int, float | (float, float)]
+        """
+        res = {}
+        for channel_index, state in self._states.items():
+            target = state['target']
+            current = state['current']
+            if current != target:
+                current = (
+                    self._side_step(current[0], target[0], dt),
+                    self._side_step(current[1], target[1], dt)
+                )
+                state['current'] = current
+            written = state['written']
+            if written == current:
+                continue
+            if written is not None and current != target and max(
+                abs(current[0] - written[0]), abs(current[1] - written[1])
+            ) < self.threshold:
+                # Inaudible
+                continue
+            state['written'] = current
+            res[channel_index] = current if state['stereo'] else current[0]
+        return res
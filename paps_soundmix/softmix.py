@@ -0,0 +1,612 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 15:02
+
+import math
+import threading
+import time
+import wave
+from contextlib import contextmanager
+from timeit import default_timer
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from paps.crowd import PluginException
+
+from .mixer import MixerBackend
+from .sinks import sink_create
+
+
+def pcm_to_float(raw, sample_width, channels):
+    """
+    Convert interleaved PCM data to float samples
+
+    :param raw: PCM data
+    :type raw: bytes | buffer | memoryview
+    :param sample_width: Bytes per sample (1 - 4)
+    :type sample_width: int
+    :param channels: Number of channels
+    :type channels: int
+    :return: Samples (frames x channels) in range -1.0 - 1.0
+    :rtype: numpy.ndarray
+    :raises ValueError: Unsupported sample width
+    """
+    if sample_width == 1:
+        data = (np.frombuffer(raw, dtype="u1").astype("f4") - 128.0) / 128.0
+    elif sample_width == 2:
+        data = np.frombuffer(raw, dtype="<i2").astype("f4") / 32768.0
+    elif sample_width == 3:
+        b = np.frombuffer(raw, dtype="u1").reshape(-1, 3).astype("<i4")
+        data = (b[:, 0] << 8) | (b[:, 1] << 16) | (b[:, 2] << 24)
+        data = data.astype("f4") / 2147483648.0
+    elif sample_width == 4:
+        data = np.frombuffer(raw, dtype="<i4").astype("f4") / 2147483648.0
+    else:
+        raise ValueError(u"Unsupported sample width {}".format(sample_width))
+    return data.reshape(-1, channels)
+
+
+def to_stereo(data, frequency, target_frequency):
+    """
+    Convert samples to stereo at the target sample rate
+
+    :param data: Samples (frames x channels)
+    :type data: numpy.ndarray
+    :param frequency: Sample rate of data
+    :type frequency: int
+    :param target_frequency: Sample rate to convert to
+    :type target_frequency: int
+    :return: Stereo samples (frames x 2)
+    :rtype: numpy.ndarray
+    """
+    if data.shape[1] == 1:
+        data = np.repeat(data, 2, axis=1)
+    elif data.shape[1] > 2:
+        data = data[:, :2]
+    if frequency != target_frequency and len(data):
+        # Linear interpolation is good enough for accents/loops
+        frames = int(len(data) * target_frequency / frequency)
+        pos = np.arange(frames) * (frequency / target_frequency)
+        src = np.arange(len(data))
+        data = np.stack([
+            np.interp(pos, src, data[:, 0]),
+            np.interp(pos, src, data[:, 1])
+        ], axis=1)
+    return np.ascontiguousarray(data, dtype="f4")
+
+
+def wave_decode(path, frequency):
+    """
+    Decode wav file to stereo float samples
+
+    :param path: Path to wav file
+    :type path: unicode
+    :param frequency: Sample rate to convert to
+    :type frequency: int
+    :return: Stereo samples (frames x 2)
+    :rtype: numpy.ndarray
+    :raises IOError: Failed to read file
+    :raises wave.Error: Not a (PCM) wav file
+    """
+    w = wave.open(path, "rb")
+    try:
+        raw = w.readframes(w.getnframes())
+        data = pcm_to_float(raw, w.getsampwidth(), w.getnchannels())
+        return to_stereo(data, w.getframerate(), frequency)
+    finally:
+        w.close()
+
+
+class SoftwareSound(object):
+    """ Decoded sound (stereo float samples at mixer rate) """
+
+    def __init__(self, data, frequency, path=None):
+        """
+        Initialize object
+
+        :param data: Stereo samples (frames x 2)
+        :type data: numpy.ndarray
+        :param frequency: Sample rate
+        :type frequency: int
+        :param path: Path of source file (default: None)
+        :type path: None | unicode
+        :rtype: None
+        """
+        super(SoftwareSound, self).__init__()
+        self.data = data
+        """ Stereo samples (frames x 2)
+            :type data: numpy.ndarray """
+        self.frequency = frequency
+        self.path = path
+        self.frames = len(data)
+        """ Number of frames
+            :type frames: int """
+
+    @property
+    def size(self):
+        """
+        Memory used by samples in bytes
+
+        :rtype: int
+        """
+        return self.data.nbytes
+
+    def samples(self, start, stop):
+        """
+        Get stereo float samples
+
+        :param start: First frame
+        :type start: int
+        :param stop: Frame after last frame
+        :type stop: int
+        :return: Samples (frames x 2)
+        :rtype: numpy.ndarray
+        """
+        return self.data[start:stop]
+
+    def get_length(self):
+        return self.frames / self.frequency
+
+
+class MappedSound(SoftwareSound):
+    """
+    Sound referencing the PCM data of a mapped wav file
+
+    Samples are converted block by block while mixing - all channels
+    playing the file share the mapped pages
+    """
+
+    def __init__(self, wav, frame, frames):
+        """
+        Initialize object
+
+        :param wav: Mapped file (sample rate of mixer)
+        :type wav: paps_soundmix.wavfile.WaveFile
+        :param frame: First frame
+        :type frame: int
+        :param frames: Number of frames
+        :type frames: int
+        :rtype: None
+        """
+        super(MappedSound, self).__init__(
+            np.frombuffer(wav.view(frame, frames), dtype="u1"),
+            wav.frequency,
+            wav.path
+        )
+        self._sample_width = wav.sample_width
+        self._channels = wav.channels
+        self._frame_size = wav.frame_size
+        self.frames = len(self.data) // self._frame_size
+
+    @property
+    def size(self):
+        # Pages belong to the map (page cache), not the process
+        return 0
+
+    def samples(self, start, stop):
+        data = pcm_to_float(
+            self.data[start * self._frame_size:stop * self._frame_size],
+            self._sample_width,
+            self._channels
+        )
+        return to_stereo(data, self.frequency, self.frequency)
+
+
+class SoftwareChannel(object):
+    """ Channel of the software mixer (pygame.mixer.Channel interface) """
+
+    def __init__(self, mixer, index):
+        """
+        Initialize object
+
+        :param mixer: Mixer this channel belongs to
+        :type mixer: SoftwareMixer
+        :param index: Index of channel
+        :type index: int
+        :rtype: None
+        """
+        super(SoftwareChannel, self).__init__()
+        self._mixer = mixer
+        self._lock = mixer.lock
+        self.index = index
+        self._sound = None
+        """ :type _sound: None | SoftwareSound """
+        self._queue = None
+        """ :type _queue: None | SoftwareSound """
+        self._pos = 0
+        """ Current frame in sound
+            :type _pos: int """
+        self._loops = 0
+        """ Remaining loops (-1 forever)
+            :type _loops: int """
+        self._remaining = None
+        """ Frames left until maxtime reached (None no limit)
+            :type _remaining: None | int """
+        self._fade = 0
+        """ Length of fade in (frames)
+            :type _fade: int """
+        self._fade_pos = 0
+        self._paused = False
+        self._volume = (1.0, 1.0)
+        """ Gain (left, right)
+            :type _volume: (float, float) """
+        self._pan = (1.0, 1.0)
+        """ Pan gain (left, right)
+            :type _pan: (float, float) """
+
+    @property
+    def gains(self):
+        """
+        Effective gain (left, right) - volume and pan
+
+        :rtype: (float, float)
+        """
+        return self._volume[0] * self._pan[0], self._volume[1] * self._pan[1]
+
+    @property
+    def active(self):
+        """
+        Is channel producing audio
+
+        :rtype: bool
+        """
+        return self._sound is not None and not self._paused
+
+    def _start(self, sound, loops=0, maxtime=0, fade_ms=0):
+        self._sound = sound
+        self._pos = 0
+        self._loops = loops
+        self._remaining = None
+        if maxtime > 0:
+            self._remaining = int(maxtime * sound.frequency / 1000)
+        self._fade = int(fade_ms * sound.frequency / 1000)
+        self._fade_pos = 0
+        self._paused = False
+
+    def _next(self):
+        """ Current sound ended -> start queued or stop """
+        queued, self._queue = self._queue, None
+        if queued is None:
+            self._sound = None
+        else:
+            self._start(queued)
+
+    def read(self, out):
+        """
+        Fill buffer with the next frames (silence after end)
+
+        Note: Assumes mixer lock already aquired!
+
+        :param out: Buffer (frames x 2)
+        :type out: numpy.ndarray
+        :rtype: None
+        """
+        frames = len(out)
+        filled = 0
+        while filled < frames and self._sound is not None:
+            sound = self._sound
+            n = min(frames - filled, sound.frames - self._pos)
+            if self._remaining is not None:
+                n = min(n, self._remaining)
+            if n > 0:
+                out[filled:filled + n] = sound.samples(
+                    self._pos, self._pos + n
+                )
+                if self._fade_pos < self._fade:
+                    k = min(n, self._fade - self._fade_pos)
+                    ramp = np.arange(
+                        self._fade_pos, self._fade_pos + k, dtype="f4"
+                    ) / self._fade
+                    out[filled:filled + k] *= ramp[:, np.newaxis]
+                    self._fade_pos += k
+                self._pos += n
+                filled += n
+                if self._remaining is not None:
+                    self._remaining -= n
+            if self._remaining is not None and self._remaining <= 0:
+                self._next()
+            elif self._pos >= sound.frames:
+                if self._loops != 0 and sound.frames:
+                    if self._loops > 0:
+                        self._loops -= 1
+                    self._pos = 0
+                else:
+                    self._next()
+        out[filled:] = 0.0
+
+    def play(self, sound, loops=0, maxtime=0, fade_ms=0):
+        with self._lock:
+            self._queue = None
+            self._start(sound, loops, maxtime, fade_ms)
+
+    def queue(self, sound):
+        with self._lock:
+            if self._sound is None:
+                self._start(sound)
+            else:
+                self._queue = sound
+
+    def stop(self):
+        with self._lock:
+            self._sound = None
+            self._queue = None
+            self._paused = False
+
+    def pause(self):
+        with self._lock:
+            self._paused = True
+
+    def unpause(self):
+        with self._lock:
+            self._paused = False
+
+    def set_volume(self, left, right=None):
+        if right is None:
+            right = left
+        self._volume = (
+            min(max(left, 0.0), 1.0), min(max(right, 0.0), 1.0)
+        )
+
+    def set_pan(self, pan):
+        """
+        Set constant power panning
+
+        :param pan: Position from -1.0 (left) to 1.0 (right)
+        :type pan: float
+        :rtype: None
+        """
+        angle = (min(max(pan, -1.0), 1.0) + 1.0) * math.pi / 4.0
+        # Unity gain in the center
+        self._pan = (
+            math.cos(angle) * math.sqrt(2.0), math.sin(angle) * math.sqrt(2.0)
+        )
+
+    def get_volume(self):
+        return self._volume[0]
+
+    def get_busy(self):
+        return self._sound is not None
+
+    def get_sound(self):
+        return self._sound
+
+    def get_queue(self):
+        return self._queue
+
+
+class SoftwareMixer(MixerBackend):
+    """
+    Mixer rendering all channels with numpy and writing blocks to a sink
+
+    Supports an arbitrary number of channels. Decoded sounds are kept as
+    float arrays, mapped wav files are converted block by block; the
+    channels of a block are mixed with one vectorized gain multiplication.
+    """
+
+    def __init__(self, settings=None):
+        """
+        Initialize object
+
+        :param settings: Settings for mixer (default: None)
+            frequency: Sample rate (default: 44100)
+            block_size: Frames per block (default: 1024)
+            sink: Output (device, wave, null) (default: device)
+            path: Path of wav file for wave sink
+            realtime: Pace rendering to the sample rate (default: True)
+            threaded: Render in own thread (default: True)
+                False -> call process() yourself
+        :type settings: dict | None
+        :rtype: None
+        :raises PluginException: numpy not installed
+        """
+        if settings is None:
+            settings = {}
+        super(SoftwareMixer, self).__init__(settings)
+        if np is None:
+            raise PluginException("Package numpy not installed")
+        self.frequency = settings.get('frequency', 44100)
+        """ Sample rate
+            :type frequency: int """
+        self.block_size = settings.get('block_size', 1024)
+        """ Frames per block
+            :type block_size: int """
+        self.sink = sink_create(settings.get('sink', "device"), {
+            'frequency': self.frequency,
+            'path': settings.get('path'),
+            'buffer': settings.get('buffer', self.block_size)
+        })
+        """ Output for mixed blocks
+            :type sink: paps_soundmix.sinks.NullSink """
+        self._realtime = settings.get('realtime', True)
+        self._threaded = settings.get('threaded', True)
+        self.lock = threading.RLock()
+        """ Lock for channel state
+            :type lock: threading.RLock """
+        self._channels = {}
+        """ :type _channels: dict[int, SoftwareChannel] """
+        self._channels_number = 8
+        self._segments = np.zeros((0, self.block_size, 2), dtype="f4")
+        """ Buffer for the samples of all active channels
+            :type _segments: numpy.ndarray """
+        self._thread = None
+        self._running = False
+        self._stats = {
+            'blocks': 0,
+            'cpu_ms_last': 0.0,
+            'cpu_ms_max': 0.0,
+            'cpu_ms_total': 0.0,
+            'channels_active_max': 0
+        }
+
+    def init(self):
+        self.sink.open()
+        if not self._threaded:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def quit(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self.lock:
+            for c in self._channels.values():
+                c.stop()
+        self.sink.close()
+
+    def channels_number_set(self, number):
+        with self.lock:
+            for i in list(self._channels.keys()):
+                if i >= number:
+                    self._channels.pop(i).stop()
+            self._channels_number = number
+
+    def channels_number_get(self):
+        return self._channels_number
+
+    def channel(self, index):
+        with self.lock:
+            if index not in self._channels:
+                self._channels[index] = SoftwareChannel(self, index)
+            return self._channels[index]
+
+    def sound_load(self, path):
+        return SoftwareSound(
+            wave_decode(path, self.frequency), self.frequency, path
+        )
+
+    def sound_size(self, sound):
+        return sound.size
+
+    def sound_busy(self, sound):
+        with self.lock:
+            for c in self._channels.values():
+                if c.get_sound() is sound or c.get_queue() is sound:
+                    return True
+        return False
+
+    def stream_compatible(self, wav):
+        # Mapped samples are not resampled (interpolation would click at
+        # the edges of stream chunks)
+        return wav.frequency == self.frequency and wav.sample_width <= 4
+
+    def sound_chunk(self, wav, frame, frames):
+        return MappedSound(wav, frame, frames)
+
+    @contextmanager
+    def batch(self):
+        # No block is rendered while the lock is held
+        with self.lock:
+            yield True
+
+    def render(self, frames=None):
+        """
+        Mix next block of all channels
+
+        :param frames: Number of frames (default: None)
+            None -> block size
+        :type frames: None | int
+        :return: Stereo samples (frames x 2)
+        :rtype: numpy.ndarray
+        """
+        if frames is None:
+            frames = self.block_size
+        start = default_timer()
+        with self.lock:
+            active = [c for c in self._channels.values() if c.active]
+            if not active:
+                block = np.zeros((frames, 2), dtype="f4")
+            else:
+                if self._segments.shape[0] < len(active) \
+                        or self._segments.shape[1] != frames:
+                    self._segments = np.zeros(
+                        (len(active), frames, 2), dtype="f4"
+                    )
+                segments = self._segments[:len(active)]
+                gains = np.empty((len(active), 2), dtype="f4")
+                for i, c in enumerate(active):
+                    c.read(segments[i])
+                    gains[i] = c.gains
+                # Apply gain/pan and sum all channels
+                block = np.einsum("nfc,nc->fc", segments, gains)
+        duration = (default_timer() - start) * 1000.0
+        stats = self._stats
+        stats['blocks'] += 1
+        stats['cpu_ms_last'] = duration
+        stats['cpu_ms_max'] = max(stats['cpu_ms_max'], duration)
+        stats['cpu_ms_total'] += duration
+        stats['channels_active_max'] = max(
+            stats['channels_active_max'], len(active)
+        )
+        return block
+
+    @staticmethod
+    def to_pcm(block):
+        """
+        Convert float samples to 16 bit samples (clipping)
+
+        :param block: Stereo samples (frames x 2)
+        :type block: numpy.ndarray
+        :rtype: numpy.ndarray
+        """
+        return (np.clip(block, -1.0, 1.0) * 32767.0).astype("<i2")
+
+    def process(self, frames=None):
+        """
+        Mix next block into the sink
+
+        :param frames: Number of frames (default: None)
+            None -> block size
+        :type frames: None | int
+        :rtype: None
+        """
+        self.sink.write(self.to_pcm(self.render(frames)))
+
+    def _run(self):
+        """
+        Threaded function rendering blocks into the sink
+
+        :rtype: None
+        """
+        block_time = self.block_size / self.frequency
+        next_time = default_timer()
+        while self._running:
+            try:
+                self.process()
+            except:
+                self.exception("Failed to render block")
+                time.sleep(block_time)
+            if self._realtime and not self.sink.realtime:
+                next_time += block_time
+                delay = next_time - default_timer()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Fell behind -> don't try to catch up
+                    next_time = default_timer()
+
+    def stats(self):
+        stats = dict(self._stats)
+        blocks = stats['blocks'] or 1
+        block_ms = self.block_size * 1000.0 / self.frequency
+        stats['block_ms'] = block_ms
+        stats['cpu_ms_mean'] = stats['cpu_ms_total'] / blocks
+        # Fraction of realtime used for mixing
+        stats['load'] = stats['cpu_ms_mean'] / block_ms
+        return stats
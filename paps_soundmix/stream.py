@@ -0,0 +1,104 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 19:55
+""" Playback of long files in chunks """
+
+
+class Stream(object):
+    """
+    Cuts a wav file into sounds of fixed length
+
+    Only the chunks handed out are converted (current and queued one)
+    """
+
+    def __init__(self, wav, create, chunk_frames, loops=0, maxtime=0):
+        """
+        Initialize object
+
+        :param wav: File to stream
+        :type wav: paps_soundmix.wavfile.WaveFile
+        :param create: Function creating a sound from part of the file
+            (wav, first frame, number of frames)
+        :type create: (paps_soundmix.wavfile.WaveFile, int, int) -> object
+        :param chunk_frames: Frames per chunk
+        :type chunk_frames: int
+        :param loops: Number of repeats (-1 forever) (default: 0)
+        :type loops: int
+        :param maxtime: Stop after this many milliseconds (default: 0)
+            0 means no limit
+        :type maxtime: int
+        :rtype: None
+        """
+        super(Stream, self).__init__()
+        self.wav = wav
+        """ File to stream
+            :type wav: paps_soundmix.wavfile.WaveFile """
+        self._create = create
+        self._chunk_frames = max(1, chunk_frames)
+        self._loops = loops
+        self._pos = 0
+        """ Next frame to hand out
+            :type _pos: int """
+        self._remaining = None
+        """ Frames left until maxtime reached (None no limit)
+            :type _remaining: None | int """
+        if maxtime > 0:
+            self._remaining = int(maxtime * wav.frequency / 1000)
+        self.chunks = 0
+        """ Number of chunks handed out
+            :type chunks: int """
+
+    @property
+    def ended(self):
+        """
+        All chunks handed out
+
+        :rtype: bool
+        """
+        if self._remaining is not None and self._remaining <= 0:
+            return True
+        return self._pos >= self.wav.frames and (
+            self._loops == 0 or not self.wav.frames
+        )
+
+    def next(self):
+        """
+        Create next chunk
+
+        :return: Sound (None after end)
+        :rtype: None | object
+        :raises IOError: Failed to read file
+        """
+        if self.ended:
+            return None
+        if self._pos >= self.wav.frames:
+            # Next loop
+            if self._loops > 0:
+                self._loops -= 1
+            self._pos = 0
+        frames = min(self._chunk_frames, self.wav.frames - self._pos)
+        if self._remaining is not None:
+            frames = min(frames, self._remaining)
+            self._remaining -= frames
+        sound = self._create(self.wav, self._pos, frames)
+        self._pos += frames
+        self.chunks += 1
+        return sound
+
+    def close(self):
+        """
+        Stop handing out chunks (file is shared and stays mapped)
+
+        :rtype: None
+        """
+        self._remaining = 0
@@ -0,0 +1,212 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-19 01:05
+""" Tempo metadata of files and beat grids for quantised changes """
+
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from paps.crowd import PluginException
+
+from .softmix import pcm_to_float
+
+
+def tempo_parse(meta):
+    """
+    Validate tempo metadata
+
+    :param meta: Tempo (bpm, downbeat - seconds until first bar,
+        beats_per_bar - default: 4)
+    :type meta: dict
+    :return: Tempo with all values set
+    :rtype: dict[unicode, float | int]
+    :raises ValueError: Invalid metadata
+    """
+    try:
+        res = {
+            'bpm': float(meta['bpm']),
+            'downbeat': float(meta.get('downbeat', 0.0)),
+            'beats_per_bar': int(meta.get('beats_per_bar', 4))
+        }
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(u"Invalid tempo {}".format(meta))
+    if res['bpm'] <= 0.0 or res['beats_per_bar'] < 1:
+        raise ValueError(u"Invalid tempo {}".format(meta))
+    return res
+
+
+def _autocorrelation_peak(onset, lag_min, lag_max):
+    """
+    Find lag with highest autocorrelation (interpolated)
+
+    :param onset: Onset strength
+    :type onset: numpy.ndarray
+    :param lag_min: Smallest lag to consider
+    :type lag_min: int
+    :param lag_max: Largest lag to consider
+    :type lag_max: int
+    :rtype: float
+    """
+    lags = np.arange(max(1, lag_min), lag_max + 1)
+    ac = np.array([
+        np.dot(onset[:-lag], onset[lag:]) / (len(onset) - lag)
+        for lag in lags
+    ])
+    i = int(np.argmax(ac))
+    lag = float(lags[i])
+    if 0 < i < len(ac) - 1:
+        # Parabolic interpolation between the lags
+        denom = ac[i - 1] - 2 * ac[i] + ac[i + 1]
+        if denom != 0:
+            lag += 0.5 * (ac[i - 1] - ac[i + 1]) / denom
+    return lag
+
+
+def tempo_detect(wav, bpm_min=60.0, bpm_max=200.0, hop=512, chunk=10.0):
+    """
+    Estimate tempo and first beat of a file
+
+    Autocorrelation of the onset strength (rise of log energy per hop)
+    gives the beat period, the strongest comb of onsets with this period
+    its phase. The first beat is taken as downbeat.
+
+    :param wav: PCM wav file
+    :type wav: paps_soundmix.wavfile.WaveFile
+    :param bpm_min: Slowest tempo to consider (default: 60.0)
+    :type bpm_min: float
+    :param bpm_max: Fastest tempo to consider (default: 200.0)
+    :type bpm_max: float
+    :param hop: Frames per energy value (default: 512)
+    :type hop: int
+    :param chunk: Seconds converted at once (default: 10.0)
+    :type chunk: float
+    :return: Tempo (see tempo_parse)
+    :rtype: dict[unicode, float | int]
+    :raises PluginException: numpy not installed
+    :raises ValueError: File too short
+    """
+    if np is None:
+        raise PluginException("Package numpy not installed")
+    rate = wav.frequency / hop
+    """ Energy values per second """
+    n = wav.frames // hop
+    lag_min = max(1, int(rate * 60.0 / bpm_max))
+    lag_max = int(rate * 60.0 / bpm_min) + 1
+    if n < lag_max * 2:
+        raise ValueError("File too short to detect tempo")
+    energy = np.empty(n)
+    # Only a chunk of samples in memory at once
+    step = max(1, int(chunk * rate))
+    for i in range(0, n, step):
+        count = min(step, n - i)
+        mono = pcm_to_float(
+            wav.view(i * hop, count * hop), wav.sample_width, wav.channels
+        ).mean(axis=1)
+        energy[i:i + count] = np.square(mono.reshape(count, hop)).sum(axis=1)
+    onset = np.maximum(np.diff(np.log1p(energy * 1000.0)), 0.0)
+    onset -= onset.mean()
+    lag = _autocorrelation_peak(onset, lag_min, lag_max)
+    # Peak of a later beat is as sharp -> finer period
+    multiple = 1
+    while multiple < 16 and lag * multiple * 2 * 2 < len(onset):
+        multiple *= 2
+    if multiple > 1:
+        center = lag * multiple
+        lag = _autocorrelation_peak(
+            onset, int(center - multiple), int(math.ceil(center + multiple))
+        ) / multiple
+    beats = np.arange(int((len(onset) - 1) / lag)) * lag
+    phases = [
+        onset[(beats + phase).astype(int)].sum()
+        for phase in range(int(lag))
+    ]
+    # onset[k] is the rise from hop k to k + 1
+    downbeat = (int(np.argmax(phases)) + 1) / rate
+    return {
+        'bpm': float(60.0 * rate / lag),
+        'downbeat': float(downbeat),
+        'beats_per_bar': 4
+    }
+
+
+class BeatGrid(object):
+    """
+    Times of the beats (or bars) of a playing file
+
+    Precomputed when the file starts - finding the next grid point is
+    constant time
+    """
+
+    def __init__(self, anchor, period, tolerance=0.02):
+        """
+        Initialize object
+
+        :param anchor: Time of first grid point (clock)
+        :type anchor: float
+        :param period: Seconds between grid points
+        :type period: float
+        :param tolerance: Times up to this many seconds after a grid point
+            count as on it (default: 0.02)
+        :type tolerance: float
+        :rtype: None
+        """
+        super(BeatGrid, self).__init__()
+        self.anchor = anchor
+        """ Time of first grid point
+            :type anchor: float """
+        self.period = period
+        """ Seconds between grid points
+            :type period: float """
+        self.tolerance = tolerance
+        """ Late times still counting as on grid
+            :type tolerance: float """
+
+    @classmethod
+    def from_tempo(cls, tempo, start, grid="beat", tolerance=0.02):
+        """
+        Create grid for file started at start
+
+        :param tempo: Tempo of file (see tempo_parse)
+        :type tempo: dict
+        :param start: Time file started playing (clock)
+        :type start: float
+        :param grid: Quantise to beat or bar (default: beat)
+        :type grid: unicode
+        :param tolerance: See __init__ (default: 0.02)
+        :type tolerance: float
+        :rtype: BeatGrid
+        """
+        period = 60.0 / tempo['bpm']
+        if grid == "bar":
+            period *= tempo['beats_per_bar']
+        return cls(start + tempo['downbeat'], period, tolerance)
+
+    def next(self, now):
+        """
+        Next grid point
+
+        :param now: Current time (clock)
+        :type now: float
+        :return: Time of next grid point (now if on grid)
+        :rtype: float
+        """
+        if now <= self.anchor:
+            return self.anchor
+        phase = (now - self.anchor) % self.period
+        if phase <= self.tolerance:
+            return now
+        return now - phase + self.period
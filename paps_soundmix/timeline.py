@@ -0,0 +1,275 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-19 00:20
+""" Clock scheduled cues (timeline of a show) """
+
+import heapq
+import itertools
+import threading
+import time
+from timeit import default_timer
+
+from flotils.logable import Logable
+
+
+ACTIONS = (
+    "play", "stop", "pause", "unpause", "volume", "fade", "map", "sync_play"
+)
+""" What a cue can do """
+RUNTIME = ("state", "position", "pending", "jitter")
+""" Timeline info only describing the current run (not saved data) """
+
+
+def cues_parse(cues, bpm=None):
+    """
+    Validate cues and calculate their times
+
+    A cue is due at 'at' seconds or at 'beat' beats (needs bpm) after the
+    start of the timeline
+
+    :param cues: Cues (id, at/beat, action, action specific values)
+    :type cues: list[dict]
+    :param bpm: Tempo for beat relative cues (default: None)
+    :type bpm: None | float
+    :return: Cues with 'id' and 'time' (seconds) ordered by time
+    :rtype: list[dict]
+    :raises ValueError: Invalid cue
+    """
+    res = []
+    for i, cue in enumerate(cues):
+        cue = dict(cue)
+        cue.setdefault('id', i)
+        if cue.get('action') not in ACTIONS:
+            raise ValueError(u"Cue {}: unknown action {}".format(
+                cue['id'], cue.get('action')
+            ))
+        if "at" in cue:
+            cue['time'] = float(cue['at'])
+        elif "beat" in cue:
+            if not bpm:
+                raise ValueError(u"Cue {}: beat without bpm".format(
+                    cue['id']
+                ))
+            cue['time'] = float(cue['beat']) * 60.0 / bpm
+        else:
+            raise ValueError(u"Cue {}: needs at or beat".format(cue['id']))
+        if cue['time'] < 0.0:
+            raise ValueError(u"Cue {}: negative time".format(cue['id']))
+        if cue['action'] == "map":
+            if "group_id" not in cue or "channel" not in cue:
+                raise ValueError(u"Cue {}: needs group_id and channel".format(
+                    cue['id']
+                ))
+        elif cue['action'] == "sync_play":
+            if not cue.get('channels'):
+                raise ValueError(u"Cue {}: needs channels".format(cue['id']))
+        elif "channel" not in cue:
+            raise ValueError(u"Cue {}: needs channel".format(cue['id']))
+        if cue['action'] in ["volume", "fade"]:
+            try:
+                volume = cue['volume']
+                if isinstance(volume, (list, tuple)):
+                    left, right = volume
+                    cue['volume'] = (float(left), float(right))
+                else:
+                    cue['volume'] = float(volume)
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(u"Cue {}: needs volume".format(cue['id']))
+        res.append(cue)
+    res.sort(key=lambda c: c['time'])
+    return res
+
+
+class CueScheduler(Logable):
+    """
+    Runs callbacks at their time on a single thread
+
+    Entries are kept in a heap. The thread sleeps until shortly before the
+    next entry is due and spins the rest of the way (spin) for low jitter.
+    Without thread (see run_pending) it works on any clock, e.g. a virtual
+    one for offline rendering.
+    """
+
+    def __init__(self, settings=None):
+        """
+        Initialize object
+
+        :param settings: Settings for scheduler (default: None)
+            clock: Time source (default: timeit.default_timer)
+            spin: Seconds to spin before an entry is due (default: 0.002)
+        :type settings: dict | None
+        :rtype: None
+        """
+        if settings is None:
+            settings = {}
+        super(CueScheduler, self).__init__(settings)
+        self.clock = settings.get('clock', default_timer)
+        """ Time source
+            :type clock: () -> float """
+        self._spin = settings.get('spin', 0.002)
+        self._heap = []
+        """ Scheduled entries (time, order, callback, key, tag)
+            :type _heap: list[(float, int, () -> None, object, object)] """
+        self._order = itertools.count()
+        """ Keeps entries of the same time in schedule order """
+        self._cond = threading.Condition()
+        """ Guards heap - notified on changes """
+        self._stats = {}
+        """ Jitter per key (count, total, last, max) in seconds
+            :type _stats: dict[object, list] """
+        self._thread = None
+        self._running = False
+
+    def schedule(self, when, callback, key=None, tag=None):
+        """
+        Add entry
+
+        :param when: Time to run at (clock)
+        :type when: float
+        :param callback: Function to run
+        :type callback: () -> None
+        :param key: Record jitter under this key (default: None)
+            None -> not recorded
+        :type key: object
+        :param tag: Group of entry (see clear) (default: None)
+        :type tag: object
+        :rtype: None
+        """
+        with self._cond:
+            heapq.heappush(
+                self._heap, (when, next(self._order), callback, key, tag)
+            )
+            self._cond.notify()
+
+    def clear(self, tag=None):
+        """
+        Remove entries
+
+        :param tag: Only remove entries of this group (default: None)
+            None -> remove all
+        :type tag: object
+        :rtype: None
+        """
+        with self._cond:
+            if tag is None:
+                self._heap = []
+            else:
+                self._heap = [e for e in self._heap if e[4] != tag]
+                heapq.heapify(self._heap)
+            self._cond.notify()
+
+    @property
+    def pending(self):
+        """
+        Number of scheduled entries
+
+        :rtype: int
+        """
+        return len(self._heap)
+
+    def run_pending(self):
+        """
+        Run all entries that are due
+
+        :return: Number of entries run
+        :rtype: int
+        """
+        count = 0
+        while True:
+            with self._cond:
+                if not self._heap or self._heap[0][0] > self.clock():
+                    return count
+                when, _, callback, key, _ = heapq.heappop(self._heap)
+            jitter = self.clock() - when
+            if key is not None:
+                stats = self._stats.setdefault(key, [0, 0.0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += jitter
+                stats[2] = jitter
+                stats[3] = max(stats[3], jitter)
+            try:
+                callback()
+            except:
+                self.exception(u"Failed to run {}".format(key))
+            count += 1
+
+    def _run(self):
+        """
+        Threaded function running the entries when due
+
+        :rtype: None
+        """
+        while self._running:
+            with self._cond:
+                if not self._heap:
+                    self._cond.wait(0.5)
+                    continue
+                delay = self._heap[0][0] - self.clock()
+                if delay > self._spin:
+                    # Woken up early by new entries
+                    self._cond.wait(delay - self._spin)
+                    continue
+                when = self._heap[0][0]
+            while self.clock() < when:
+                # Yield, but don't sleep for a scheduler tick
+                time.sleep(0)
+            self.run_pending()
+        self.debug("ended")
+
+    def start(self):
+        """
+        Start scheduler thread
+
+        :rtype: None
+        """
+        self._running = True
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop scheduler thread (entries are kept)
+
+        :rtype: None
+        """
+        self._running = False
+        with self._cond:
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        """
+        Jitter (run - due time) per key in milliseconds
+
+        :rtype: dict[object, dict[unicode, int | float]]
+        """
+        return {
+            key: {
+                'count': count,
+                'jitter_ms_mean': total / count * 1000.0,
+                'jitter_ms_last': last * 1000.0,
+                'jitter_ms_max': peak * 1000.0
+            }
+            for key, (count, total, last, peak) in list(self._stats.items())
+        }
+
+    def stats_clear(self):
+        """
+        Reset jitter statistics
+
+        :rtype: None
+        """
+        self._stats = {}
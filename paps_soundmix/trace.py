@@ -0,0 +1,133 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 22:50
+""" Recording of plugin calls (people and config changes) for replay """
+
+import io
+import json
+import threading
+from timeit import default_timer
+
+
+def placeholder(value):
+    """
+    Stand-in for value json can't serialize (e.g. mixer instance)
+
+    :param value: Unserializable value
+    :type value: object
+    :return: Placeholder naming the class of value
+    :rtype: dict[unicode, unicode]
+    """
+    return {'unserializable': value.__class__.__name__}
+
+
+def is_placeholder(value):
+    """
+    Is value a stand-in for an unserializable value
+
+    :param value: Recorded value
+    :type value: object
+    :rtype: bool
+    """
+    return isinstance(value, dict) and list(value.keys()) == ['unserializable']
+
+
+class TraceWriter(object):
+    """
+    Writes timestamped calls as json lines
+
+    {"t": seconds since creation, "call": name, "args": arguments}
+    """
+
+    def __init__(self, path, flush_interval=1.0):
+        """
+        Initialize object (creates file)
+
+        :param path: Path to trace file
+        :type path: unicode
+        :param flush_interval: Write buffered calls to disk after this many
+            seconds (default: 1.0)
+        :type flush_interval: float
+        :rtype: None
+        :raises IOError: Failed to create file
+        """
+        super(TraceWriter, self).__init__()
+        self.path = path
+        """ Path to trace file
+            :type path: unicode """
+        self._flush_interval = flush_interval
+        self._file = io.open(path, "w", encoding="utf-8")
+        """ :type _file: None | io.TextIOWrapper """
+        self._start = default_timer()
+        # Flush first call right away
+        self._flushed = self._start - flush_interval
+        self._lock = threading.Lock()
+
+    def record(self, call, args=None):
+        """
+        Append call (ignored after close)
+
+        :param call: Name of call
+        :type call: unicode
+        :param args: Arguments (default: None)
+            Values json can't serialize are recorded as placeholder
+        :type args: None | list | dict
+        :rtype: None
+        :raises IOError: Failed to write
+        """
+        now = default_timer()
+        line = "{}\n".format(json.dumps({
+            't': now - self._start,
+            'call': call,
+            'args': args
+        }, default=placeholder))
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            if now - self._flushed >= self._flush_interval:
+                self._file.flush()
+                self._flushed = now
+
+    def close(self):
+        """
+        Flush and close file
+
+        :rtype: None
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def trace_read(path):
+    """
+    Read recorded calls
+
+    A torn last line (crash while writing) is ignored
+
+    :param path: Path to trace file
+    :type path: unicode
+    :return: Calls in recorded order
+    :rtype: list[dict]
+    :raises IOError: Failed to read file
+    """
+    res = []
+    with io.open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                res.append(json.loads(line))
+            except ValueError:
+                break
+    return res
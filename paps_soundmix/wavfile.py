@@ -0,0 +1,291 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-18 19:30
+""" Memory mapped access to PCM wav files """
+
+import io
+import mmap
+import os
+import struct
+import threading
+
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class WaveFile(object):
+    """
+    PCM wav file read in chunks through a memory map
+
+    Only the pages of the chunks read are loaded - memory use does not
+    depend on the length of the file
+    """
+
+    def __init__(self, path):
+        """
+        Initialize object (parses header)
+
+        :param path: Path to wav file
+        :type path: unicode
+        :rtype: None
+        :raises IOError: Failed to read file
+        :raises ValueError: Not a PCM wav file
+        """
+        super(WaveFile, self).__init__()
+        self.path = path
+        """ Path to wav file
+            :type path: unicode """
+        self.channels = None
+        """ Number of channels
+            :type channels: int """
+        self.frequency = None
+        """ Sample rate
+            :type frequency: int """
+        self.sample_width = None
+        """ Bytes per sample
+            :type sample_width: int """
+        self.frame_size = None
+        """ Bytes per frame (all channels)
+            :type frame_size: int """
+        self.offset = None
+        """ Start of sample data in file
+            :type offset: int """
+        self.frames = None
+        """ Number of frames
+            :type frames: int """
+        self._file = None
+        self._map = None
+        """ :type _map: None | mmap.mmap """
+        self._header_parse()
+
+    def _header_parse(self):
+        """
+        Read format and location of samples
+
+        :rtype: None
+        :raises IOError: Failed to read file
+        :raises ValueError: Not a PCM wav file
+        """
+        with io.open(self.path, "rb") as f:
+            riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+            if riff != b"RIFF" or wave != b"WAVE":
+                raise ValueError(u"Not a wav file '{}'".format(self.path))
+            size = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    break
+                chunk_id, chunk_size = struct.unpack("<4sI", header)
+                if chunk_id == b"fmt ":
+                    fmt = f.read(chunk_size)
+                    tag, channels, frequency, _, align, bits = struct.unpack(
+                        "<HHIIHH", fmt[:16]
+                    )
+                    if tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                        tag = struct.unpack("<H", fmt[24:26])[0]
+                    if tag != WAVE_FORMAT_PCM:
+                        raise ValueError(
+                            u"Not a PCM wav file '{}'".format(self.path)
+                        )
+                    self.channels = channels
+                    self.frequency = frequency
+                    self.sample_width = (bits + 7) // 8
+                    self.frame_size = align
+                elif chunk_id == b"data":
+                    self.offset = f.tell()
+                    size = chunk_size
+                    break
+                else:
+                    f.seek(chunk_size, io.SEEK_CUR)
+                # Chunks are word aligned
+                if chunk_size % 2:
+                    f.seek(1, io.SEEK_CUR)
+            f.seek(0, io.SEEK_END)
+            end = f.tell()
+        if self.frame_size is None or size is None:
+            raise ValueError(u"Incomplete wav file '{}'".format(self.path))
+        # Size might be wrong for files still written/streamed
+        size = min(size, end - self.offset)
+        self.frames = size // self.frame_size
+        self.mtime = os.path.getmtime(self.path)
+        """ Modification time of file when header was parsed
+            :type mtime: float """
+
+    @property
+    def length(self):
+        """
+        Length in seconds
+
+        :rtype: float
+        """
+        return self.frames / self.frequency
+
+    def open(self):
+        """
+        Map file into memory
+
+        :rtype: None
+        :raises IOError: Failed to map file
+        """
+        if self._map is not None:
+            return
+        self._file = io.open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        except:
+            self._file.close()
+            self._file = None
+            raise
+
+    def read(self, frame, frames):
+        """
+        Read raw samples
+
+        :param frame: First frame
+        :type frame: int
+        :param frames: Number of frames
+        :type frames: int
+        :return: Interleaved PCM data
+        :rtype: bytes
+        """
+        self.open()
+        frame = max(0, min(frame, self.frames))
+        frames = max(0, min(frames, self.frames - frame))
+        start = self.offset + frame * self.frame_size
+        return self._map[start:start + frames * self.frame_size]
+
+    def view(self, frame=0, frames=None):
+        """
+        Get raw samples without copying them
+
+        The view references the mapped pages - all views of a file share
+        the same memory
+
+        :param frame: First frame (default: 0)
+        :type frame: int
+        :param frames: Number of frames (default: None)
+            None -> until end of file
+        :type frames: None | int
+        :return: Interleaved PCM data
+        :rtype: memoryview | buffer
+        """
+        self.open()
+        if frames is None:
+            frames = self.frames
+        frame = max(0, min(frame, self.frames))
+        frames = max(0, min(frames, self.frames - frame))
+        start = self.offset + frame * self.frame_size
+        size = frames * self.frame_size
+        try:
+            view = memoryview(self._map)
+        except TypeError:
+            # Python 2 mmap only supports the old buffer interface
+            return buffer(self._map, start, size)  # noqa: F821
+        return view[start:start + size]
+
+    def close(self):
+        """
+        Unmap file
+
+        If views are still in use the map is released with the last one
+
+        :rtype: None
+        """
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Views exported -> unmapped when garbage collected
+                pass
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class WaveFiles(object):
+    """
+    Mapped wav files shared by all users of a path
+
+    Headers are parsed once (again after the file changed)
+    """
+
+    def __init__(self):
+        """
+        Initialize object
+
+        :rtype: None
+        """
+        super(WaveFiles, self).__init__()
+        self._files = {}
+        """ Mapped files
+            :type _files: dict[unicode, WaveFile] """
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """
+        Get mapped file
+
+        :param path: Path to wav file
+        :type path: unicode
+        :rtype: WaveFile
+        :raises IOError: Failed to read file
+        :raises ValueError: Not a PCM wav file
+        """
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            wav = self._files.get(path)
+            if wav is not None and wav.mtime == mtime:
+                return wav
+        # Parse outside of lock
+        wav = WaveFile(path)
+        wav.open()
+        with self._lock:
+            old = self._files.get(path)
+            if old is not None and old.mtime == wav.mtime:
+                # Mapped by someone else in the meantime
+                wav.close()
+                return old
+            # Sounds of a changed file keep their (old) map alive
+            self._files[path] = wav
+        return wav
+
+    def clear(self):
+        """
+        Forget all files
+
+        :rtype: None
+        """
+        with self._lock:
+            files, self._files = self._files, {}
+        for wav in files.values():
+            wav.close()
+
+    def stats(self):
+        """
+        Get usage information
+
+        :return: Number of mapped files and their size
+        :rtype: dict[unicode, int]
+        """
+        with self._lock:
+            return {
+                'files': len(self._files),
+                'size': sum(
+                    wav.frames * wav.frame_size
+                    for wav in self._files.values()
+                )
+            }
@@ -62,6 +62,11 @@ setup(
         "paps_soundmix"
     ],
     install_requires=requirements,
+    extras_require={
+        # crowd_engine numpy, software mixer, routing matrix engine,
+        # tempo detection, analysis cache
+        'numpy': ["numpy"]
+    },
     license=__license__,
     keywords="paps audience participation pygame sound mix audio",
     classifiers=[
@@ -0,0 +1,81 @@
+# -*- coding: UTF-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__author__ = "d01"
+__email__ = "jungflor@gmail.com"
+__copyright__ = "Copyright (C) 2026, Florian JUNG"
+__license__ = "MIT"
+__version__ = "0.1.0"
+__date__ = "2026-10-18"
+# Created: 2026-10-20 10:15
+""" Tests of timeline persistence """
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from paps_soundmix import SoundMixPlugin
+
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+CUES = [
+    {'id': "in", 'at': 0.5, 'action': "play", 'channel': 0},
+    {'id': "out", 'beat': 8, 'action': "stop", 'channel': 0}
+]
+
+
+class TimelinePersistenceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.data_file = os.path.join(self.path, "data.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def _plugin(self):
+        return SoundMixPlugin({
+            'files': [os.path.join(DATA, "Groundloop.wav")],
+            'mixer': "null",
+            'threaded': False,
+            'data_file': self.data_file
+        })
+
+    def _saved(self, play):
+        plugin = self._plugin()
+        plugin.start()
+        timeline = {'bpm': 120, 'cues': CUES}
+        if play:
+            timeline['state'] = "play"
+        plugin.on_config({'timeline': timeline})
+        plugin.tick(0.1)
+        plugin.save_data()
+        plugin.stop()
+        plugin = self._plugin()
+        plugin.start()
+        try:
+            return plugin.get_data()['timeline']
+        finally:
+            plugin.stop()
+
+    def test_saved_playing(self):
+        timeline = self._saved(True)
+        self.assertEqual(timeline['cues'], CUES)
+        self.assertEqual(timeline['bpm'], 120)
+        # Loading doesn't restart the saved run
+        self.assertEqual(timeline['state'], "stop")
+        self.assertEqual(timeline['pending'], 0)
+
+    def test_saved_stopped(self):
+        timeline = self._saved(False)
+        self.assertEqual(timeline['cues'], CUES)
+        self.assertEqual(timeline['bpm'], 120)
+        self.assertEqual(timeline['jitter'], {})
+
+
+if __name__ == "__main__":
+    unittest.main()